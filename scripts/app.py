@@ -18,125 +18,25 @@ from utils.loaders import (
     load_images,            # images/<part_type>*.{jpg,png}
     load_code_schema,       # codeSchema_IK.csv / codeSchema_OK.csv (참고: 일부 util에서만 사용)
     load_lookups,           # 7종 lookup dict
-    lookup_options,         # lookup 테이블에서 part_type별 옵션 dict 추출 {code: label}
+    lookup_options,         # 미리 병합된 part_type별 옵션 dict {code: label} (정확 > 그룹 > 공통)
     load_crossmap,          # Cross_Map.csv → (ik2ok, ok2ik)
-    load_matched_full,      # matched_parts.csv (안전 로더)
+    load_matched_index,     # matched_parts 정규화 코드 → 행 색인 (조회용)
     load_union_schema,      # union_schema.csv 로더
+    load_pair_schemas,      # union_schema → {pair_id: PairSchema} (slot 순 key / 필수·추가 집합 / dtype·lookup)
+    load_part_type_index,   # part_type 최장 접두 인덱스 (11자리 → part_type)
+    load_catalog_index,     # 빠른 검색 자동완성 (part_type / Cross_Map 짝 / remark / category)
+    load_fuzzy_index,       # 오타 허용 유사 검색 (remark / category / lookup 라벨, 한글 자모 bigram)
+    load_label_index,       # lookup 라벨 → 코드 역색인
 )
+from utils.lookups import match_code   # 해석한 lookup 코드 → 옵션표 표기 ('7' ↔ '07')
 
 # 이미지
 # from utils.images import find_images
-from utils.images import find_images_with_prefix_fallback
+from utils.thumbnails import GRID_SIZE                      # 그리드용 WebP 썸네일 (원본은 확대 보기에서만)
+from utils.prefetch import prefetch_images, collect_images  # 탐색/디코드 스레드 풀 + 프리페치
 
 # vcode_codec (11자리 조립/해석기)
-from notebooks.vcode_codec import (
-    encode_both, required_keys, extra_keys_from_other_side, missing_required_keys, _slot_to_range,
-    decode_attrs_from_code,
-)
-import re
-
-V3_RE = re.compile(r"^(V)(\d{2})(\d)$", re.IGNORECASE)  # V111, V802...
-V2_RE = re.compile(r"^(V)(\d{2})$",     re.IGNORECASE)  # V11, V80...
-
-def _ik_group_key(ptype: str) -> str:
-    s = (ptype or "").strip().upper()
-    m3 = V3_RE.match(s)
-    if m3:
-        return f"{m3.group(1)}{m3.group(2)}"
-    return s
-
-def _candidate_keys(system: str, ptype_raw: str) -> list[str]:
-    """IK: [정확, 그룹] / OK: [정확]"""
-    s = (ptype_raw or "").strip().upper()
-    if system == "IK":
-        g = _ik_group_key(s)
-        return [s] if s == g else [s, g]
-    return [s]
-
-def _extract_spec_common(bundle):
-    """
-    load_lookups()[table] 이 반환하는 여러 포맷을 spec/common 두 dict로 표준화.
-    지원 포맷:
-      - (spec, common)
-      - (spec, common, meta...)
-      - {"spec": dict, "common": dict}
-      - {"by_part_type": {(pt,code):label}, "*": {code:label}}
-      - {"V11": {code:label}, "V801": {...}, "*": {...}}  # 중첩 dict → (pt,code)로 평탄화
-    """
-    spec, common = {}, {}
-
-    # 튜플/리스트 포맷
-    if isinstance(bundle, (list, tuple)):
-        if len(bundle) >= 2:
-            spec, common = bundle[0], bundle[1]
-            if not isinstance(spec, dict):  spec = {}
-            if not isinstance(common, dict): common = {}
-            return spec, common
-
-    # 딕셔너리 포맷
-    if isinstance(bundle, dict):
-        # 흔한 키 우선 탐색
-        cand_spec_keys   = ("spec", "by_part_type", "pt", "map", "part_type")
-        cand_common_keys = ("common", "*", "global")
-        for k in cand_spec_keys:
-            if k in bundle and isinstance(bundle[k], dict):
-                spec = bundle[k]
-                break
-        for k in cand_common_keys:
-            if k in bundle and isinstance(bundle[k], dict):
-                common = bundle[k]
-                break
-
-        # 아직도 spec 비었으면: { "V11": {...}, "V801": {...}, "*": {...} } 스타일 평탄화
-        if not spec:
-            flat = {}
-            for k, v in bundle.items():
-                if k == "*" or not isinstance(v, dict):
-                    continue
-                # k = part_type, v = {code: label}
-                for code, label in v.items():
-                    flat[(str(k).upper().strip(), str(code))] = label
-            if flat:
-                spec = flat
-
-        # common이 없고 '*'가 있으면 사용
-        if not common and "*" in bundle and isinstance(bundle["*"], dict):
-            common = bundle["*"]
-
-        return spec or {}, common or {}
-
-    # 알 수 없는 포맷
-    return {}, {}
-
-def _merged_lookup_options(lookups: dict, table: str, system: str, ptype_raw: str) -> dict:
-    """
-    반환: {code: label}, 우선순위 = 정확 > 그룹 > 공통(*)
-    """
-    bundle = lookups.get(table)
-    if bundle is None:
-        return {}
-
-    spec, common = _extract_spec_common(bundle)
-
-    out: dict[str, str] = {}
-    # 1) 정확/그룹 순회 (먼저 들어온 게 우선)
-    for key in _candidate_keys(system, ptype_raw):
-        for (pt, code), label in spec.items() if spec and next(iter(spec.keys()), (None, None)) and isinstance(next(iter(spec.keys())), tuple) else []:
-            if pt == key and str(code) not in out:
-                out[str(code)] = str(label)
-        # spec이 (pt,code)->label 평탄화가 아닌, {pt:{code:label}} 구조일 수도 있어 보강
-        if spec and isinstance(next(iter(spec.values())), dict):
-            inner = spec.get(key, {})
-            for code, label in inner.items():
-                out.setdefault(str(code), str(label))
-
-    # 2) 공통(*) 추가
-    for code, label in common.items():
-        out.setdefault(str(code), str(label))
-
-    return out
-
-
+from notebooks.vcode_codec import PairSchema, decode_attrs_from_code
 
 # ---------------------------------------------------------------------
 # 기본 페이지 설정 (wide + 제목/아이콘)
@@ -208,10 +108,55 @@ if "__basis_override" not in st.session_state:
 df = load_catalog()
 
 # ---------------------------------------------------------------------
-# 2) 빠른 검색 (V*** / ####/##### / ★ 11자리)
+# 2) 빠른 검색 (입력 중 자동완성 · V*** / ####/##### / ★ 11자리)
 # ---------------------------------------------------------------------
-with st.expander("🔎 빠른 검색 (V*** 또는 KM 4~5자리)"):
-    q = st.text_input("품명코드(Part Type) 검색", placeholder="예: V111 / 2655 / V111260408")
+def _rerun():
+    try:
+        st.rerun()
+    except Exception:
+        st.experimental_rerun()
+
+def _hit_label(h) -> str:
+    """추천 버튼 문구: 'IK V111 ↔ 2655 · 육각 볼트 [볼트]' (앞의 IK/OK = 추천 part_type 측)"""
+    pair_txt = (f"{h.part_type} ↔ {h.paired}" if h.site == "IK" else f"{h.paired} ↔ {h.part_type}") \
+        if h.paired else h.part_type
+    return f"{h.site} {pair_txt} · {h.remark or '-'} [{h.category or '-'}]"
+
+@st.fragment
+def quick_search():
+    """입력이 잠깐 멈출 때마다 이 영역만 다시 그림 (색인 조회만, 페이지 전체 재실행 없음)"""
+    q = st.text_input("품명코드(Part Type) 검색", placeholder="예: V111 / 2655 / 볼트 / V111260408",
+                      key="quick_q", live="200ms")
+    hits = load_catalog_index().suggest(q, limit=8) if (q or "").strip() else []
+    for i, h in enumerate(hits):
+        if st.button(_hit_label(h), key=f"quick_hit_{i}"):
+            st.session_state.pref_pt  = h.part_type
+            st.session_state.pref_cat = h.category or None
+            st.session_state.prefill_attrs = {}
+            st.session_state.__basis_override = None
+            _rerun()
+
+    # 접두 추천이 모자라면 오타/띄어쓰기를 허용한 유사 항목으로 채움
+    if (q or "").strip() and len(hits) < 8:
+        shown = {h.part_type for h in hits}
+        fz = [h for h in load_fuzzy_index().search(q, limit=8, kinds=("remark", "category"))
+              if h.part_type not in shown][:8 - len(hits)]
+        if fz:
+            st.caption("비슷한 항목 (오타·띄어쓰기 허용)")
+        for i, h in enumerate(fz):
+            label = (f"≈ {h.site} {h.part_type} · {h.text} [{h.category or '-'}]" if h.kind == "remark"
+                     else f"≈ 대분류 {h.text}")
+            if st.button(label, key=f"quick_fz_{i}"):
+                st.session_state.pref_pt  = h.part_type or None
+                st.session_state.pref_cat = h.category or None
+                st.session_state.prefill_attrs = {}
+                st.session_state.__basis_override = None
+                _rerun()
+
+    msg = st.session_state.pop("quick_msg", None)        # 직전 '찾기'의 이동 안내 (재실행 전에 띄우면 바로 사라짐)
+    if msg:
+        st.success(msg)
+
     if st.button("찾기", use_container_width=False):
         s = (q or "").strip().upper()
 
@@ -220,29 +165,30 @@ with st.expander("🔎 빠른 검색 (V*** 또는 KM 4~5자리)"):
             udf_local = load_union_schema()
             side = "IK" if s.startswith("V") else "OK"
             pair_id, attrs, pt = decode_attrs_from_code(udf_local, side, s)
-
-            # 카탈로그에서 part_type 찾아 화면 이동
-            hit = df[df.part_type.astype(str) == pt]
-            if hit.empty and side == "OK":
-                # OK 5자리 우선이라면 4자리 보정
-                hit = df[df.part_type.astype(str) == s[:4]]
-
-            if hit.empty:
-                st.warning("카탈로그에서 해당 part_type을 찾지 못했습니다.")
+            if not pair_id:
+                st.warning("union_schema에서 코드 앞자리와 일치하는 part_type을 찾지 못했습니다.")
             else:
-                st.session_state.pref_pt  = hit.iloc[0]["part_type"]
-                st.session_state.pref_cat = hit.iloc[0]["category"]
+                # 카탈로그에서 part_type 찾아 화면 이동
+                hit = df[df.part_type.astype(str) == pt]
+                if hit.empty:
+                    # 카탈로그 표기가 다르면(4/5자리 KM, V## 그룹) 최장 접두 part_type으로 보정
+                    m = load_part_type_index().resolve(s, side)
+                    if m is not None:
+                        hit = df[df.part_type.astype(str) == m.part_type]
+
+                if hit.empty:
+                    st.warning("카탈로그에서 해당 part_type을 찾지 못했습니다.")
+                else:
+                    st.session_state.pref_pt  = hit.iloc[0]["part_type"]
+                    st.session_state.pref_cat = hit.iloc[0]["category"]
 
-            # ★ 변경: 프리필 값과 기준방향 세션 저장
-            st.session_state.prefill_attrs = {k: ("" if attrs.get(k) is None else str(attrs.get(k))) for k in attrs}
-            st.session_state.__basis_override = ("익산 코드 입력 → 옥천 자동 조회" if side=="IK"
-                                                 else "옥천 코드 입력 → 익산 자동 조회")
+                # ★ 변경: 프리필 값과 기준방향 세션 저장
+                st.session_state.prefill_attrs = {k: ("" if attrs.get(k) is None else str(attrs.get(k))) for k in attrs}
+                st.session_state.__basis_override = ("익산 코드 입력 → 옥천 자동 조회" if side=="IK"
+                                                     else "옥천 코드 입력 → 익산 자동 조회")
 
-            st.success(f"선택 이동: {pt} (코드 프리필 완료)")
-            try:
-                st.rerun()
-            except Exception:
-                st.experimental_rerun()
+                st.session_state.quick_msg = f"선택 이동: {pt} (코드 프리필 완료)"   # 재실행 뒤에 표시
+                _rerun()
 
         # (B) part_type만 검색 (V### 또는 ####/#####)
         elif re.fullmatch(r"V\d{3}", s) or re.fullmatch(r"\d{4,5}", s):
@@ -255,10 +201,61 @@ with st.expander("🔎 빠른 검색 (V*** 또는 KM 4~5자리)"):
                 # ★ 변경: 프리필 초기화
                 st.session_state.prefill_attrs = {}
                 st.session_state.__basis_override = None
-                st.success(f"선택 이동: {s}")
+                st.session_state.quick_msg = f"선택 이동: {s}"
+                _rerun()
         else:
             st.error("형식이 올바르지 않습니다. V### / #### / ##### / 또는 11자리 코드")
 
+with st.expander("🔎 빠른 검색 (V*** · KM 4~5자리 · 품명/대분류)"):
+    quick_search()
+
+# ---------------------------------------------------------------------
+# 2-1) 라벨로 코드 찾기 (재질/표면명 등 → lookup 코드)
+# ---------------------------------------------------------------------
+with st.expander("🏷 라벨로 코드 찾기 (예: SUS304 / Zn plating)"):
+    lq = st.text_input("라벨 검색", placeholder="재질·표면·등급 등 이름 일부", key="label_q")
+    if (lq or "").strip():
+        lhits = load_label_index().search(lq, limit=30)
+        if lhits:
+            st.dataframe(
+                [{"table": h.table, "part_type": h.part_type, "code": h.code, "label": h.label} for h in lhits],
+                use_container_width=True, hide_index=True,
+            )
+        else:
+            # 일치하는 라벨이 없으면 오타/띄어쓰기를 허용한 유사 라벨
+            fz = load_fuzzy_index().search(lq, limit=30, kinds=("label",))
+            if not fz:
+                st.info("일치하는 라벨이 없습니다.")
+            else:
+                st.caption("정확히 일치하는 라벨이 없어 비슷한 라벨을 표시합니다.")
+                st.dataframe(
+                    [{"table": h.table, "part_type": h.part_type, "code": h.code, "label": h.text,
+                      "score": h.score} for h in fz],
+                    use_container_width=True, hide_index=True,
+                )
+
+# ---------------------------------------------------------------------
+# 2-2) 유사 검색 (품명 / 대분류 / 라벨, 오타·띄어쓰기 허용, site·대분류 필터)
+# ---------------------------------------------------------------------
+with st.expander("🔤 유사 검색 (예: 볼투 / 와쎠 / zn plateing)"):
+    fq = st.text_input("검색어", placeholder="품명·대분류·라벨 (한글/영문, 오타 허용)", key="fuzzy_q")
+    g1, g2, g3 = st.columns([1, 2, 3])
+    with g1:
+        f_site = st.radio("site", ["전체", "IK", "OK"], horizontal=True, key="fuzzy_site")
+    with g2:
+        f_cat = st.selectbox("대분류 필터", ["전체"] + sorted(df["category"].dropna().astype(str).unique()),
+                             key="fuzzy_cat")
+    with g3:
+        f_kinds = st.multiselect("대상", ["remark", "category", "label"], default=["remark", "category", "label"],
+                                 key="fuzzy_kinds")
+    if (fq or "").strip():
+        fhits = load_fuzzy_index().search(fq, limit=30, site=None if f_site == "전체" else f_site,
+                                          category=None if f_cat == "전체" else f_cat, kinds=f_kinds)
+        if not fhits:
+            st.info("비슷한 항목이 없습니다.")
+        else:
+            st.dataframe([h._asdict() for h in fhits], use_container_width=True, hide_index=True)
+
 # ---------------------------------------------------------------------
 # 3) 대분류 → 세부명칭 (IK 우선 / Cross_Map 라벨 표시)
 # ---------------------------------------------------------------------
@@ -316,11 +313,22 @@ ik_pt = sel_pt if sel_pt.startswith("V") else (paired_pt or "")
 ok_pt = (paired_pt or "") if sel_pt.startswith("V") else sel_pt
 st.caption(f"선택된 Pair  |  IK: {ik_pt or '-'}  /  OK: {ok_pt or '-'}")
 
-# union 스키마 + pair_id
-udf = load_union_schema()
+# 좌/우 이미지 프리페치: pair가 정해지면 바로 양쪽 탐색+썸네일 디코드를 백그라운드 풀에서 시작
+# (아래 폼을 그리고 입력하는 동안 진행 → 8)에서는 결과만 모음)
+IMG_OPTS = dict(
+    images_dir="images",
+    max_n=5,
+    min_prefix_len=3,  # V11처럼 3글자까지만 접두어 허용 (필요시 2로 낮출 수 있음)
+    size=GRID_SIZE,
+    single_size=GRID_SIZE * 2,  # 1장뿐이면 확대 보기가 없으므로 큰 썸네일
+)
+img_jobs = {site: prefetch_images(pt, site, **IMG_OPTS) for site, pt in (("IK", ik_pt), ("OK", ok_pt)) if pt}
+
+# union 스키마(pair별 객체) + pair_id
 pair_id = f"{ik_pt}_{ok_pt}" if (ik_pt and ok_pt) else None
+ps = load_pair_schemas().get(pair_id) if pair_id else None
 
-if pair_id and udf[udf["pair_id"] == pair_id].empty:
+if pair_id and ps is None:
     st.warning(f"union_schema에 pair_id '{pair_id}' 행이 없습니다. (빌더 최신화 확인)")
 
 # ---------------------------------------------------------------------
@@ -342,28 +350,6 @@ other_side = "OK" if basis_ik else "IK"
 # ---------------------------------------------------------------------
 # 5) 속성 렌더러 (slot 순 정렬 + 프리필 주입)
 # ---------------------------------------------------------------------
-def _slot_range(slot: str):
-    try:
-        rng = _slot_to_range(slot)
-        if not rng:
-            return (999, 999)
-        return rng
-    except Exception:
-        return (999, 999)
-
-def _order_keys_by_slot(udf, pair_id: str, side: str, keys: list[str]) -> list[str]:
-    col_slot = "ik_slot" if side.upper()=="IK" else "ok_slot"
-    S = udf[udf["pair_id"] == pair_id].set_index("key")
-    pairs = []
-    for k in keys:
-        if k in S.index:
-            a,b = _slot_range(str(S.loc[k][col_slot] or ""))
-            pairs.append((a, b, k))
-        else:
-            pairs.append((999, 999, k))
-    pairs.sort()
-    return [k for _,__,k in pairs]
-
 # ★ 변경: 프리필을 실제 위젯 기본값으로 주입하는 헬퍼
 def _prime_default(widget_key: str, value: str):
     """해당 위젯 key가 아직 세션에 없을 때만 초기값을 주입."""
@@ -373,12 +359,13 @@ def _prime_default(widget_key: str, value: str):
         st.session_state[widget_key] = str(value)
 
 def _render_inputs_for_side(
-    udf, pair_id: str, side: str, pt_for_lookup: str,
+    ps: PairSchema | None, side: str, pt_for_lookup: str,
     keys: list[str], tag_suffix: str=""
 ) -> dict:
+    if ps is None:
+        return {}
     lookups = load_lookups()
-    S = udf[udf["pair_id"] == pair_id].copy().set_index("key")
-    keys_sorted = _order_keys_by_slot(udf, pair_id, side, keys)
+    keys_sorted = ps.sort_keys(side, keys)
 
     # ★ 변경: 11자리에서 해석해 온 프리필 딕셔너리
     prefill = st.session_state.get("prefill_attrs", {}) or {}
@@ -387,31 +374,27 @@ def _render_inputs_for_side(
     cols = st.columns(2)
     i = 0
     for k in keys_sorted:
-        if k not in S.index:
+        spec = ps.specs.get(k)
+        if spec is None:
             st.warning(f"{k} : union_schema에 없음")
             continue
-        r = S.loc[k]
-        dtype   = str(r.get("dtype","") or "").strip()
-        lookup  = str(r.get("lookup","") or "").strip()
-        ik_slot = str(r.get("ik_slot","") or "")
-        ok_slot = str(r.get("ok_slot","") or "")
-
-        slot = ik_slot if side.upper()=="IK" else ok_slot
-        a,b = _slot_range(slot)
-        width_hint = 0 if a==999 else (b-a+1)
+        dtype  = spec.dtype
+        lookup = spec.lookup
+        width_hint = spec.width(side)
 
         c = cols[i % 2]; i += 1
         label = f"{k}{tag_suffix}"
-        key = f"U:{pair_id}:{side}:{k}"
+        key = f"U:{ps.pair_id}:{side}:{k}"
 
         # 프리필 값(문자열) 준비
         pre_val = "" if prefill.get(k) is None else str(prefill.get(k)).strip()
 
         if dtype == "lookup" and lookup:
-            system_local = "IK" if str(pt_for_lookup).upper().startswith("V") else "OK"
-            opts = _merged_lookup_options(lookups, lookup, system_local, pt_for_lookup)  # {code: label}
+            # load_lookups()가 미리 병합한 옵션표(정확 > 그룹 > 공통)에서 사전 조회만
+            opts = lookup_options(lookups, lookup, pt_for_lookup)  # {code: label}
             if opts:
                 codes = list(opts.keys())
+                pre_val = match_code(opts, pre_val)                # 해석값 '7' → 옵션표 표기 '07'
                 # ★ 변경: selectbox 기본값 주입
                 if pre_val and pre_val in codes:
                     _prime_default(key, pre_val)
@@ -433,12 +416,11 @@ def _render_inputs_for_side(
 
     return attrs
 
-def get_required_sets(udf, pair_id: str, base_side: str):
-    need_base  = required_keys(udf, pair_id, base_side)
-    need_extra = extra_keys_from_other_side(udf, pair_id, base_side)
+def get_required_sets(ps: PairSchema, base_side: str):
+    need_base  = ps.required_keys(base_side)
+    need_extra = ps.extra_keys(base_side)
     if not need_base and not need_extra:
-        all_keys = udf[udf["pair_id"] == pair_id]["key"].dropna().unique().tolist()
-        need_base = all_keys
+        need_base = list(ps.keys)
     return need_base, need_extra
 
 # ---------------------------------------------------------------------
@@ -448,17 +430,17 @@ ik_selected, ok_selected = {}, {}
 col_left, col_right = st.columns(2)
 
 need_base, need_extra = ([], [])
-if pair_id:
-    need_base, need_extra = get_required_sets(udf, pair_id, base_side)
+if ps is not None:
+    need_base, need_extra = get_required_sets(ps, base_side)
 
 with col_left:
     st.subheader("익산")
     if ik_pt and ok_pt and pair_id:
         if basis_ik:
-            ik_selected = _render_inputs_for_side(udf, pair_id, "IK", ik_pt, need_base)
+            ik_selected = _render_inputs_for_side(ps, "IK", ik_pt, need_base)
             st.caption(f"part_type: {ik_pt}  (기준 측)")
         else:
-            ik_selected = _render_inputs_for_side(udf, pair_id, "IK", ik_pt, need_extra, tag_suffix=" (추가)")
+            ik_selected = _render_inputs_for_side(ps, "IK", ik_pt, need_extra, tag_suffix=" (추가)")
             st.caption(f"part_type: {ik_pt}  (상대측 추가)")
     else:
         st.caption(f"part_type: {ik_pt or '-'} (자동 조회 대상)")
@@ -467,10 +449,10 @@ with col_right:
     st.subheader("옥천")
     if ik_pt and ok_pt and pair_id:
         if basis_ik:
-            ok_selected = _render_inputs_for_side(udf, pair_id, "OK", ok_pt, need_extra, tag_suffix=" (추가)")
+            ok_selected = _render_inputs_for_side(ps, "OK", ok_pt, need_extra, tag_suffix=" (추가)")
             st.caption(f"part_type: {ok_pt}  (상대측 추가)")
         else:
-            ok_selected = _render_inputs_for_side(udf, pair_id, "OK", ok_pt, need_base)
+            ok_selected = _render_inputs_for_side(ps, "OK", ok_pt, need_base)
             st.caption(f"part_type: {ok_pt}  (기준 측)")
     else:
         st.caption(f"part_type: {ok_pt or '-'} (자동 조회 대상)")
@@ -483,6 +465,9 @@ if st.button("조회"):
     if not pair_id:
         st.error("IK/OK pair가 확정되지 않았습니다.")
         st.stop()
+    if ps is None:
+        st.error(f"union_schema에 pair_id '{pair_id}' 가 없어 코드를 만들 수 없습니다.")
+        st.stop()
 
     # 좌/우 입력 병합
     attrs = {}
@@ -490,8 +475,8 @@ if st.button("조회"):
     attrs.update(ok_selected or {})
 
     # 필수 누락 점검
-    miss_base  = missing_required_keys(udf, pair_id, base_side,  attrs)
-    miss_other = missing_required_keys(udf, pair_id, other_side, attrs)
+    miss_base  = ps.missing(base_side,  attrs)
+    miss_other = ps.missing(other_side, attrs)
     if miss_base:
         st.error(f"기준({base_side}) 필수 누락: {miss_base}")
         st.stop()
@@ -499,43 +484,31 @@ if st.button("조회"):
         st.warning(f"상대({other_side}) 필수 누락: {miss_other} — 이 키들까지 입력하면 완전한 11자리 생성")
 
     # 11자리 동시 생성
-    ik_code, ok_code = encode_both(udf, pair_id, attrs)
+    ik_code, ok_code = ps.encode_both(attrs)
     if ik_code: st.success(f"IK 코드: `{ik_code}`")
     if ok_code: st.success(f"OK 코드: `{ok_code}`")
 
-    # matched_parts 확인/보강
-    mdf = load_matched_full().copy()
-    if not mdf.empty:
-        ik_col = next((c for c in mdf.columns if "ik" in c.lower() and "code" in c.lower()),
-                      mdf.columns[0])
-        ok_col = next((c for c in mdf.columns if ("ok" in c.lower() and "code" in c.lower())
-                       or "km" in c.lower()),
-                      mdf.columns[1] if mdf.shape[1] > 1 else mdf.columns[0])
-        mdf["__ik_norm"] = mdf[ik_col].map(_norm)
-        mdf["__ok_norm"] = mdf[ok_col].map(_norm)
-
+    # matched_parts 확인/보강 (정규화 코드 색인 조회 — 복사/전체 정규화 없음)
+    mi = load_matched_index()
+    if mi is not None and len(mi):
         if ik_code:
-            hit = mdf[mdf["__ik_norm"] == _norm(ik_code)]
-            if not hit.empty:
-                ok_code = hit.iloc[0][ok_col]
+            hit = mi.counterpart("IK", ik_code)
+            if hit is not None:
+                ok_code = hit
                 st.info(f"matched_parts 기준 OK: `{ok_code}`")
         elif ok_code:
-            hit = mdf[mdf["__ok_norm"] == _norm(ok_code)]
-            if not hit.empty:
-                ik_code = hit.iloc[0][ik_col]
+            hit = mi.counterpart("OK", ok_code)
+            if hit is not None:
+                ik_code = hit
                 st.info(f"matched_parts 기준 IK: `{ik_code}`")
 
 # ---------------------------------------------------------------------
 # 8) 이미지 출력 (좌=IK / 우=OK)
 # ---------------------------------------------------------------------
 def render_images(part_code: str, site: str):
-    imgs, used_key = find_images_with_prefix_fallback(
-        part_code=part_code,
-        site=site,
-        base_dir="images",
-        max_n=5,
-        min_prefix_len=3,  # V11처럼 3글자까지만 접두어 허용 (필요시 2로 낮출 수 있음)
-    )
+    job = img_jobs.get(site) or prefetch_images(part_code, site, **IMG_OPTS)
+    items, used_key = collect_images(job)   # [(원본, 썸네일)] — 손상 파일은 제외됨
+    imgs = [src for src, _ in items]
 
     st.subheader("이미지")
     if not imgs:
@@ -546,16 +519,16 @@ def render_images(part_code: str, site: str):
     if used_key and used_key != part_code:
         st.caption(f"공유 이미지 사용: '{used_key}_*'")
 
-    # 그리드 표시
+    # 그리드 표시 (썸네일)
     n = len(imgs)
     cols = st.columns(min(5, n))
-    for i, img_path in enumerate(imgs):
+    for i, (img_path, thumb) in enumerate(items):
         with cols[i % len(cols)]:
-            st.image(str(img_path), use_container_width=True, caption=img_path.name)
+            st.image(str(thumb), use_container_width=True, caption=img_path.name)
 
-    # 확대 보기
+    # 확대 보기 (원본)
     if n > 1:
-        picked = st.selectbox("크게 보기", [p.name for p in imgs], index=0)
+        picked = st.selectbox("크게 보기", [p.name for p in imgs], index=0, key=f"big_img:{site}")
         big = next(p for p in imgs if p.name == picked)
         st.image(str(big))
 
@@ -27,8 +27,12 @@ Cross_Map.csv:
 """
 
 from __future__ import annotations
+import hashlib
+import json
+import os
 import pandas as pd
 import re
+from pathlib import Path
 from typing import Tuple, Dict, Any
 
 # -------------------------------
@@ -79,33 +83,29 @@ def _slot_to_range(slot: str):
         return (i, i)
 
 # 빌더에 “중복이 있으면 하나로 압축(coalesce)”하고, 정의가 서로 달라 충돌할 땐 명확한 에러를 내도록 헬퍼
-def _coalesce_rows(df_block, side, part_type, key):
+def _coalesce_defs(df: pd.DataFrame, side: str, part_types=None) -> pd.DataFrame:
     """
-    동일 (part_type, key)에 대해 여러 행이 있을 때 처리:
+    동일 (part_type, key)에 대해 여러 행이 있을 때 처리 (한 번의 groupby로 전체 검사):
     - pos_from/pos_to/lookup 값이 모두 동일하면 첫 행만 채택
     - 값이 서로 다르면 에러를 발생시켜 사용자가 스키마를 정리하도록 유도
+    - part_types 를 주면 그 part_type들만 검사(Cross_Map에 쓰이지 않는 품명군의 충돌은 무시)
     """
-    if isinstance(df_block, pd.Series):
-        return df_block  # 이미 단일행
-
-    # df_block : 같은 key 로 필터된 DataFrame
-    tmp = df_block.copy()
-    tmp["pos_from"] = tmp["pos_from"].map(_to_int_like)
-    tmp["pos_to"]   = tmp["pos_to"].map(_to_int_like)
-    tmp["lookup"]   = tmp["lookup"].fillna("").astype(str)
-
-    sig = tmp[["pos_from","pos_to","lookup"]].drop_duplicates()
-
-    if len(sig) == 1:
-        # 완전히 동일 → 첫 행만 사용
-        return tmp.iloc[0]
-    else:
+    if part_types is not None:
+        df = df[df.part_type.isin(part_types)]
+    sig = df.drop_duplicates(["part_type", "key", "pos_from", "pos_to", "lookup"])
+    n_sig = sig.groupby(["part_type", "key"], sort=False)["key"].transform("size")
+    bad = sig[n_sig > 1]
+    if len(bad):
+        pt, key = bad.iloc[0]["part_type"], bad.iloc[0]["key"]
+        rows = df[(df.part_type == pt) & (df.key == key)]
         # 서로 다른 정의가 혼재 → 에러로 알려줌
         raise ValueError(
-            f"[중복 충돌] {side} part_type={part_type}, key={key} 에 대해 "
-            f"서로 다른 정의가 {len(tmp)}건 존재합니다.\n"
-            f"{tmp[['pos_from','pos_to','lookup']].to_string(index=False)}"
+            f"[중복 충돌] {side} part_type={pt}, key={key} 에 대해 "
+            f"서로 다른 정의가 {len(rows)}건 존재합니다.\n"
+            f"{rows[['pos_from','pos_to','lookup']].to_string(index=False)}"
         )
+    # 완전히 동일 → 첫 행만 사용
+    return sig
 
 # -------------------------------
 # 원본 스키마 → 얇은 표준형으로 슬림화
@@ -187,75 +187,137 @@ def _infer(row: pd.Series | None) -> Tuple[str, str, str]:
 # -------------------------------
 # 메인: 두 스키마 + Cross_Map → union_schema.csv
 # -------------------------------
-def build_union(ik_csv: str, ok_csv: str, cross_map_csv: str, out_csv: str = "data/union_schema.csv") -> pd.DataFrame:
+UNION_COLUMNS = [
+    "pair_id","ik_part_type","ok_part_type","key","dtype","lookup",
+    "required_ik","required_ok","ik_slot","ik_codec","ok_slot","ok_codec"
+]
+
+def _defs_by_part_type(df: pd.DataFrame) -> Dict[str, Dict[str, dict]]:
+    """part_type → {key: 행 dict} (part_type별 1회 그룹화)"""
+    out: Dict[str, Dict[str, dict]] = {}
+    for r in df.to_dict("records"):
+        out.setdefault(r["part_type"], {})[r["key"]] = r
+    return out
+
+def _pair_rows(ik_pt: str, ok_pt: str, Ai: Dict[str, dict], Bo: Dict[str, dict]) -> list:
+    """pair 1개의 union 행 목록 (key 정렬)"""
+    rows = []
+    DASH = "\u2013"  # EN DASH “–”
+    for k in sorted(set(Ai) | set(Bo)):
+        a = Ai.get(k)
+        b = Bo.get(k)
+
+        # 쪽별 필수 여부: 해당 스키마에 행이 있으면 True
+        required_ik = a is not None
+        required_ok = b is not None
+
+        # 슬롯 문자열 (엔대시 사용)
+        ik_slot = f"{_to_int_like(a['pos_from'])}{DASH}{_to_int_like(a['pos_to'])}" if a is not None else ""
+        ok_slot = f"{_to_int_like(b['pos_from'])}{DASH}{_to_int_like(b['pos_to'])}" if b is not None else ""
+
+        # dtype/lookup/codec 자동 추론
+        dtype_ik, lookup_ik, codec_ik = _infer(a)
+        dtype_ok, lookup_ok, codec_ok = _infer(b)
+
+        # 공통 dtype/lookup은 한쪽 정보라도 있으면 사용(lookup 우선)
+        dtype  = "lookup" if (lookup_ik or lookup_ok) else "int"
+        lookup = lookup_ik if lookup_ik else lookup_ok
+
+        rows.append(dict(
+            pair_id      = f"{ik_pt}_{ok_pt}",
+            ik_part_type = ik_pt,
+            ok_part_type = ok_pt,
+            key          = k,
+            dtype        = dtype,
+            lookup       = lookup,
+            required_ik  = required_ik,
+            required_ok  = required_ok,
+            ik_slot      = ik_slot,
+            ik_codec     = codec_ik if required_ik else "",
+            ok_slot      = ok_slot,
+            ok_codec     = codec_ok if required_ok else "",
+        ))
+    return rows
+
+def _pair_fingerprint(ik_pt: str, ok_pt: str, Ai: Dict[str, dict], Bo: Dict[str, dict]) -> str:
+    """pair를 만드는 입력(양쪽 스키마 정의)의 지문"""
+    sig = lambda d: sorted((k, r["pos_from"], r["pos_to"], r["lookup"]) for k, r in d.items())
+    return hashlib.sha1(repr((ik_pt, ok_pt, sig(Ai), sig(Bo))).encode("utf-8")).hexdigest()
+
+def _code_fingerprint() -> str:
+    """빌더 소스 해시 (_pair_rows / _coalesce_defs 등이 바뀌면 이전 행을 재사용하지 않도록)"""
+    try:
+        return hashlib.sha1(Path(__file__).read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+def _state_path(out_csv) -> Path:
+    out = Path(out_csv)
+    return out.parent / ".snapshot" / f"{out.stem}.state.json"
+
+def build_union(ik_csv: str, ok_csv: str, cross_map_csv: str, out_csv: str = "data/union_schema.csv",
+                incremental: bool = False) -> pd.DataFrame:
+    """
+    두 스키마 + Cross_Map → union_schema.csv
+    - 스키마는 part_type별로 한 번만 그룹화 → pair마다 전체 스캔 없음
+    - 중복/충돌 검사는 한 번의 groupby (_coalesce_defs)
+    - 같은 (ik, ok) pair가 Cross_Map에 여러 번 있으면(등급/실링별 규칙 등) 처음 1번만 생성
+    - incremental=True: 기존 union_schema.csv 에서 입력 지문이 같은 pair 행은 그대로 재사용하고
+      스키마 행/Cross_Map 항목이 바뀐 pair만 다시 생성 (지문은 <out폴더>/.snapshot/ 에 보관)
+      빌더 코드 지문이 다르면(이 파일이 바뀌면) 전체 재생성
+    """
     # CSV는 반드시 문자열로 읽어서 숫자/공백 이슈를 피한다
     ik    = pd.read_csv(ik_csv, dtype=str)
     ok    = pd.read_csv(ok_csv, dtype=str)
     pairs = pd.read_csv(cross_map_csv, dtype=str)
 
-    A = _slim(ik, IK_COL, side="IK"); A["side"] = "IK"
-    B = _slim(ok, OK_COL, side="OK"); B["side"] = "OK"
-    P = _slim_pairs(pairs)
-
-    rows = []
-    for _, p in P.iterrows():
-        ik_pt = p["ik_part_type"]
-        ok_pt = p["ok_part_type"]
-
-        Ai = A[A.part_type == ik_pt].set_index("key", drop=False)
-        Bo = B[B.part_type == ok_pt].set_index("key", drop=False)
-
-        keys = sorted(set(Ai.index) | set(Bo.index))
-        for k in keys:
-            # 변경 (중복 안전)
-            if k in Ai.index:
-                a = _coalesce_rows(Ai.loc[k], side="IK", part_type=ik_pt, key=k)
-            else:
-                a = None
-            if k in Bo.index:
-                b = _coalesce_rows(Bo.loc[k], side="OK", part_type=ok_pt, key=k)
-            else:
-                b = None
-
-            # 쪽별 필수 여부: 해당 스키마에 행이 있으면 True
-            required_ik = a is not None
-            required_ok = b is not None
-
-            # 슬롯 문자열
-          # 변경 (엔대시 사용)
-            DASH = "\u2013"  # EN DASH “–”
-            ik_slot = f"{_to_int_like(a['pos_from'])}{DASH}{_to_int_like(a['pos_to'])}" if a is not None else ""
-            ok_slot = f"{_to_int_like(b['pos_from'])}{DASH}{_to_int_like(b['pos_to'])}" if b is not None else ""
-
-            # dtype/lookup/codec 자동 추론
-            dtype_ik, lookup_ik, codec_ik = _infer(a)
-            dtype_ok, lookup_ok, codec_ok = _infer(b)
-
-            # 공통 dtype/lookup은 한쪽 정보라도 있으면 사용(lookup 우선)
-            dtype  = "lookup" if (lookup_ik or lookup_ok) else "int"
-            lookup = lookup_ik if lookup_ik else lookup_ok
-
-            rows.append(dict(
-                pair_id      = f"{ik_pt}_{ok_pt}",
-                ik_part_type = ik_pt,
-                ok_part_type = ok_pt,
-                key          = k,
-                dtype        = dtype,
-                lookup       = lookup,
-                required_ik  = required_ik,
-                required_ok  = required_ok,
-                ik_slot      = ik_slot,
-                ik_codec     = codec_ik if required_ik else "",
-                ok_slot      = ok_slot,
-                ok_codec     = codec_ok if required_ok else "",
-            ))
-
-    union = pd.DataFrame(rows, columns=[
-        "pair_id","ik_part_type","ok_part_type","key","dtype","lookup",
-        "required_ik","required_ok","ik_slot","ik_codec","ok_slot","ok_codec"
-    ])
-    union.to_csv(out_csv, index=False, encoding="utf-8-sig")
-    print(f"✅ union_schema.csv saved: {len(union)} rows → {out_csv}")
+    P = _slim_pairs(pairs).drop_duplicates(["ik_part_type", "ok_part_type"])
+    A = _coalesce_defs(_slim(ik, IK_COL, side="IK"), "IK", set(P.ik_part_type))
+    B = _coalesce_defs(_slim(ok, OK_COL, side="OK"), "OK", set(P.ok_part_type))
+    A_by = _defs_by_part_type(A)
+    B_by = _defs_by_part_type(B)
+
+    state_path = _state_path(out_csv)
+    code = _code_fingerprint()
+    old_fps, old_rows = {}, {}
+    if incremental and Path(out_csv).exists() and state_path.exists():
+        try:
+            state = json.loads(state_path.read_text(encoding="utf-8"))
+            old_fps = state.get("pairs", {}) if state.get("code") == code else {}
+            prev = pd.read_csv(out_csv, dtype=str, encoding="utf-8-sig", keep_default_na=False)
+            if list(prev.columns) == UNION_COLUMNS:
+                for c in ("required_ik", "required_ok"):
+                    prev[c] = prev[c].str.upper().isin(["TRUE", "1"])
+                for r in prev.to_dict("records"):
+                    old_rows.setdefault(r["pair_id"], []).append(r)
+        except (OSError, ValueError):
+            old_fps, old_rows = {}, {}
+
+    rows, fps = [], {}
+    rebuilt = reused = 0
+    for ik_pt, ok_pt in zip(P["ik_part_type"], P["ok_part_type"]):
+        Ai = A_by.get(ik_pt, {})
+        Bo = B_by.get(ok_pt, {})
+        pid = f"{ik_pt}_{ok_pt}"
+        fp = _pair_fingerprint(ik_pt, ok_pt, Ai, Bo)
+        fps[pid] = fp
+        if old_fps.get(pid) == fp and pid in old_rows:
+            rows.extend(old_rows[pid]); reused += 1
+        else:
+            rows.extend(_pair_rows(ik_pt, ok_pt, Ai, Bo)); rebuilt += 1
+
+    union = pd.DataFrame(rows, columns=UNION_COLUMNS)
+    tmp = Path(out_csv).with_name(Path(out_csv).name + ".tmp")
+    union.to_csv(tmp, index=False, encoding="utf-8-sig")
+    os.replace(tmp, out_csv)
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        state_path.write_text(json.dumps({"code": code, "pairs": fps}, ensure_ascii=False), encoding="utf-8")
+    except OSError:
+        pass
+    removed = len(set(old_rows) - set(fps)) if incremental else 0
+    print(f"✅ union_schema.csv saved: {len(union)} rows → {out_csv}"
+          + (f"  (pair 재생성 {rebuilt} / 재사용 {reused} / 삭제 {removed})" if incremental else ""))
     return union
 
 # -------------------------------
@@ -276,12 +338,23 @@ def validate_union(union: pd.DataFrame) -> Dict[str, pd.DataFrame]:
 # 직접 실행 예시
 # -------------------------------
 if __name__ == "__main__":
+    import argparse
+
     # 프로젝트 폴더 구조에 맞게 경로를 바꿔서 사용하세요.
+    ap = argparse.ArgumentParser(description="codeSchema_IK/OK + Cross_Map → union_schema.csv")
+    ap.add_argument("--ik", default="data/codeSchema_IK.csv")
+    ap.add_argument("--ok", default="data/codeSchema_OK.csv")
+    ap.add_argument("--cross-map", default="data/Cross_Map.csv")
+    ap.add_argument("--out", default="data/union_schema.csv")
+    ap.add_argument("--incremental", action="store_true", help="바뀐 pair만 다시 생성해 기존 파일에 반영")
+    args = ap.parse_args()
+
     u = build_union(
-        ik_csv        = "data/codeSchema_IK.csv",
-        ok_csv        = "data/codeSchema_OK.csv",
-        cross_map_csv = "data/Cross_Map.csv",
-        out_csv       = "data/union_schema.csv"
+        ik_csv        = args.ik,
+        ok_csv        = args.ok,
+        cross_map_csv = args.cross_map,
+        out_csv       = args.out,
+        incremental   = args.incremental,
     )
     probs = validate_union(u)
     for k, v in probs.items():
@@ -0,0 +1,284 @@
+# notebooks/match_iksan_okc.py
+# -*- coding: utf-8 -*-
+"""
+match_iksan_okc.py
+  • parsed_parts.csv   : 파서 결과 (IK / OK)
+  • Cross_Map.csv      : 품명군 매핑 규칙
+출력
+  • matched_parts.csv  : 익산 ↔ 옥천 품번 매칭 결과
+
+Cross_Map 규칙 = (ik_part_type, ik_grade_code, ik_seal_code) → (ok_km_code, note)
+- grade/seal 이 빈 칸이면 와일드카드
+- 여러 규칙이 걸리면 파일에서 가장 먼저 나온 규칙 1개(first-hit)
+
+CrossMapRules 는 규칙을 한 번 컴파일해 두고
+  part_type 해시 → 구체성 버킷 (g,s) / (g,*) / (*,s) / (*,*) 별 "첫 규칙 번호"
+로 찾는다. 걸리는 규칙 중 가장 앞선 번호 = 버킷 4개의 최솟값이므로 first-hit 와 결과가 같다.
+프레임 단위 해석은 고유 (part_type, grade, seal) 조합만 풀고 행 번호로 되돌려 붙인다.
+
+직접 실행:
+    python notebooks/match_iksan_okc.py                       # scripts/ 에서, 기본 data/ 경로
+    python notebooks/match_iksan_okc.py --parsed a.csv --out b.csv
+    python notebooks/match_iksan_okc.py --chunksize 50000      # 청크 크기(메모리 상한) 조정
+
+대용량: match_to_csv / iter_match_chunks 가 parsed_parts 를 청크 단위로 읽어 이어 쓴다.
+OK 측 (part_type, remark)만 한 번 적재하고 IK 행은 청크로 흘려 보내므로 메모리는 청크 크기에 비례.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+PP_CSV   = BASE_DIR / "data" / "parsed_parts.csv"
+XMAP_CSV = BASE_DIR / "data" / "Cross_Map.csv"
+OUT_CSV  = BASE_DIR / "data" / "matched_parts.csv"
+
+NO_RULE = -1
+
+
+# -------------------------------
+# Cross_Map 규칙 인덱스
+# -------------------------------
+def _str_col(df: pd.DataFrame, col: str) -> np.ndarray:
+    """컬럼을 문자열 배열로 (없으면 빈 문자열)"""
+    if col not in df.columns:
+        return np.full(len(df), "", dtype=object)
+    return df[col].fillna("").astype(str).to_numpy(dtype=object)
+
+
+class CrossMapRules:
+    """
+    Cross_Map 규칙 컴파일 결과 (읽기 전용)
+    - rule_id(pt, grade, seal): 첫 매칭 규칙 번호(없으면 -1)
+    - rule_ids(frame, ...)    : 프레임 전체의 규칙 번호 배열
+    - attach(frame, ...)      : ok_km_code / map_note 컬럼을 붙인 프레임
+    """
+
+    def __init__(self, xmap: pd.DataFrame):
+        pts    = _str_col(xmap, "ik_part_type")
+        grades = _str_col(xmap, "ik_grade_code")
+        seals  = _str_col(xmap, "ik_seal_code")
+        self.ok_km_code = _str_col(xmap, "ok_km_code")
+        self.note       = _str_col(xmap, "note")
+
+        # part_type → {(grade|'', seal|''): 첫 규칙 번호}   ('' = 와일드카드 버킷)
+        self._index: Dict[str, Dict[Tuple[str, str], int]] = {}
+        for i, (pt, g, s) in enumerate(zip(pts, grades, seals)):
+            self._index.setdefault(pt, {}).setdefault((g, s), i)
+
+    def __len__(self) -> int:
+        return len(self.ok_km_code)
+
+    def rule_id(self, part_type: str, grade: str = "", seal: str = "") -> int:
+        buckets = self._index.get(part_type)
+        if not buckets:
+            return NO_RULE
+        best = NO_RULE
+        # 구체성 순 (g,s) → (g,*) → (*,s) → (*,*); 규칙 순서는 번호 최솟값으로 보존
+        for key in ((grade, seal), (grade, ""), ("", seal), ("", "")):
+            i = buckets.get(key)
+            if i is not None and (best == NO_RULE or i < best):
+                best = i
+        return best
+
+    def rule_ids(self, frame: pd.DataFrame, pt_col: str = "part_type",
+                 grade_col: str = "grade_code", seal_col: str = "seal_snap_code") -> np.ndarray:
+        """행별 첫 매칭 규칙 번호 (int64, 없으면 -1). 고유 조합만 해석"""
+        n = len(frame)
+        if n == 0:
+            return np.empty(0, dtype=np.int64)
+        keys = pd.DataFrame({
+            "pt": _str_col(frame, pt_col),
+            "g":  _str_col(frame, grade_col),
+            "s":  _str_col(frame, seal_col),
+        })
+        group = keys.groupby(["pt", "g", "s"], sort=False).ngroup().to_numpy()
+        uniq = keys.drop_duplicates()              # ngroup(sort=False) 와 같은 첫 등장 순서
+        resolved = np.fromiter(
+            (self.rule_id(pt, g, s) for pt, g, s in zip(uniq["pt"], uniq["g"], uniq["s"])),
+            dtype=np.int64, count=len(uniq),
+        )
+        return resolved[group]
+
+    def attach(self, frame: pd.DataFrame, **cols) -> pd.DataFrame:
+        """frame 에 ok_km_code / map_note 를 붙여 새 프레임으로 반환 (인덱스는 0..n-1)"""
+        ids = self.rule_ids(frame, **cols)
+        hit = ids != NO_RULE
+        safe = np.where(hit, ids, 0)
+        out = frame.reset_index(drop=True).copy()
+        if len(self):
+            out["ok_km_code"] = np.where(hit, self.ok_km_code[safe], "")
+            out["map_note"]   = np.where(hit, self.note[safe], "")
+        else:
+            out["ok_km_code"] = ""
+            out["map_note"]   = ""
+        return out
+
+
+def compile_crossmap_rules(xmap: pd.DataFrame) -> CrossMapRules:
+    return CrossMapRules(xmap)
+
+
+def attach_km(df_ik: pd.DataFrame, xmap_df: pd.DataFrame,
+              rules: CrossMapRules | None = None) -> pd.DataFrame:
+    """
+    IK 행마다 Cross_Map 첫 매칭 규칙의 ok_km_code / note(→ map_note) 를 붙임
+    - rules 를 넘기면 재컴파일 없이 사용(청크 처리 등)
+    """
+    rules = rules or compile_crossmap_rules(xmap_df)
+    return rules.attach(df_ik)
+
+
+# -------------------------------
+# 매칭
+# -------------------------------
+def match_parts(parts: pd.DataFrame, xmap: pd.DataFrame,
+                rules: CrossMapRules | None = None) -> pd.DataFrame:
+    """parsed_parts + Cross_Map → matched_parts 프레임"""
+    # 익산 / 옥천 분리
+    ik = parts[parts.system == 'IK']
+    ok = parts[parts.system == 'OK']
+
+    ik_map = attach_km(ik, xmap, rules)
+    return join_ok(ik_map, ok[['part_type', 'remark']])
+
+
+def join_ok(ik_map: pd.DataFrame, ok: pd.DataFrame) -> pd.DataFrame:
+    """ok_km_code 가 붙은 IK 행 + 옥천 (part_type, remark) → matched 행"""
+    # ── 옥천 품명군과 단순 Join (part_type = ok_km_code)
+    merged = ik_map.merge(
+        ok,                                   # 옥천에 있는 추가 정보 원하면 더 붙일 수 있음
+        left_on='ok_km_code', right_on='part_type',
+        how='left', suffixes=('_IK', '_OK')
+    )
+
+    merged['match_flag'] = merged.part_type_OK.where(
+        merged.part_type_OK.notna(), 'NO_MATCH')
+    return merged
+
+
+# -------------------------------
+# 청크 스트리밍 매칭 (메모리 일정)
+# -------------------------------
+class MatchProgress:
+    """청크 매칭 진행/처리량 카운터 (청크마다 갱신되어 yield 됨)"""
+
+    def __init__(self):
+        self.chunks = 0
+        self.rows_in = 0        # 읽은 parsed_parts 행 수
+        self.ik_rows = 0        # 그중 IK 행 수
+        self.rows_out = 0       # 출력 행 수
+        self.matched = 0        # match_flag != NO_MATCH
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows_in / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def no_match(self) -> int:
+        return self.rows_out - self.matched
+
+    def __repr__(self) -> str:
+        return (f"MatchProgress(chunks={self.chunks}, rows_in={self.rows_in}, ik_rows={self.ik_rows}, "
+                f"rows_out={self.rows_out}, matched={self.matched}, {self.rows_per_sec:,.0f} rows/s)")
+
+
+def _read_ok_side(parsed_path, encoding: str, chunksize: int) -> pd.DataFrame:
+    """1차 패스: OK 행의 (part_type, remark)만 모음 (Join 상대, 파일 순서 유지)"""
+    parts = []
+    for chunk in pd.read_csv(parsed_path, dtype=str, encoding=encoding, chunksize=chunksize,
+                             usecols=lambda c: c in ("system", "part_type", "remark")):
+        chunk = chunk.fillna('')
+        if "remark" not in chunk.columns:
+            chunk["remark"] = ''
+        parts.append(chunk.loc[chunk.system == 'OK', ['part_type', 'remark']])
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=['part_type', 'remark'])
+
+
+def iter_match_chunks(parsed_path, xmap: pd.DataFrame, chunksize: int = 100_000,
+                      encoding: str = "cp949", progress: MatchProgress | None = None):
+    """
+    parsed_parts.csv 를 chunksize 행씩 읽어 매칭한 결과를 (청크 결과, MatchProgress) 로 yield
+    - Cross_Map 규칙은 한 번만 컴파일, OK 측 (part_type, remark)는 1차 패스로 한 번만 적재
+    - 청크 결과를 순서대로 이어 붙이면 match_parts(전체) 결과와 같다
+      (left merge는 왼쪽 행 순서를 보존하므로 IK 행을 나눠 처리해도 순서/중복 행이 동일)
+    - progress 를 넘기면 그 객체를 갱신 (IK 행이 없는 청크도 읽은 행 수에 반영됨)
+    """
+    rules = compile_crossmap_rules(xmap)
+    ok = _read_ok_side(parsed_path, encoding, chunksize)
+    prog = progress or MatchProgress()
+    for chunk in pd.read_csv(parsed_path, dtype=str, encoding=encoding, chunksize=chunksize):
+        chunk = chunk.fillna('')
+        prog.chunks += 1
+        prog.rows_in += len(chunk)
+        ik = chunk[chunk.system == 'IK']
+        if ik.empty:
+            continue
+        merged = join_ok(rules.attach(ik), ok)
+        prog.ik_rows += len(ik)
+        prog.rows_out += len(merged)
+        prog.matched += int((merged['match_flag'] != 'NO_MATCH').sum())
+        yield merged, prog
+
+
+def match_to_csv(parsed_path, xmap_path, out_path, chunksize: int = 100_000,
+                 encoding: str = "cp949", on_progress=None) -> MatchProgress:
+    """
+    스트리밍 매칭 → out_path 에 청크마다 이어 쓰기 (출력은 일괄 처리 결과와 동일)
+    - on_progress(MatchProgress): 청크마다 호출 (진행률/처리량 표시용)
+    """
+    xmap = pd.read_csv(xmap_path, dtype=str).fillna('')
+    prog = MatchProgress()
+    header = True
+    tmp = Path(out_path).with_name(Path(out_path).name + ".tmp")
+    try:
+        for merged, _ in iter_match_chunks(parsed_path, xmap, chunksize, encoding, prog):
+            merged.to_csv(tmp, index=False, encoding=encoding, mode="w" if header else "a", header=header)
+            header = False
+            if on_progress:
+                on_progress(prog)
+        if header:
+            # IK 행이 하나도 없으면 빈 결과(헤더만) — 일괄 처리와 같은 컬럼 구성
+            empty = pd.read_csv(parsed_path, dtype=str, encoding=encoding, nrows=0)
+            match_parts(empty, xmap).to_csv(tmp, index=False, encoding=encoding)
+        os.replace(tmp, out_path)             # 다 쓴 뒤 교체 → 앱이 반쯤 쓴 파일을 읽지 않음
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return prog
+
+
+def main(argv=None) -> MatchProgress:
+    ap = argparse.ArgumentParser(description="익산 ↔ 옥천 품번 매칭 (matched_parts.csv)")
+    ap.add_argument("--parsed", default=str(PP_CSV), help="parsed_parts.csv 경로")
+    ap.add_argument("--crossmap", default=str(XMAP_CSV), help="Cross_Map.csv 경로")
+    ap.add_argument("--out", default=str(OUT_CSV), help="출력 matched_parts.csv 경로")
+    ap.add_argument("--encoding", default="cp949", help="parsed_parts 입력/출력 인코딩")
+    ap.add_argument("--chunksize", type=int, default=100_000, help="한 번에 읽을 행 수")
+    args = ap.parse_args(argv)
+
+    def _report(p: MatchProgress):
+        print(f"  … {p.rows_in:,}행 읽음 / {p.rows_out:,}행 출력 "
+              f"(매칭 {p.matched:,}, NO_MATCH {p.no_match:,}) {p.rows_per_sec:,.0f} rows/s", flush=True)
+
+    prog = match_to_csv(args.parsed, args.crossmap, args.out, args.chunksize, args.encoding, _report)
+    print(f"✅ 매칭 완료 → {args.out}  (총 {prog.rows_out}행)")
+    return prog
+
+
+if __name__ == "__main__":
+    main()
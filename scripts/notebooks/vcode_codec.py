@@ -1,9 +1,15 @@
 # notebooks/vcode_codec.py
 # -*- coding: utf-8 -*-
 
+import hashlib
 import re
+import weakref
+from collections import OrderedDict
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Tuple
 
 # ----------------------------
 # 소도구
@@ -71,43 +77,413 @@ def _apply_codec(value, codec: str, width_hint: int | None = None) -> str:
         return v.rjust(width_hint, "0")
     return v
 
+# ----------------------------
+# 컴파일된 pair 플랜
+#   union_schema의 pair 행들을 한 번만 해석해 불변 구조로 보관한다.
+#   encode/required_keys 등은 이 플랜만 보므로 호출 시 DataFrame 필터/iterrows/정규식이 없다.
+# ----------------------------
+_PLAN_COLS = ["pair_id", "ik_part_type", "ok_part_type", "key",
+              "required_ik", "required_ok", "ik_slot", "ik_codec", "ok_slot", "ok_codec",
+              "dtype", "lookup"]
+_OPTIONAL_COLS = ("dtype", "lookup")   # 없으면 빈 문자열로 취급 (UI 정보용)
+
+@dataclass(frozen=True)
+class SlotPlan:
+    """한 속성키의 한쪽(IK/OK) 자리 배치 규칙"""
+    key: str
+    start: int         # 0-based 시작 인덱스 (slot 'a-b' 의 a-1)
+    width: int         # slot 폭 (b-a+1)
+    kind: str          # "lookup" / "int" / "" (규칙 외 → best-effort)
+    codec_width: int   # int 코덱 width
+    pad: str           # int 코덱 pad 문자 ('' 이면 공백 정렬)
+
+@dataclass(frozen=True)
+class SidePlan:
+    prefix: str                  # 맨 앞 고정 prefix (= 해당 측 part_type)
+    slots: Tuple[SlotPlan, ...]  # slot이 있는 행만, union_schema 행 순서 유지
+    required: Tuple[str, ...]    # required_* == True 인 key (행 순서)
+
+@dataclass(frozen=True)
+class PairPlan:
+    pair_id: str
+    ik_part_type: str
+    ok_part_type: str
+    keys: Tuple[str, ...]        # pair의 모든 key (행 순서)
+    ik: SidePlan
+    ok: SidePlan
+
+    def side(self, side: str) -> SidePlan:
+        return self.ik if side.upper() == "IK" else self.ok
+
+def _slot_plan(key, slot, codec) -> SlotPlan | None:
+    rng = _slot_to_range(slot)
+    if rng is None:
+        return None
+    a, b = rng
+    c = _s(codec).strip()
+    if c.startswith("lookup:"):
+        kind, cw, pad = "lookup", 0, ""
+    elif c.startswith("int:"):
+        cw, pad = _parse_int_codec(c)
+        kind = "int"
+    else:
+        kind, cw, pad = "", 0, ""
+    return SlotPlan(key=key, start=a - 1, width=b - a + 1, kind=kind, codec_width=cw, pad=pad)
+
+def _compile_pair(pair_id: str, rows: List[tuple]) -> PairPlan:
+    # rows: _PLAN_COLS 순서의 튜플 목록
+    ik_slots, ok_slots, req_ik, req_ok, keys = [], [], [], [], []
+    for (_, _, _, key, r_ik, r_ok, ik_slot, ik_codec, ok_slot, ok_codec, _, _) in rows:
+        keys.append(key)
+        if r_ik == True:
+            req_ik.append(key)
+        if r_ok == True:
+            req_ok.append(key)
+        sp = _slot_plan(key, ik_slot, ik_codec)
+        if sp is not None:
+            ik_slots.append(sp)
+        sp = _slot_plan(key, ok_slot, ok_codec)
+        if sp is not None:
+            ok_slots.append(sp)
+    ik_pt, ok_pt = str(rows[0][1]), str(rows[0][2])
+    return PairPlan(
+        pair_id=pair_id, ik_part_type=ik_pt, ok_part_type=ok_pt, keys=tuple(keys),
+        ik=SidePlan(prefix=ik_pt, slots=tuple(ik_slots), required=tuple(req_ik)),
+        ok=SidePlan(prefix=ok_pt, slots=tuple(ok_slots), required=tuple(req_ok)),
+    )
+
+# ----------------------------
+# pair 스키마 객체 (UI/검증용)
+#   PairPlan(인코딩 규칙)에 key별 dtype/lookup/slot 정보와 측별 필수·추가 키 집합,
+#   slot 순 key 순서를 더해 한 번만 만든다 → 앱은 재실행마다 DataFrame을 거르지 않는다.
+# ----------------------------
+_NO_SLOT = (999, 999)   # slot이 없거나 해석 불가한 key의 정렬 위치 (맨 뒤)
+
+def _safe_range(slot) -> Tuple[int, int] | None:
+    try:
+        return _slot_to_range(slot)
+    except (TypeError, ValueError):
+        return None
+
+def _sort_by_slot(specs: Mapping[str, "KeySpec"], side: str, keys) -> List[str]:
+    """(slot 시작, slot 끝, key) 순 정렬. slot이 없거나 모르는 key는 맨 뒤"""
+    def rank(k):
+        spec = specs.get(k)
+        rng = spec.range(side) if spec is not None else None
+        return (*(rng or _NO_SLOT), k)
+    return sorted(keys, key=rank)
+
+@dataclass(frozen=True)
+class KeySpec:
+    """한 속성키의 입력 정보 (union_schema 1행)"""
+    key: str
+    dtype: str                           # "lookup" / "int" / ...
+    lookup: str                          # lookup 테이블명 (dtype이 lookup일 때)
+    ik_slot: str
+    ok_slot: str
+    ik_codec: str
+    ok_codec: str
+    ik_range: Tuple[int, int] | None     # 1-based (a, b), 없으면 None
+    ok_range: Tuple[int, int] | None
+
+    def slot(self, side: str) -> str:
+        return self.ik_slot if side.upper() == "IK" else self.ok_slot
+
+    def codec(self, side: str) -> str:
+        return self.ik_codec if side.upper() == "IK" else self.ok_codec
+
+    def range(self, side: str) -> Tuple[int, int] | None:
+        return self.ik_range if side.upper() == "IK" else self.ok_range
+
+    def width(self, side: str) -> int:
+        """slot 폭 (slot이 없으면 0)"""
+        rng = self.range(side)
+        return 0 if rng is None else rng[1] - rng[0] + 1
+
+@dataclass(frozen=True)
+class PairSchema:
+    """pair 1개의 불변 스키마: 인코딩 플랜 + key 정보 + 측별 키 집합"""
+    plan: PairPlan
+    specs: Mapping[str, KeySpec]         # 읽기 전용 {key: KeySpec}
+    ik_order: Tuple[str, ...]            # 모든 key, IK slot 순 (slot 없는 key는 뒤)
+    ok_order: Tuple[str, ...]
+    required_ik: FrozenSet[str]
+    required_ok: FrozenSet[str]
+    extra_ik: FrozenSet[str]             # IK 기준일 때 OK에서만 필수인 key
+    extra_ok: FrozenSet[str]             # OK 기준일 때 IK에서만 필수인 key
+
+    @property
+    def pair_id(self) -> str:
+        return self.plan.pair_id
+
+    @property
+    def ik_part_type(self) -> str:
+        return self.plan.ik_part_type
+
+    @property
+    def ok_part_type(self) -> str:
+        return self.plan.ok_part_type
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        return self.plan.keys
+
+    def order(self, side: str) -> Tuple[str, ...]:
+        return self.ik_order if side.upper() == "IK" else self.ok_order
+
+    def required(self, side: str) -> FrozenSet[str]:
+        return self.required_ik if side.upper() == "IK" else self.required_ok
+
+    def extra(self, base_side: str) -> FrozenSet[str]:
+        return self.extra_ik if base_side.upper() == "IK" else self.extra_ok
+
+    def required_keys(self, side: str) -> List[str]:
+        """필수 key (union_schema 행 순서)"""
+        return list(self.plan.side(side).required)
+
+    def extra_keys(self, base_side: str) -> List[str]:
+        """base_side 기준 상대측에서만 필수인 key (행 순서)"""
+        other = "OK" if base_side.upper() == "IK" else "IK"
+        extra = self.extra(base_side)
+        return [k for k in self.plan.side(other).required if k in extra]
+
+    def sort_keys(self, side: str, keys) -> List[str]:
+        """keys를 해당 측 slot 순으로 정렬 (스키마에 없는 key는 맨 뒤)"""
+        return _sort_by_slot(self.specs, side, keys)
+
+    def missing(self, side: str, attrs: Dict) -> List[str]:
+        """해당 측 필수 key 중 값이 비어 있는 것 (행 순서)"""
+        miss = []
+        for k in self.plan.side(side).required:
+            v = attrs.get(k, None)
+            if v is None or _s(v).strip() == "":
+                miss.append(k)
+        return miss
+
+    def overflow(self, attrs: Dict) -> List[str]:
+        """
+        slot 폭보다 긴 값의 key (행 순서). 인코더는 뒤에서 slot 폭만큼만 쓰므로
+        (예: nominal=123 → 2자리 slot에 '23') 코드만 봐서는 잘린 줄 알 수 없음.
+        int 변환이 안 되는 값은 여기서 보지 않음 (encode_both가 ValueError)
+        """
+        over = []
+        for k in self.keys:
+            v = attrs.get(k, None)
+            if v is None or _s(v).strip() == "":
+                continue
+            for sp in (self.plan.ik, self.plan.ok):
+                slot = next((sl for sl in sp.slots if sl.key == k), None)
+                if slot is None:
+                    continue
+                try:
+                    n = len(str(int(v))) if slot.kind == "int" else len(_s(v).strip())
+                except (TypeError, ValueError):
+                    break
+                if n > slot.width:
+                    over.append(k)
+                    break
+        return over
+
+    def encode_both(self, attrs: Dict, fill_char: str = "?") -> Tuple[str, str]:
+        plan = self.plan
+        return (_encode_side(plan.ik, attrs, plan.ik.prefix, fill_char),
+                _encode_side(plan.ok, attrs, plan.ok.prefix, fill_char))
+
+def _build_schema(plan: PairPlan, rows: List[tuple]) -> PairSchema:
+    specs: Dict[str, KeySpec] = {}
+    for (_, _, _, key, _, _, ik_slot, ik_codec, ok_slot, ok_codec, dtype, lookup) in rows:
+        if key in specs:
+            continue   # 같은 key가 중복되면 첫 행 (빌더가 충돌을 막으므로 보통 없음)
+        specs[key] = KeySpec(
+            key=key, dtype=_s(dtype).strip(), lookup=_s(lookup).strip(),
+            ik_slot=_s(ik_slot), ok_slot=_s(ok_slot),
+            ik_codec=_s(ik_codec), ok_codec=_s(ok_codec),
+            ik_range=_safe_range(ik_slot), ok_range=_safe_range(ok_slot),
+        )
+    req_ik, req_ok = frozenset(plan.ik.required), frozenset(plan.ok.required)
+    return PairSchema(
+        plan=plan, specs=MappingProxyType(specs),
+        ik_order=tuple(_sort_by_slot(specs, "IK", specs)),
+        ok_order=tuple(_sort_by_slot(specs, "OK", specs)),
+        required_ik=req_ik, required_ok=req_ok,
+        extra_ik=req_ok - req_ik, extra_ok=req_ik - req_ok,
+    )
+
+class _PlanBook:
+    """union_df 1개(=1개 버전)에 대한 pair별 행 묶음 + 컴파일 결과 메모"""
+
+    def __init__(self, union_df: pd.DataFrame):
+        nrows = len(union_df)
+        self.rows: Dict[str, List[tuple]] = {}
+        cols = [union_df[c].tolist() if c in union_df.columns or c not in _OPTIONAL_COLS
+                else [""] * nrows for c in _PLAN_COLS]
+        for row in zip(*cols):
+            self.rows.setdefault(row[0], []).append(row)
+        self.plans: Dict[str, PairPlan] = {}
+        self.schemas: Dict[str, PairSchema] = {}
+        self._prefix: Dict[str, Tuple[Dict[str, str], Tuple[int, ...]]] = {}
+
+    def get(self, pair_id: str) -> PairPlan | None:
+        plan = self.plans.get(pair_id)
+        if plan is None:
+            rows = self.rows.get(pair_id)
+            if not rows:
+                return None
+            plan = self.plans[pair_id] = _compile_pair(pair_id, rows)
+        return plan
+
+    def schema(self, pair_id: str) -> PairSchema | None:
+        ps = self.schemas.get(pair_id)
+        if ps is None:
+            plan = self.get(pair_id)
+            if plan is None:
+                return None
+            ps = self.schemas[pair_id] = _build_schema(plan, self.rows[pair_id])
+        return ps
+
+    def prefix_index(self, side: str) -> Tuple[Dict[str, str], Tuple[int, ...]]:
+        """{해당 측 part_type: 첫 pair_id}, 접두 길이(내림차순)"""
+        side = side.upper()
+        hit = self._prefix.get(side)
+        if hit is None:
+            col = 1 if side == "IK" else 2
+            idx: Dict[str, str] = {}
+            for pid, rows in self.rows.items():
+                pt = _s(rows[0][col]).strip().upper()
+                if pt:
+                    idx.setdefault(pt, pid)
+            hit = self._prefix[side] = (idx, tuple(sorted({len(p) for p in idx}, reverse=True)))
+        return hit
+
+    def match_prefix(self, side: str, code: str) -> PairPlan | None:
+        """code 앞부분과 가장 길게 일치하는 part_type의 pair (동률이면 union_schema 행 순서상 첫 pair)"""
+        idx, lens = self.prefix_index(side)
+        for n in lens:
+            if n <= len(code):
+                pid = idx.get(code[:n])
+                if pid is not None:
+                    return self.get(pid)
+        return None
+
+# union_df 버전(=내용) 표시: 로더가 읽을 때 한 번 계산해 union_df.attrs 에 넣어 둠
+SCHEMA_VERSION_ATTR = "vcode_schema_version"
+_MAX_HASHED_BOOKS = 8
+
+_PLAN_BOOKS: Dict[tuple, _PlanBook] = {}              # (id, 버전) → 버전 표시가 있는 객체
+_HASHED_BOOKS: "OrderedDict[str, _PlanBook]" = OrderedDict()   # 내용 해시 → 버전 표시가 없는 객체
+
+def schema_version(union_df: pd.DataFrame) -> str:
+    """union_df 에서 플랜을 만드는 컬럼 내용의 해시 (같은 내용이면 같은 값)"""
+    cols = [(c, union_df[c].tolist()) for c in _PLAN_COLS if c in union_df.columns]
+    return hashlib.sha1(repr(cols).encode("utf-8")).hexdigest()
+
+def _plan_book(union_df: pd.DataFrame) -> _PlanBook:
+    """
+    union_schema 버전별로 한 번만 pair 행을 묶는다.
+    - union_df.attrs[SCHEMA_VERSION_ATTR] 가 있으면(로더 캐시) (객체, 버전)으로 재사용 → 해시 비용 없음.
+      이 객체를 in-place로 고치면 버전 값을 바꾸거나 clear_plan_cache() 호출
+    - 없으면 호출마다 내용 해시로 찾음 → in-place 수정(행 수가 같아도)도 자동 반영
+    """
+    ver = union_df.attrs.get(SCHEMA_VERSION_ATTR)
+    if ver is None:
+        key = schema_version(union_df)
+        book = _HASHED_BOOKS.get(key)
+        if book is None:
+            book = _HASHED_BOOKS[key] = _PlanBook(union_df)
+            while len(_HASHED_BOOKS) > _MAX_HASHED_BOOKS:
+                _HASHED_BOOKS.popitem(last=False)
+        else:
+            _HASHED_BOOKS.move_to_end(key)
+        return book
+    k = (id(union_df), ver)   # attrs는 부분집합/사본에도 따라가므로 객체 id와 함께 씀
+    book = _PLAN_BOOKS.get(k)
+    if book is None:
+        weakref.finalize(union_df, _PLAN_BOOKS.pop, k, None)
+        book = _PLAN_BOOKS[k] = _PlanBook(union_df)
+    return book
+
+def clear_plan_cache() -> None:
+    """컴파일된 pair 플랜 전체 폐기 (버전 표시가 있는 union_df를 in-place로 고쳤을 때)"""
+    _PLAN_BOOKS.clear()
+    _HASHED_BOOKS.clear()
+
+def get_pair_plan(union_df: pd.DataFrame, pair_id: str) -> PairPlan | None:
+    """pair_id의 컴파일된 플랜 (없으면 None)"""
+    return _plan_book(union_df).get(pair_id)
+
+def compile_pair_plans(union_df: pd.DataFrame) -> Dict[str, PairPlan]:
+    """union_schema 전체 pair를 미리 컴파일해 {pair_id: PairPlan} 으로 반환"""
+    book = _plan_book(union_df)
+    return {pid: book.get(pid) for pid in book.rows}
+
+def get_pair_schema(union_df: pd.DataFrame, pair_id: str) -> PairSchema | None:
+    """pair_id의 PairSchema (없으면 None). 같은 union_df 객체면 매번 같은 객체를 돌려준다"""
+    return _plan_book(union_df).schema(pair_id)
+
+def compile_pair_schemas(union_df: pd.DataFrame) -> Mapping[str, PairSchema]:
+    """union_schema 전체를 {pair_id: PairSchema} (읽기 전용)로 한 번에 만든다"""
+    book = _plan_book(union_df)
+    return MappingProxyType({pid: book.schema(pid) for pid in book.rows})
+
 def _pair_prefixes(union_df: pd.DataFrame, pair_id: str) -> Tuple[str, str]:
-    rows = union_df[union_df["pair_id"] == pair_id]
-    if rows.empty:
+    plan = get_pair_plan(union_df, pair_id)
+    if plan is None:
         raise ValueError(f"pair_id '{pair_id}' 를 union_schema에서 찾지 못했습니다.")
-    ik_pt = rows["ik_part_type"].iloc[0]
-    ok_pt = rows["ok_part_type"].iloc[0]
-    return str(ik_pt), str(ok_pt)
+    return plan.ik_part_type, plan.ok_part_type
+
+def _encode_slot(slot: SlotPlan, value) -> str:
+    """값 1개 → slot 폭에 맞춘 문자열 (_apply_codec + 길이 보정과 동일 규칙)"""
+    if slot.kind == "int":
+        s = str(int(value))  # 숫자 보장
+        enc = s.rjust(slot.codec_width, slot.pad) if slot.pad else s.rjust(slot.codec_width)
+    else:
+        enc = _s(value)
+    width = slot.width
+    if len(enc) < width:
+        enc = enc.rjust(width, "0")
+    elif len(enc) > width:
+        enc = enc[-width:]  # 뒤에서 width만큼 사용
+    return enc
+
+def _encode_side(sp: SidePlan | None, attrs: Dict, base_prefix: str, fill_char: str) -> str:
+    code = list(" " * 11)
+
+    # prefix 삽입 (1부터 시작)
+    for i, ch in enumerate(str(base_prefix)[:11]):
+        code[i] = ch
+
+    for slot in (sp.slots if sp is not None else ()):
+        # 값이 없으면 건너뛴다(남은 칸은 아래에서 fill_char로 표시)
+        if slot.key not in attrs:
+            continue
+        val = attrs[slot.key]
+        if _s(val).strip() == "":
+            continue
+        for off, ch in enumerate(_encode_slot(slot, val)):
+            idx = slot.start + off
+            if 0 <= idx < 11:
+                code[idx] = ch
+
+    # 남은 공백 표시용
+    return "".join(ch if ch != " " else fill_char for ch in code)
 
 # ----------------------------
 # 공개 API
 # ----------------------------
 def required_keys(union_df: pd.DataFrame, pair_id: str, side: str) -> List[str]:
-    side = side.upper()
-    col = "required_ik" if side == "IK" else "required_ok"
-    return union_df[(union_df["pair_id"] == pair_id) & (union_df[col] == True)]["key"].tolist()
+    ps = get_pair_schema(union_df, pair_id)
+    return [] if ps is None else ps.required_keys(side)
 
 def extra_keys_from_other_side(union_df: pd.DataFrame, pair_id: str, base_side: str) -> List[str]:
     """
     base_side=IK이면 OK에서만 필수인 키 목록(= IK 폼에서 '추가 입력'으로 보여줄 키)
     """
-    base_side = base_side.upper()
-    if base_side == "IK":
-        need_other = required_keys(union_df, pair_id, "OK")
-        need_base  = required_keys(union_df, pair_id, "IK")
-    else:
-        need_other = required_keys(union_df, pair_id, "IK")
-        need_base  = required_keys(union_df, pair_id, "OK")
-    return [k for k in need_other if k not in need_base]
+    ps = get_pair_schema(union_df, pair_id)
+    return [] if ps is None else ps.extra_keys(base_side)
 
 def missing_required_keys(union_df: pd.DataFrame, pair_id: str, side: str, attrs: Dict) -> List[str]:
-    needs = required_keys(union_df, pair_id, side)
-    miss = []
-    for k in needs:
-        v = attrs.get(k, None)
-        if v is None or _s(v).strip() == "":
-            miss.append(k)
-    return miss
+    ps = get_pair_schema(union_df, pair_id)
+    return [] if ps is None else ps.missing(side, attrs)
 
 def encode_code(side: str, union_df: pd.DataFrame, pair_id: str,
                 attrs: Dict, base_prefix: str | None = None,
@@ -122,62 +498,303 @@ def encode_code(side: str, union_df: pd.DataFrame, pair_id: str,
     fill_char: 비어있는 칸의 대체 문자 (기본 '?')
     """
     side = side.upper()
+    plan = get_pair_plan(union_df, pair_id)
     if base_prefix is None:
-        ik_pt, ok_pt = _pair_prefixes(union_df, pair_id)
-        base_prefix = ik_pt if side == "IK" else ok_pt
-    code = list(" " * 11)
+        if plan is None:
+            raise ValueError(f"pair_id '{pair_id}' 를 union_schema에서 찾지 못했습니다.")
+        base_prefix = plan.side(side).prefix
+    return _encode_side(plan.side(side) if plan is not None else None, attrs, base_prefix, fill_char)
 
-    # prefix 삽입 (1부터 시작)
-    for i, ch in enumerate(str(base_prefix), start=1):
-        if i <= 11:
-            code[i - 1] = ch
-
-    # pair 행들
-    S = union_df[union_df["pair_id"] == pair_id]
-
-    slot_col  = "ik_slot"  if side == "IK" else "ok_slot"
-    codec_col = "ik_codec" if side == "IK" else "ok_codec"
-
-    for _, r in S.iterrows():
-        key   = r["key"]
-        slot  = r[slot_col]
-        codec = r[codec_col]
-        rng = _slot_to_range(slot)
-        if rng is None:
+def encode_both(union_df: pd.DataFrame, pair_id: str, attrs: Dict, fill_char: str = "?") -> Tuple[str, str]:
+    ps = get_pair_schema(union_df, pair_id)
+    if ps is None:
+        raise ValueError(f"pair_id '{pair_id}' 를 union_schema에서 찾지 못했습니다.")
+    return ps.encode_both(attrs, fill_char)
+
+# ----------------------------
+# 배치 API (BOM 등 수만~수백만 행)
+#   속성 컬럼마다 pd.factorize로 고유값만 뽑아 스칼라 규칙(_encode_slot)으로 한 번씩 인코딩하고,
+#   결과를 UCS4 고정폭 배열(n×11)에 컬럼 단위로 gather 한다 → 스칼라 경로와 결과 동일.
+# ----------------------------
+_CODE_LEN = 11
+
+def _slot_table(slot: SlotPlan, uniques, errors: str):
+    """
+    고유값별 인코딩 결과 → (enc 문자열 목록, 유효 마스크)
+    - 빈 값(None/NaN/공백)은 스칼라와 같이 '건너뜀'(유효 False)
+    - int 변환 실패: errors="raise"면 ValueError, "coerce"면 빈 값 취급
+    """
+    encs, valid = [], []
+    for v in uniques:
+        if _s(v).strip() == "":
+            encs.append(""); valid.append(False)
+            continue
+        try:
+            encs.append(_encode_slot(slot, v)); valid.append(True)
+        except (TypeError, ValueError):
+            if errors == "raise":
+                raise ValueError(f"'{slot.key}' 값 {v!r} 을(를) {slot.kind or '기본'} 코덱으로 인코딩할 수 없습니다.")
+            encs.append(""); valid.append(False)
+    return encs, np.array(valid + [False], dtype=bool)  # 마지막 칸 = 결측(-1) 센티널
+
+def _write_slot(out: np.ndarray, slot: SlotPlan, codes: np.ndarray, uniques, errors: str) -> None:
+    """out(n×11, uint32)에 slot 하나를 덮어쓴다 (빈 값 행은 기존 글자 유지)"""
+    encs, valid = _slot_table(slot, uniques, errors)
+    if not valid.any():
+        return
+    lens = {len(e) for e, ok in zip(encs, valid) if ok}
+    if len(lens) != 1:
+        # slot 폭이 0 이하인 비정상 스키마 → 고유값 단위로 개별 기록
+        for u, (enc, ok) in enumerate(zip(encs, valid)):
+            if not ok:
+                continue
+            rows = np.flatnonzero(codes == u)
+            for off, ch in enumerate(enc):
+                idx = slot.start + off
+                if 0 <= idx < _CODE_LEN:
+                    out[rows, idx] = ord(ch)
+        return
+
+    width = lens.pop()
+    offs = [off for off in range(width) if 0 <= slot.start + off < _CODE_LEN]
+    if not offs:
+        return
+    table = np.zeros((len(encs) + 1, width), dtype=np.uint32)
+    for u, (enc, ok) in enumerate(zip(encs, valid)):
+        if ok:
+            table[u] = [ord(ch) for ch in enc]
+    idx = np.where(codes < 0, len(encs), codes)
+    pos = [slot.start + off for off in offs]
+    sel = table[idx][:, offs]
+    m = valid[idx]
+    if m.all():
+        out[:, pos] = sel
+    else:
+        out[:, pos] = np.where(m[:, None], sel, out[:, pos])
+
+def _encode_side_many(sp: SidePlan, n: int, factorized, fill_char: str, errors: str) -> np.ndarray:
+    out = np.full((n, _CODE_LEN), ord(" "), dtype=np.uint32)
+    prefix = [ord(ch) for ch in str(sp.prefix)[:_CODE_LEN]]
+    if prefix:
+        out[:, :len(prefix)] = prefix
+    for slot in sp.slots:
+        fc = factorized(slot.key)
+        if fc is None:
+            continue   # 컬럼 자체가 없으면 스칼라의 'key not in attrs'와 동일하게 건너뜀
+        _write_slot(out, slot, fc[0], fc[1], errors)
+    out[out == ord(" ")] = ord(fill_char)
+    return out
+
+def _codes_to_strings(out: np.ndarray) -> np.ndarray:
+    """(n×11) uint32 → 고정폭 'U11' 배열"""
+    return np.ascontiguousarray(out).view(f"<U{_CODE_LEN}").ravel()
+
+def encode_many(union_df: pd.DataFrame, pair_id, attrs_frame,
+                fill_char: str = "?", errors: str = "raise") -> pd.DataFrame:
+    """
+    encode_both의 배치판. 결과는 스칼라 경로(encode_both)와 동일.
+    union_df   : union_schema DataFrame
+    pair_id    : 문자열 1개(전 행 동일 pair) 또는 행별 pair_id 배열/Series.
+                 None이면 attrs_frame["pair_id"] 컬럼 사용
+    attrs_frame: 속성 컬럼 DataFrame 또는 {key: 배열} (컬럼명 = union_schema key, 값은 코드 기준)
+    fill_char  : 비어있는 칸의 대체 문자 (기본 '?', 1글자)
+    errors     : "raise"  → 없는 pair_id / int 변환 불가 값에서 ValueError
+                 "coerce" → 없는 pair_id 행은 빈 문자열, 변환 불가 값은 미입력 취급
+    반환: DataFrame[ik_code, ok_code] (index = attrs_frame index)
+    """
+    if len(fill_char) != 1:
+        raise ValueError("fill_char는 1글자여야 합니다.")
+    if errors not in ("raise", "coerce"):
+        raise ValueError("errors는 'raise' 또는 'coerce' 입니다.")
+
+    frame = attrs_frame if isinstance(attrs_frame, pd.DataFrame) else pd.DataFrame(dict(attrs_frame))
+    n = len(frame)
+    if pair_id is None:
+        pair_id = frame["pair_id"]
+
+    # 속성 컬럼은 key 단위로 한 번만 팩토라이즈 (IK/OK 양쪽, 여러 pair가 공유)
+    cache: Dict[str, Tuple[np.ndarray, np.ndarray] | None] = {}
+
+    def factorized_all(key: str):
+        if key not in cache:
+            cache[key] = pd.factorize(frame[key], sort=False) if key in frame.columns else None
+        return cache[key]
+
+    ik_codes = np.full(n, "", dtype=f"<U{_CODE_LEN}")
+    ok_codes = np.full(n, "", dtype=f"<U{_CODE_LEN}")
+
+    if isinstance(pair_id, str):
+        groups = [(pair_id, None)]
+    else:
+        pcodes, puniq = pd.factorize(np.asarray(pair_id, dtype=object), sort=False)
+        if len(pcodes) != n:
+            raise ValueError(f"pair_id 길이({len(pcodes)})가 행 수({n})와 다릅니다.")
+        order = np.argsort(pcodes, kind="stable")
+        bounds = np.searchsorted(pcodes[order], np.arange(len(puniq) + 1))
+        groups = [(puniq[g], order[bounds[g]:bounds[g + 1]]) for g in range(len(puniq))]
+        if (pcodes < 0).any():
+            groups.append((None, np.flatnonzero(pcodes < 0)))
+
+    for pid, rows in groups:
+        plan = get_pair_plan(union_df, pid) if pid is not None else None
+        if plan is None:
+            if errors == "raise":
+                raise ValueError(f"pair_id '{pid}' 를 union_schema에서 찾지 못했습니다.")
             continue
-        a, b = rng
-        width = b - a + 1
-
-        # 값이 없으면 건너뛴다(필요시 '?'로 채우고 싶으면 아래 else 분기에서 처리)
-        if key not in attrs or _s(attrs[key]).strip() == "":
-            # 미입력은 그대로 두되, 시각화가 필요하면 아래 주석 해제
-            # for off in range(width):
-            #     idx = a - 1 + off
-            #     if 0 <= idx < 11:
-            #         code[idx] = fill_char
+        if rows is None:
+            fz, m = factorized_all, n
+        else:
+            def fz(key, _rows=rows):
+                fc = factorized_all(key)
+                return None if fc is None else (fc[0][_rows], fc[1])
+            m = len(rows)
+        ik = _codes_to_strings(_encode_side_many(plan.ik, m, fz, fill_char, errors))
+        ok = _codes_to_strings(_encode_side_many(plan.ok, m, fz, fill_char, errors))
+        if rows is None:
+            ik_codes, ok_codes = ik, ok
+        else:
+            ik_codes[rows] = ik
+            ok_codes[rows] = ok
+
+    return pd.DataFrame({"ik_code": ik_codes, "ok_code": ok_codes}, index=frame.index)
+
+# ----------------------------
+# 디코더 (11자리 → pair_id / attrs / part_type)
+# ----------------------------
+def _decode_slot(slot: SlotPlan, raw: str, fill_char: str = "?") -> str | None:
+    """
+    slot 구간 문자열 → 속성값(코드 문자열). 인코딩 규칙의 역:
+    - 구간이 잘렸거나(11자리 초과/짧은 코드) fill_char가 섞였으면 미입력(None)
+    - int: pad를 걷어내고 정수 문자열로 ('04' → '4'), 숫자가 아니면 None
+           (pad 미지정 int는 앞쪽 공백 정렬분이 fill_char로 보이므로 먼저 걷어냄)
+    - lookup: 인코더가 slot 폭에 맞춰 앞에 붙인 '0'을 걷어냄 ('07' → '7', '00' → '0')
+              (lookup 코드 '7'과 '07'은 같은 코드로 인코딩되므로 짧은 쪽으로 해석)
+    - 기타: 구간 그대로
+    """
+    if len(raw) != slot.width:
+        return None
+    if slot.kind == "int":
+        t = raw.strip()
+        if not slot.pad:
+            t = t.lstrip(fill_char)
+        elif not slot.pad.isdigit():
+            t = t.lstrip(slot.pad)
+        if t == "" and raw.strip(fill_char + " ") == "":
+            return None
+        if fill_char in t:
+            return None
+        try:
+            return str(int(t or "0"))
+        except ValueError:
+            return None
+    if fill_char in raw or raw.strip() == "":
+        return None
+    if slot.kind == "lookup":
+        return raw.lstrip("0") or "0"
+    return raw
+
+def _detect_side(code: str) -> str:
+    return "IK" if code.startswith("V") else "OK"
+
+def decode_attrs_from_code(union_df: pd.DataFrame, side: str | None, code: str,
+                           fill_char: str = "?") -> Tuple[str | None, Dict[str, str], str]:
+    """
+    IK/OK 11자리 코드 → (pair_id, attrs, part_type)
+    - side: "IK"/"OK" (None이면 'V'로 시작하면 IK, 아니면 OK)
+    - pair는 해당 측 part_type 중 코드 앞부분과 가장 길게 일치하는 것 (예: OK 26551 > 2655)
+    - attrs: {key: 코드 문자열} — 비어있거나('?') 해석 불가한 slot은 제외
+    - 찾지 못하면 (None, {}, "")
+    """
+    s = _s(code).strip().upper()
+    side = (side or _detect_side(s)).upper()
+    plan = _plan_book(union_df).match_prefix(side, s)
+    if plan is None:
+        return None, {}, ""
+    sp = plan.side(side)
+    attrs: Dict[str, str] = {}
+    for slot in sp.slots:
+        if slot.start < 0:
             continue
+        v = _decode_slot(slot, s[slot.start:slot.start + slot.width], fill_char)
+        if v is not None:
+            attrs[slot.key] = v
+    return plan.pair_id, attrs, sp.prefix
 
-        val = attrs[key]
-        enc = _apply_codec(val, codec, width_hint=width)
-        # 길이 보정
-        if len(enc) < width:
-            enc = enc.rjust(width, "0")
-        elif len(enc) > width:
-            
-            enc = enc[-width:]  # 뒤에서 width만큼 사용
-
-        for off, ch in enumerate(enc):
-            idx = a - 1 + off
-            if 0 <= idx < 11:
-                
-                code[idx] = ch
+def _codes_matrix(codes: np.ndarray) -> np.ndarray:
+    """정규화된 코드 문자열 배열 → (n×11) uint32 (짧은 코드의 빈 칸은 0)"""
+    arr = np.asarray(codes, dtype=f"<U{_CODE_LEN}")
+    return arr.view(np.uint32).reshape(len(arr), _CODE_LEN)
 
-    # 남은 공백 표시용(옵션)
-    code = [ch if ch != " " else fill_char for ch in code]
-    return "".join(code)
+def _matrix_strings(mat: np.ndarray) -> np.ndarray:
+    """(n×w) uint32 → 'U{w}' 배열 (끝의 0은 잘림)"""
+    w = mat.shape[1]
+    return np.ascontiguousarray(mat).view(f"<U{w}").ravel()
 
-def encode_both(union_df: pd.DataFrame, pair_id: str, attrs: Dict, fill_char: str = "?") -> Tuple[str, str]:
-    ik_pt, ok_pt = _pair_prefixes(union_df, pair_id)
-    ik = encode_code("IK", union_df, pair_id, attrs, base_prefix=ik_pt, fill_char=fill_char)
-    ok = encode_code("OK", union_df, pair_id, attrs, base_prefix=ok_pt, fill_char=fill_char)
-    return ik, ok
+def decode_many(union_df: pd.DataFrame, codes, side: str | None = None,
+                fill_char: str = "?") -> pd.DataFrame:
+    """
+    decode_attrs_from_code의 배치판. 코드 컬럼을 한 번에 속성 컬럼으로 분해한다.
+    codes: Series/배열 (IK/OK 혼합 가능, side=None이면 행별 자동 판별)
+    반환: DataFrame[code, side, pair_id, part_type, <key...>] (index = codes index)
+          pair를 못 찾은 행은 pair_id/part_type/속성 모두 None
+    """
+    ser = codes if isinstance(codes, pd.Series) else pd.Series(list(codes))
+    norm = ser.fillna("").astype(str).str.strip().str.upper().to_numpy(dtype=object)
+    n = len(norm)
+    mat = _codes_matrix(norm)
+    book = _plan_book(union_df)
+
+    if side is None:
+        sides = np.where(mat[:, 0] == ord("V"), "IK", "OK") if n else np.array([], dtype="<U2")
+    else:
+        sides = np.full(n, side.upper(), dtype="<U2")
+
+    # 1) 행별 pair 결정: 측별 접두 길이(긴 것부터)로 벡터 조회
+    pair_ids = np.full(n, None, dtype=object)
+    for sd in ("IK", "OK"):
+        idx, lens = book.prefix_index(sd)
+        pending = sides == sd
+        for L in lens:
+            rows = np.flatnonzero(pending & (pair_ids == None))  # noqa: E711
+            if not len(rows):
+                break
+            keys = [p for p in idx if len(p) == L]
+            pref = _matrix_strings(mat[rows, :L])
+            pos = pd.Index(keys).get_indexer(pref)
+            hit = pos >= 0
+            pair_ids[rows[hit]] = [idx[keys[i]] for i in pos[hit]]
+
+    # 2) pair 그룹별로 slot 구간을 잘라 고유값 단위로 해석
+    out: Dict[str, np.ndarray] = {}
+    part_types = np.full(n, None, dtype=object)
+    known = pair_ids != None  # noqa: E711
+    if known.any():
+        pcodes, puniq = pd.factorize(pair_ids[known])
+        known_rows = np.flatnonzero(known)
+        for g, pid in enumerate(puniq):
+            g_rows = known_rows[pcodes == g]
+            plan = book.get(pid)
+            for sd in ("IK", "OK"):
+                rows = g_rows[sides[g_rows] == sd]
+                if not len(rows):
+                    continue
+                sp = plan.side(sd)
+                part_types[rows] = sp.prefix
+                for slot in sp.slots:
+                    col = out.get(slot.key)
+                    if col is None:
+                        col = out[slot.key] = np.full(n, None, dtype=object)
+                    if slot.start < 0 or slot.width <= 0 or slot.start + slot.width > _CODE_LEN:
+                        continue
+                    raw = _matrix_strings(mat[rows, slot.start:slot.start + slot.width])
+                    rc, ru = pd.factorize(raw)
+                    dec = np.array([_decode_slot(slot, r, fill_char) for r in ru] + [None], dtype=object)
+                    col[rows] = dec[rc]
+
+    # pair_id/part_type/속성은 object 컬럼으로 고정 (pandas 문자열 추론이 None을 NaN으로 바꾸지 않게)
+    res = pd.DataFrame({"code": norm, "side": sides}, index=ser.index)
+    res["pair_id"] = pd.Series(pair_ids, index=ser.index, dtype=object)
+    res["part_type"] = pd.Series(part_types, index=ser.index, dtype=object)
+    for k, col in out.items():
+        res[k] = pd.Series(col, index=ser.index, dtype=object)
+    return res
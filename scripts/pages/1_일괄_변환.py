@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+BOM 일괄 변환 페이지 (Streamlit 멀티페이지 — scripts/pages/)
+- IK 또는 OK 코드 컬럼이 있는 CSV/TSV 업로드 → 파일 전체를 한 번에 해석/변환/매칭
+  (utils.translate.translate_codes: decode_many → matched_parts 우선 → encode_many, 행별 재실행 없음)
+- 결과는 세션에 보관 → 페이지 넘김/필터는 다시 계산하지 않음
+  (업로드 파일 · 코드 컬럼 · 기준 측 · 참조 데이터 버전이 바뀔 때만 재계산)
+- 미리보기는 현재 페이지 행만 그리고 NO_MATCH / UNKNOWN 행을 강조
+- 다운로드 CSV는 버튼을 누를 때 청크 단위로 직렬화 (재실행마다 만들지 않음)
+  · st.download_button에는 응답 스트리밍 API가 없어 완성된 버퍼 1개를 넘김
+    (DataFrame 전체를 문자열로 만든 뒤 다시 인코딩하는 2중 사본은 피함)
+"""
+
+import io
+import re
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.loaders import load_union_schema, load_matched_index, reference_store
+from utils.translate import translate_codes, attach_result, match_status, read_table_bytes
+
+st.set_page_config(page_title="일괄 변환 · V/KM-Code", page_icon="📤", layout="wide")
+st.title("BOM 일괄 변환 (IK ⇄ OK)")
+
+PAGE_SIZES = [50, 100, 200, 500]
+STATUSES = ["NO_MATCH", "UNKNOWN", "MATCHED", "ASSEMBLED"]
+_HIGHLIGHT = {"NO_MATCH": "background-color: #fde2e1", "UNKNOWN": "background-color: #fff4cc"}
+_CODE_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9\s\-]{6,14}$")
+_CODE_NAMES = ("code", "품번", "ik_code", "ok_code", "part_no", "part_code")
+
+# ---------------------------------------------------------------------
+# 0) 유틸
+# ---------------------------------------------------------------------
+def _guess_code_column(frame: pd.DataFrame) -> str:
+    """코드 컬럼 추정: 흔한 컬럼명 → 앞 200행 중 코드 모양 값 비율이 가장 높은 컬럼"""
+    cols = list(frame.columns)
+    for c in cols:
+        if str(c).strip().lower() in _CODE_NAMES:
+            return c
+    sample = frame.head(200)
+    scores = [sample[c].astype(str).str.strip().str.match(_CODE_RE).mean() if len(sample) else 0.0
+              for c in cols]
+    return cols[int(np.argmax(scores))]
+
+CSV_CHUNK_ROWS = 20_000
+
+def _csv_bytes(frame: pd.DataFrame):
+    """download_button용 지연 생성 함수 (누를 때만, CSV_CHUNK_ROWS 행씩 직렬화 → 엑셀 호환 UTF-8 BOM)"""
+    def build() -> io.BytesIO:
+        buf = io.BytesIO()
+        buf.write("\ufeff".encode("utf-8"))
+        for start in range(0, max(len(frame), 1), CSV_CHUNK_ROWS):
+            part = frame.iloc[start:start + CSV_CHUNK_ROWS]
+            buf.write(part.to_csv(index=False, header=start == 0).encode("utf-8"))
+        buf.seek(0)
+        return buf
+    return build
+
+def _first_page():
+    st.session_state.bulk_page = 1
+
+def _highlight(view: pd.DataFrame, status_col: str):
+    return view.style.apply(lambda r: [_HIGHLIGHT.get(r[status_col], "")] * len(r), axis=1)
+
+# ---------------------------------------------------------------------
+# 1) 업로드 + 옵션
+# ---------------------------------------------------------------------
+up = st.file_uploader("CSV / TSV 업로드 (IK 또는 OK 11자리 코드 컬럼 포함)", type=["csv", "tsv", "txt"])
+if up is None:
+    st.info("코드 컬럼이 있는 파일을 올리면 전체 행을 한 번에 변환합니다. (열 이름 예: code / 품번)")
+    st.stop()
+
+file_key = (getattr(up, "file_id", None) or up.name, up.size)
+src_state = st.session_state.get("bulk_src")
+if src_state is None or src_state[0] != file_key:
+    try:
+        src = read_table_bytes(up.getvalue(), up.name)
+    except Exception as e:
+        st.error(f"파일을 읽지 못했습니다: {e}")
+        st.stop()
+    st.session_state.bulk_src = (file_key, src)
+    st.session_state.pop("bulk_res", None)
+    st.session_state.bulk_page = 1
+src = st.session_state.bulk_src[1]
+
+if src.empty or not len(src.columns):
+    st.warning("빈 파일입니다.")
+    st.stop()
+
+c1, c2 = st.columns([2, 3])
+with c1:
+    cols = list(src.columns)
+    code_col = st.selectbox("코드 컬럼", cols, index=cols.index(_guess_code_column(src)), key="bulk_col")
+with c2:
+    side_opt = st.radio("입력 코드 측", ["자동 (V로 시작하면 IK)", "IK", "OK"], horizontal=True, key="bulk_side")
+side = None if side_opt.startswith("자동") else side_opt
+
+# ---------------------------------------------------------------------
+# 2) 변환 (파일 전체 벡터 처리, 입력/참조 데이터가 바뀔 때만)
+# ---------------------------------------------------------------------
+try:
+    load_union_schema()                                  # 참조 데이터 유무 확인 (없으면 안내)
+    load_matched_index()
+    ref_key = reference_store().version                  # 참조 저장소 세대: CSV가 바뀌어 교체될 때만 증가
+except FileNotFoundError as e:
+    st.error(f"참조 데이터가 없습니다: {e}")
+    st.stop()
+
+res_key = (file_key, code_col, side, ref_key)
+res_state = st.session_state.get("bulk_res")
+if res_state is None or res_state[0] != res_key:
+    with st.spinner(f"{len(src):,}행 변환 중…"):
+        t0 = time.perf_counter()
+        res = translate_codes(src[code_col], side=side)
+        res.insert(0, "status", match_status(res))
+        out = attach_result(src, res)
+        elapsed = time.perf_counter() - t0
+    status_col = out.columns[len(src.columns)]          # 입력에 status가 있으면 'status_out'
+    res_state = st.session_state.bulk_res = (res_key, out, status_col, elapsed)
+    st.session_state.bulk_page = 1
+_, out, status_col, elapsed = res_state
+status = out[status_col]
+
+# ---------------------------------------------------------------------
+# 3) 요약
+# ---------------------------------------------------------------------
+counts = status.value_counts()
+m = st.columns(5)
+m[0].metric("전체", f"{len(out):,}")
+m[1].metric("MATCHED", f"{int(counts.get('MATCHED', 0)):,}", help="matched_parts 대응 행")
+m[2].metric("ASSEMBLED", f"{int(counts.get('ASSEMBLED', 0)):,}", help="속성 해석 → 상대측 11자리 조립")
+m[3].metric("UNKNOWN", f"{int(counts.get('UNKNOWN', 0)):,}", help="조립했지만 해석 못 한 자리('?')가 남음")
+m[4].metric("NO_MATCH", f"{int(counts.get('NO_MATCH', 0)):,}", help="상대측 코드 없음 (error 컬럼에 사유)")
+st.caption(f"변환 {elapsed:.2f}s · 코드 컬럼 `{code_col}`")
+
+# ---------------------------------------------------------------------
+# 4) 미리보기 (필터 + 페이지)
+# ---------------------------------------------------------------------
+f1, f2, f3 = st.columns([3, 1, 1])
+with f1:
+    shown = st.multiselect("상태 필터", STATUSES, default=STATUSES, key="bulk_filter", on_change=_first_page)
+with f2:
+    page_size = st.selectbox("페이지당 행", PAGE_SIZES, index=1, key="bulk_page_size", on_change=_first_page)
+rows = np.flatnonzero(status.isin(shown).to_numpy())
+n_pages = max(1, -(-len(rows) // page_size))
+st.session_state.bulk_page = min(max(1, int(st.session_state.get("bulk_page", 1))), n_pages)
+with f3:
+    page = st.number_input(f"페이지 (/{n_pages:,})", min_value=1, max_value=n_pages, step=1, key="bulk_page")
+
+start = (int(page) - 1) * page_size
+view = out.iloc[rows[start:start + page_size]]
+view.index = view.index + 1                            # 입력 데이터 행 번호 (1부터)
+st.dataframe(_highlight(view, status_col), use_container_width=True)
+st.caption(f"{len(rows):,}행 중 {start + 1 if len(rows) else 0:,}–{min(start + page_size, len(rows)):,}")
+
+# ---------------------------------------------------------------------
+# 5) 다운로드 (누를 때 생성)
+# ---------------------------------------------------------------------
+stem = re.sub(r"\.[^.]+$", "", up.name) or "upload"
+problem = status.isin(["NO_MATCH", "UNKNOWN"]).to_numpy()
+d1, d2 = st.columns(2)
+with d1:
+    st.download_button("⬇ 전체 결과 CSV", data=_csv_bytes(out), file_name=f"{stem}_translated.csv",
+                       mime="text/csv", on_click="ignore")
+with d2:
+    st.download_button(f"⬇ NO_MATCH / UNKNOWN 행만 ({int(problem.sum()):,})", data=_csv_bytes(out[problem]),
+                       file_name=f"{stem}_issues.csv", mime="text/csv", on_click="ignore",
+                       disabled=not problem.any())
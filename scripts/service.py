@@ -0,0 +1,454 @@
+#!/usr/bin/env python
+# coding: utf-8
+"""
+V/KM-Code 변환 HTTP 서비스 (헤드리스 · asyncio 표준 라이브러리만 사용)
+- Streamlit UI와 같은 참조 데이터(utils.loaders 참조 저장소)와 vcode_codec을 그대로 사용
+- 프로세스당 한 번 적재, 원본 CSV가 바뀌면 파일 감시가 파생 캐시만 교체 (UI와 동일)
+- MES/ERP 배치 호출용: 요청 본문에 코드 수천 개를 한 번에 보낼 수 있음
+
+엔드포인트 (JSON, UTF-8):
+  GET  /health
+  POST /encode     {"pair_id", "attrs", "fill_char"?}      | {"items": [{"pair_id", "attrs"}, ...]}
+  POST /decode     {"code", "side"?}                       | {"codes": [...], "side"?}
+                   (코드는 공백/하이픈 제거 + 대문자로 정규화 후 해석)
+  POST /translate  {"code", "side"?}  (IK ↔ OK)            | {"codes": [...], "side"?}
+  GET  /lookup     ?table=&part_type=[&code=]  (lookup 옵션/라벨)
+                   ?q=[&table=&part_type=&limit=]  (라벨 검색)
+  POST /lookup     {"items": [{"table", "part_type", "code"}, ...]}
+  GET  /suggest    ?q=[&limit=&site=]  (입력 중 part_type 자동완성: 코드/짝/품명/대분류)
+  GET  /search     ?q=[&limit=&site=&category=&kind=remark,category,label]  (오타 허용 유사 검색)
+
+실행 (scripts/ 에서):
+    python service.py --port 8000              # 단일 프로세스
+    python service.py --port 8000 --workers 4  # SO_REUSEPORT로 프로세스 4개가 같은 포트 공유
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+from utils.loaders import (
+    load_union_schema,      # union_schema DataFrame (코덱 pair 플랜 캐시 공유)
+    load_pair_schemas,      # {pair_id: PairSchema}
+    load_lookups,           # lookup 7종 옵션표
+    lookup_options,         # part_type별 {code: label} (정확 > 그룹 > 공통)
+    load_label_index,       # 라벨 → 코드 역색인
+    load_matched_index,     # matched_parts 정규화 코드 색인 (없으면 None)
+    load_catalog_index,     # part_type 자동완성 색인
+    load_fuzzy_index,       # remark/category/라벨 유사 검색 색인
+)
+from utils.matched_index import normalize_code   # 공백/하이픈 제거 + 대문자 (조회와 같은 규칙)
+from utils.prefix_index import site_of            # V로 시작하면 IK (색인/검색과 같은 규칙)
+from utils.translate import translate_codes       # IK ↔ OK 벡터 변환 (대량 변환 CLI와 공용)
+from notebooks.vcode_codec import decode_attrs_from_code, decode_many, encode_many
+
+MAX_HEADER = 64 * 1024            # 요청 라인 + 헤더 상한
+MAX_BODY = 32 * 1024 * 1024       # 본문 상한 (코드 수십만 개 수준)
+INLINE_BODY = 32 * 1024           # 이보다 큰 본문(배치)은 스레드에서 처리 → 이벤트 루프가 막히지 않게
+KEEPALIVE_TIMEOUT = 30.0
+BATCH_MIN = 64                    # 이 개수 이상이면 pandas 벡터 경로 (미만은 단건 경로가 더 빠름)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            411: "Length Required", 413: "Payload Too Large", 431: "Request Header Fields Too Large",
+            500: "Internal Server Error"}
+
+_META_COLS = ("code", "side", "pair_id", "part_type")
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------------------------------------------------------------
+# 1) 본문 검사 도구
+# ---------------------------------------------------------------------
+def _obj(body) -> dict:
+    if not isinstance(body, dict):
+        raise HTTPError(400, "JSON 객체 본문이 필요합니다.")
+    return body
+
+def _str(d: dict, key: str, required: bool = True) -> str | None:
+    v = d.get(key)
+    if v is None or str(v).strip() == "":
+        if required:
+            raise HTTPError(400, f"'{key}' 가 필요합니다.")
+        return None
+    return str(v).strip()
+
+def _list(d: dict, key: str) -> list:
+    v = d.get(key)
+    if not isinstance(v, list):
+        raise HTTPError(400, f"'{key}' 는 배열이어야 합니다.")
+    return v
+
+def _side(v) -> str | None:
+    if v is None or str(v).strip() == "":
+        return None
+    s = str(v).strip().upper()
+    if s not in ("IK", "OK"):
+        raise HTTPError(400, "side는 'IK' 또는 'OK' 입니다.")
+    return s
+
+def _other(side: str) -> str:
+    return "OK" if side == "IK" else "IK"
+
+
+# ---------------------------------------------------------------------
+# 2) 핸들러 (query: dict, body: JSON | None) → JSON
+# ---------------------------------------------------------------------
+def h_health(query, body):
+    return {"ok": True, "pairs": len(load_pair_schemas()), "pid": os.getpid()}
+
+def _encode_error(ps, attrs) -> str | None:
+    """인코딩 전에 걸러낼 항목 오류 (없는 pair_id / attrs 형식 / slot 폭 초과 값), 없으면 None"""
+    if ps is None:
+        return "unknown pair_id"
+    if not isinstance(attrs, dict):
+        return "'attrs' 는 객체여야 합니다."
+    over = ps.overflow(attrs)
+    if over:
+        return f"slot 폭을 넘는 값: {', '.join(over)}"
+    return None
+
+def h_encode(query, body):
+    body = _obj(body)
+    fill = str(body.get("fill_char") or "?")
+    if "items" in body:
+        items = _list(body, "items")
+        if not all(isinstance(it, dict) for it in items):
+            raise HTTPError(400, "items의 각 항목은 객체여야 합니다.")
+        pair_ids = [str(it.get("pair_id") or "").strip() for it in items]
+        attrs_list = [it.get("attrs") or {} for it in items]
+        schemas = load_pair_schemas()
+        errors = {i: _encode_error(schemas.get(pid), attrs)
+                  for i, (pid, attrs) in enumerate(zip(pair_ids, attrs_list))}
+        known = [i for i, err in errors.items() if err is None]
+        codes: Dict[int, tuple] = {}
+        if known:
+            frame = pd.DataFrame([attrs_list[i] for i in known], index=known)
+            try:
+                out = encode_many(load_union_schema(), [pair_ids[i] for i in known], frame,
+                                  fill_char=fill, errors="raise")
+                codes = dict(zip(known, zip(out["ik_code"].tolist(), out["ok_code"].tolist())))
+            except (ValueError, TypeError):
+                pass   # 변환 불가 값이 섞임 → 아래에서 항목별로 인코딩해 해당 항목에만 error
+        res = []
+        for i, pid in enumerate(pair_ids):
+            if errors[i] is not None:
+                res.append({"pair_id": pid, "error": errors[i]})
+                continue
+            try:
+                ik, ok = codes[i] if i in codes else schemas[pid].encode_both(attrs_list[i], fill)
+            except (ValueError, TypeError) as e:
+                res.append({"pair_id": pid, "error": str(e)})
+                continue
+            res.append({"pair_id": pid, "ik_code": ik, "ok_code": ok})
+        return {"items": res}
+
+    pid = _str(body, "pair_id")
+    attrs = body.get("attrs") or {}
+    if not isinstance(attrs, dict):
+        raise HTTPError(400, "'attrs' 는 객체여야 합니다.")
+    ps = load_pair_schemas().get(pid)
+    if ps is None:
+        raise HTTPError(404, f"pair_id '{pid}' 를 union_schema에서 찾지 못했습니다.")
+    err = _encode_error(ps, attrs)
+    if err is not None:
+        raise HTTPError(400, err)
+    ik, ok = ps.encode_both(attrs, fill)
+    return {"pair_id": pid, "ik_code": ik, "ok_code": ok,
+            "missing_ik": ps.missing("IK", attrs), "missing_ok": ps.missing("OK", attrs)}
+
+def _decoded_records(df: pd.DataFrame) -> List[dict]:
+    """decode_many 결과 → [{code, side, pair_id, part_type, attrs}] (빈 속성 제외)"""
+    cols = {c: df[c].to_numpy(dtype=object, na_value=None).tolist() for c in df.columns}
+    keys = [c for c in df.columns if c not in _META_COLS]
+    out = []
+    for i in range(len(df)):
+        out.append({
+            "code": cols["code"][i], "side": cols["side"][i],
+            "pair_id": cols["pair_id"][i], "part_type": cols["part_type"][i],
+            "attrs": {k: cols[k][i] for k in keys if cols[k][i] is not None},
+        })
+    return out
+
+def h_decode(query, body):
+    body = _obj(body)
+    side = _side(body.get("side"))
+    if "codes" in body:
+        codes = [normalize_code(c) for c in _list(body, "codes")]
+        if len(codes) < BATCH_MIN:
+            return {"items": [_decode_one(c, side) for c in codes]}
+        return {"items": _decoded_records(decode_many(load_union_schema(), codes, side=side))}
+    return _decode_one(normalize_code(_str(body, "code")), side)
+
+def _decode_one(code: str, side: str | None) -> dict:
+    side = side or site_of(code)
+    pair_id, attrs, pt = decode_attrs_from_code(load_union_schema(), side, code)
+    return {"code": code, "side": side, "pair_id": pair_id, "part_type": pt or None, "attrs": attrs}
+
+def _translated(code: str, side: str, pid, tcode, source, fill: str) -> dict:
+    return {"code": code, "side": side, "pair_id": pid, "target_side": _other(side),
+            "target_code": tcode, "source": source,
+            "complete": bool(tcode) and fill not in tcode}
+
+def _translate_one(code: str, side: str | None, fill: str, union, schemas, mi) -> dict:
+    """단건 경로: 해석 → PairSchema로 상대측 조립 (DataFrame 없이 dict/문자열 연산만)"""
+    code = normalize_code(code)
+    sd = side or site_of(code)
+    hit = mi.counterpart(sd, code) if (mi is not None and code) else None
+    pid, attrs, _ = decode_attrs_from_code(union, sd, code, fill_char=fill)
+    if hit is not None:
+        return _translated(code, sd, pid, str(hit), "matched", fill)
+    ps = schemas.get(pid) if pid else None
+    if ps is None:
+        return _translated(code, sd, pid, None, None, fill)
+    ik, ok = ps.encode_both(attrs, fill)
+    return _translated(code, sd, pid, ok if sd == "IK" else ik, "codec", fill)
+
+def _translate(codes: List[str], side: str | None, fill: str = "?") -> List[dict]:
+    """
+    IK ↔ OK 변환
+    1) matched_parts에 실제 대응 행이 있으면 그 코드 (source="matched")
+    2) 없으면 해석한 속성으로 상대측 11자리 조립 (source="codec", 모르는 칸은 fill_char)
+    - 코드가 BATCH_MIN개 미만이면 단건 경로, 이상이면 utils.translate 벡터 경로 (대량 변환 CLI와 공용)
+    """
+    if len(codes) < BATCH_MIN:
+        union, schemas, mi = load_union_schema(), load_pair_schemas(), load_matched_index()
+        return [_translate_one(c, side, fill, union, schemas, mi) for c in codes]
+
+    df = translate_codes(codes, side, fill)
+    cols = {c: df[c].to_numpy(dtype=object, na_value=None).tolist()
+            for c in ("code_norm", "side", "pair_id", "target_code", "source")}
+    return [_translated(code, sd, pid, tcode, source, fill)
+            for code, sd, pid, tcode, source in zip(cols["code_norm"], cols["side"], cols["pair_id"],
+                                                    cols["target_code"], cols["source"])]
+
+def h_translate(query, body):
+    body = _obj(body)
+    side = _side(body.get("side"))
+    fill = str(body.get("fill_char") or "?")
+    if "codes" in body:
+        return {"items": _translate(_list(body, "codes"), side, fill)}
+    return _translate([_str(body, "code")], side, fill)[0]
+
+def _label(table: str, part_type: str, code) -> str | None:
+    opts = lookup_options(load_lookups(), table, part_type)
+    return opts.get(str(code).strip()) if code is not None else None
+
+def h_lookup(query, body):
+    if body is not None:   # POST 배치: 코드 → 라벨
+        items = _list(_obj(body), "items")
+        out = []
+        for it in items:
+            it = _obj(it)
+            table, pt, code = _str(it, "table"), _str(it, "part_type"), _str(it, "code")
+            out.append({"table": table, "part_type": pt, "code": code, "label": _label(table, pt, code)})
+        return {"items": out}
+
+    if query.get("q"):
+        limit = int(query.get("limit") or 20)
+        hits = load_label_index().search(query["q"], table=query.get("table") or None,
+                                         part_type=query.get("part_type") or None, limit=limit)
+        return {"hits": [h._asdict() for h in hits]}
+
+    table, pt = _str(query, "table"), _str(query, "part_type")
+    if query.get("code"):
+        code = query["code"].strip()
+        return {"table": table, "part_type": pt, "code": code, "label": _label(table, pt, code)}
+    return {"table": table, "part_type": pt, "options": lookup_options(load_lookups(), table, pt)}
+
+def h_suggest(query, body):
+    limit = min(int(query.get("limit") or 10), 100)
+    hits = load_catalog_index().suggest(query.get("q") or "", limit=limit, site=query.get("site") or None)
+    return {"hits": [h._asdict() for h in hits]}
+
+def h_search(query, body):
+    limit = min(int(query.get("limit") or 10), 100)
+    kinds = [k.strip() for k in query["kind"].split(",")] if query.get("kind") else None
+    hits = load_fuzzy_index().search(query.get("q") or "", limit=limit, site=query.get("site") or None,
+                                     category=query.get("category") or None, kinds=kinds)
+    return {"hits": [h._asdict() for h in hits]}
+
+ROUTES: Dict[str, Tuple[Tuple[str, ...], Callable]] = {
+    "/health":    (("GET",), h_health),
+    "/encode":    (("POST",), h_encode),
+    "/decode":    (("POST",), h_decode),
+    "/translate": (("POST",), h_translate),
+    "/lookup":    (("GET", "POST"), h_lookup),
+    "/suggest":   (("GET",), h_suggest),
+    "/search":    (("GET",), h_search),
+}
+
+
+# ---------------------------------------------------------------------
+# 3) HTTP/1.1 (keep-alive, Content-Length / chunked 본문)
+# ---------------------------------------------------------------------
+def _response(status: int, obj, keep_alive: bool) -> bytes:
+    body = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+def _parse_head(raw: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+    lines = raw.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "잘못된 요청 라인")
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        k, _, v = line.partition(":")
+        headers[k.strip().lower()] = v.strip()
+    return method.upper(), target, version.upper(), headers
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bytes:
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks, total = [], 0
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                await reader.readuntil(b"\r\n")      # 빈 trailer
+                return b"".join(chunks)
+            total += size
+            if total > MAX_BODY:
+                raise HTTPError(413, "본문이 너무 큽니다.")
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    n = int(headers.get("content-length") or 0)
+    if n > MAX_BODY:
+        raise HTTPError(413, "본문이 너무 큽니다.")
+    return await reader.readexactly(n) if n else b""
+
+def _dispatch(method: str, target: str, raw_body: bytes) -> Tuple[int, object]:
+    url = urlsplit(target)
+    route = ROUTES.get(url.path.rstrip("/") or "/")
+    if route is None:
+        return 404, {"error": f"없는 경로: {url.path}"}
+    methods, fn = route
+    if method not in methods:
+        return 405, {"error": f"{url.path} 는 {'/'.join(methods)} 만 지원합니다."}
+    query = dict(parse_qsl(url.query, keep_blank_values=True))
+    try:
+        body = json.loads(raw_body) if raw_body else None
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        return 400, {"error": f"JSON 파싱 실패: {e}"}
+    try:
+        return 200, fn(query, body)
+    except HTTPError as e:
+        return e.status, {"error": str(e)}
+    except FileNotFoundError as e:
+        return 500, {"error": f"참조 데이터 없음: {e}"}
+    except (ValueError, TypeError, KeyError) as e:
+        return 400, {"error": str(e)}
+    except Exception as e:  # 서비스는 계속 떠 있어야 함
+        return 500, {"error": f"{type(e).__name__}: {e}"}
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                raw = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                break
+            except asyncio.LimitOverrunError:
+                writer.write(_response(431, {"error": "헤더가 너무 큽니다."}, False))
+                break
+            try:
+                method, target, version, headers = _parse_head(raw)
+                body = await _read_body(reader, headers)
+            except HTTPError as e:
+                writer.write(_response(e.status, {"error": str(e)}, False))
+                break
+            except (ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                writer.write(_response(400, {"error": "본문을 읽지 못했습니다."}, False))
+                break
+
+            conn = headers.get("connection", "").lower()
+            keep = (conn != "close") if version == "HTTP/1.1" else (conn == "keep-alive")
+            if len(body) > INLINE_BODY:
+                status, obj = await loop.run_in_executor(None, _dispatch, method, target, body)
+            else:
+                status, obj = _dispatch(method, target, body)
+            writer.write(_response(status, obj, keep))
+            await writer.drain()
+            if not keep:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+
+# ---------------------------------------------------------------------
+# 4) 실행
+# ---------------------------------------------------------------------
+def warm_up() -> None:
+    """참조 데이터/색인을 미리 적재 (첫 요청 지연 제거)"""
+    load_pair_schemas()
+    load_lookups()
+    load_label_index()
+    load_matched_index()
+    load_catalog_index()
+    load_fuzzy_index()
+
+async def serve(host: str, port: int, reuse_port: bool = False) -> None:
+    server = await asyncio.start_server(_handle, host, port, limit=MAX_HEADER,
+                                        reuse_port=reuse_port or None, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+def _run(host: str, port: int, reuse_port: bool) -> None:
+    t0 = time.perf_counter()
+    warm_up()
+    print(f"✅ pid {os.getpid()} ready ({time.perf_counter() - t0:.1f}s) → http://{host}:{port}", flush=True)
+    try:
+        asyncio.run(serve(host, port, reuse_port))
+    except KeyboardInterrupt:
+        pass
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="V/KM-Code 변환 HTTP 서비스")
+    ap.add_argument("--host", default=os.environ.get("VCODE_API_HOST", "0.0.0.0"))
+    ap.add_argument("--port", type=int, default=int(os.environ.get("VCODE_API_PORT", "8000")))
+    ap.add_argument("--workers", type=int, default=int(os.environ.get("VCODE_API_WORKERS", "1")),
+                    help="프로세스 수 (2 이상이면 SO_REUSEPORT로 같은 포트 공유, Linux)")
+    args = ap.parse_args(argv)
+
+    if args.workers <= 1:
+        _run(args.host, args.port, False)
+        return
+
+    import multiprocessing as mp
+    procs = [mp.Process(target=_run, args=(args.host, args.port, True), daemon=True)
+             for _ in range(args.workers)]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# tests/conftest.py
+# -*- coding: utf-8 -*-
+"""
+공용 픽스처: 작은 참조 데이터 세트(part_master / Cross_Map / 스키마 / union_schema / lookup)
+
+- 저장소에는 data/가 없으므로 세션 임시 폴더에 써 두고 VCODE_DATA_DIR로 지정
+  (utils.loaders 를 import 하기 전에 설정해야 하므로 모듈 수준에서 처리,
+   번역 CLI의 spawn 워커도 같은 환경변수를 물려받음)
+- 실행: scripts/ 에서  python -m pytest -q tests
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+SCRIPTS = Path(__file__).resolve().parents[1]
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+FIXTURE = {
+    "part_master.csv": (
+        "site,part_type,remark,category\n"
+        "IKSAN,V111,육각 볼트 BOLT,볼트\n"
+        "IKSAN,V112,평 와셔,와셔\n"
+        "OKCHEON,2655,HEX BOLT,볼트\n"
+        "OKCHEON,26551,WASHER,와셔\n"
+    ),
+    "Cross_Map.csv": (
+        "ik_part_type,ik_grade_code,ik_seal_code,ok_km_code,ok_part_type,note,category,remark\n"
+        "V111,,,2655,2655,basic,볼트,육각볼트\n"
+        "V112,,1,26551,26551,sealed,와셔,평와셔\n"
+    ),
+    "codeSchema_IK.csv": (
+        "part_type,pos_from,pos_to,attr_name,lookup_table\n"
+        "V111,5,5,material_code,material_lookup\n"
+        "V111,6,6,surface_code,surface_lookup\n"
+        "V111,7,8,nominal,\n"
+        "V111,9,11,length_mm,\n"
+        "V112,5,5,material_code,material_lookup\n"
+        "V112,6,6,seal_code,seal_lookup\n"
+        "V112,7,9,nominal,\n"
+    ),
+    "codeSchema_OK.csv": (
+        "part_type,pos_from,pos_to,attr_name,lookup_table\n"
+        "2655,5,5,material_code,material_lookup\n"
+        "2655,6,6,thread_grade,grade_lookup\n"
+        "2655,7,8,nominal,\n"
+        "2655,9,10,length_mm,\n"
+        "2655,11,11,surface_code,surface_lookup\n"
+        "26551,6,6,material_code,material_lookup\n"
+        "26551,7,9,nominal,\n"
+    ),
+    "union_schema.csv": (
+        "\ufeffpair_id,ik_part_type,ok_part_type,key,dtype,lookup,required_ik,required_ok,"
+        "ik_slot,ik_codec,ok_slot,ok_codec\n"
+        'V111_2655,V111,2655,length_mm,int,,True,True,9–11,"int:width=3,pad=0",9–10,"int:width=2,pad=0"\n'
+        "V111_2655,V111,2655,material_code,lookup,material_lookup,True,True,5–5,lookup:code,5–5,lookup:code\n"
+        'V111_2655,V111,2655,nominal,int,,True,True,7–8,"int:width=2,pad=0",7–8,"int:width=2,pad=0"\n'
+        "V111_2655,V111,2655,surface_code,lookup,surface_lookup,True,True,6–6,lookup:code,11–11,lookup:code\n"
+        "V111_2655,V111,2655,thread_grade,lookup,grade_lookup,False,True,,,6–6,lookup:code\n"
+        "V112_26551,V112,26551,material_code,lookup,material_lookup,True,True,5–5,lookup:code,6–6,lookup:code\n"
+        'V112_26551,V112,26551,nominal,int,,True,True,7–9,"int:width=3,pad=0",7–9,"int:width=3,pad=0"\n'
+        "V112_26551,V112,26551,seal_code,lookup,seal_lookup,True,False,6–6,lookup:code,,\n"
+    ),
+    "matched_parts.csv": (
+        "ik_code,ok_km_code,match_flag\n"
+        "V1113808008,26550000000,OK\n"
+    ),
+    "lookup/grade_lookup.csv": "part_type,code,grade\n*,2,8.8\n*,3,10.9\n",
+    "lookup/material_lookup.csv": (
+        "part_type,code,material\n*,1,SS400\n*,7,SUS304\nV11,2,SCM435\nV111,3,S45C\n2655,9,SWCH\n"
+    ),
+    "lookup/seal_lookup.csv": "part_type,code,seal\nV112,1,NBR\nV112,2,FKM\n",
+    "lookup/surface_lookup.csv": "part_type,code,surface\n*,0,none\n*,6,Zn plating\nV111,8,Black oxide\n",
+}
+
+
+def write_fixture(data_dir: Path) -> Path:
+    """FIXTURE를 data_dir 아래에 씀 (lookup/ 포함)"""
+    data_dir = Path(data_dir)
+    for name, text in FIXTURE.items():
+        p = data_dir / name
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(text, encoding="utf-8")
+    return data_dir
+
+
+_SESSION_DATA = write_fixture(Path(tempfile.mkdtemp(prefix="vcode-test-")) / "data")
+os.environ["VCODE_DATA_DIR"] = str(_SESSION_DATA)
+os.environ["VCODE_WATCH_INTERVAL"] = "0"
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_SESSION_DATA.parent, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def data_dir() -> Path:
+    """utils.loaders 가 읽는 세션 공용 데이터 폴더 (수정하지 말 것)"""
+    return _SESSION_DATA
+
+
+@pytest.fixture
+def fresh_data(tmp_path) -> Path:
+    """테스트마다 새로 쓰는 데이터 폴더 (수정해도 되는 사본)"""
+    return write_fixture(tmp_path / "data")
+
+
+@pytest.fixture(scope="session")
+def union_df(data_dir):
+    from utils.loaders import load_union_schema
+    return load_union_schema()
@@ -0,0 +1,53 @@
+# tests/test_build_union.py
+# -*- coding: utf-8 -*-
+"""
+notebooks.build_union_schema: --incremental 결과가 전체 빌드와 같은지, 빌더 코드가 바뀌면 전체 재생성하는지
+"""
+
+import pandas as pd
+
+import notebooks.build_union_schema as bu
+
+
+def _build(d, incremental):
+    return bu.build_union(str(d / "codeSchema_IK.csv"), str(d / "codeSchema_OK.csv"),
+                          str(d / "Cross_Map.csv"), str(d / "union_schema.csv"), incremental=incremental)
+
+
+def _assert_incremental_matches_full(d):
+    _build(d, incremental=True)
+    inc = (d / "union_schema.csv").read_bytes()
+    _build(d, incremental=False)
+    assert (d / "union_schema.csv").read_bytes() == inc
+
+
+def test_incremental_matches_full_after_edits(fresh_data):
+    d = fresh_data
+    _build(d, incremental=False)
+    with open(d / "codeSchema_OK.csv", "a", encoding="utf-8") as f:       # pair 1개의 스키마 변경
+        f.write("26551,10,11,length_mm,\n")
+    _assert_incremental_matches_full(d)
+    with open(d / "Cross_Map.csv", "a", encoding="utf-8") as f:           # pair 추가
+        f.write("V112,,,2655,2655,plain,와셔,평와셔\n")
+    _assert_incremental_matches_full(d)
+    p = d / "codeSchema_IK.csv"                                           # 행 삭제
+    p.write_text("".join(l for l in p.read_text(encoding="utf-8").splitlines(True)
+                         if not l.startswith("V111,6,6")), encoding="utf-8")
+    _assert_incremental_matches_full(d)
+
+
+def test_builder_code_change_forces_full_rebuild(fresh_data, monkeypatch):
+    d = fresh_data
+    _build(d, incremental=False)
+    out = d / "union_schema.csv"
+    full = out.read_bytes()
+    stale = pd.read_csv(out, dtype=str, encoding="utf-8-sig", keep_default_na=False)
+    stale.loc[0, "ik_codec"] = "stale"                  # 이전 빌더가 만든 행이라고 가정
+    stale.to_csv(out, index=False, encoding="utf-8-sig")
+
+    _build(d, incremental=True)                         # 같은 코드 → 지문이 같은 pair는 재사용
+    assert b"stale" in out.read_bytes()
+
+    monkeypatch.setattr(bu, "_code_fingerprint", lambda: "changed")
+    _build(d, incremental=True)                         # 코드 지문이 다름 → 전체 재생성
+    assert out.read_bytes() == full
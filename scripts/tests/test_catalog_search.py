@@ -0,0 +1,32 @@
+# tests/test_catalog_search.py
+# -*- coding: utf-8 -*-
+"""
+utils.catalog_search: 빠른 검색 자동완성 (site 필터 / limit 경계)
+"""
+
+import pandas as pd
+
+from utils.catalog_search import build_catalog_index
+
+
+def _index():
+    rows = [("V1%02d" % i, "볼트", f"볼트{i}") for i in range(60)]
+    rows.append(("2655", "볼트", "볼트 육각 HEX"))
+    return build_catalog_index(pd.DataFrame(rows, columns=["part_type", "category", "remark"]))
+
+
+def test_site_filter_is_not_crowded_out_by_other_site():
+    hits = _index().suggest("볼트", limit=5, site="OK")
+    assert [h.part_type for h in hits] == ["2655"]
+
+
+def test_site_filter_on_code_prefix():
+    hits = _index().suggest("V1", limit=3, site="IK")
+    assert len(hits) == 3 and all(h.site == "IK" for h in hits)
+    assert _index().suggest("V1", limit=3, site="OK") == []
+
+
+def test_non_positive_limit_returns_nothing():
+    idx = _index()
+    assert idx.suggest("볼트", limit=0) == []
+    assert idx.suggest("볼트", limit=-3) == []
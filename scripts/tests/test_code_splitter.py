@@ -0,0 +1,113 @@
+# tests/test_code_splitter.py
+# -*- coding: utf-8 -*-
+"""
+utils.parsers.CodeSplitter / split_vcode:
+- 예전 고정 자리 split_vcode([0:4]/[4:6]/[6]/[7]/[8:11])와 같은 자리 구성의 스키마에서 같은 토큰
+- 코드 1개씩 스키마를 직접 잘라 본 결과(기준 구현)와 벡터 분해 결과가 같은지 (고유/반복 코드, 청크 CSV)
+"""
+
+import random
+
+import pandas as pd
+import pytest
+
+from utils.parsers import CodeSplitter, default_paths, load_inputs, lookup, split_vcode
+
+CHARS = "0123456789"
+
+
+def split_vcode_baseline(code):
+    """리팩터링 전 split_vcode (고정 자리, 그대로 옮김)"""
+    return {"part_type": code[:4], "material_cd": code[4:6], "surface_cd": code[6],
+            "grade_cd": code[7], "size_cd": code[8:11]}
+
+
+def split_reference(code, schemas, lookups, side=None):
+    """코드 1개: 최장 접두 part_type 의 codeSchema 자리를 그대로 잘라 라벨 조회"""
+    code = code.strip().upper()
+    site = side or ("IK" if code.startswith("V") else "OK")
+    schema = schemas[site]
+    pts = [p for p in schema["part_type"].str.strip().str.upper().unique() if code.startswith(p)]
+    out = {"code": code, "_unknown": ""}
+    if not pts:
+        out["_parse_error"] = "NO_SCHEMA"
+        return out
+    pt = max(pts, key=len)
+    out.update(site=site, part_type=pt)
+    rules = schema[schema["part_type"].str.strip().str.upper() == pt]
+    if len(code) < rules["pos_to"].astype(int).max():
+        out["_parse_error"] = f"SHORT_CODE({len(code)})"
+    unknown = []
+    for a, b, attr, table in zip(rules["pos_from"], rules["pos_to"], rules["attr_name"], rules["lookup_table"]):
+        tok = code[int(a) - 1:int(b)]
+        out[attr] = tok
+        if table in lookups and tok:
+            out[f"{attr}_label"] = lookup(lookups, table, pt, tok)
+            if out[f"{attr}_label"].startswith("UNKNOWN("):
+                unknown.append(attr)
+    out["_unknown"] = "|".join(unknown)
+    return out
+
+
+def _random_codes(rng, n):
+    prefixes = ["V111", "V112", "2655", "26551", "V999", "9999", "v111 "]
+    out = []
+    for _ in range(n):
+        p = rng.choice(prefixes)
+        out.append(p + "".join(rng.choice(CHARS) for _ in range(rng.choice([11, 11, 11, 7]) - len(p.strip()))))
+    return out
+
+
+@pytest.fixture(scope="module")
+def inputs(data_dir):
+    _, schemas, lookups = load_inputs(default_paths(data_dir))
+    return schemas, lookups
+
+
+def test_legacy_layout_matches_fixed_split(tmp_path):
+    schema = pd.DataFrame([("V111", "5", "6", "material_cd", ""), ("V111", "7", "7", "surface_cd", ""),
+                           ("V111", "8", "8", "grade_cd", ""), ("V111", "9", "11", "size_cd", "")],
+                          columns=["part_type", "pos_from", "pos_to", "attr_name", "lookup_table"])
+    splitter = CodeSplitter({"IK": schema}, {})
+    rng = random.Random(1)
+    for _ in range(50):
+        code = "V111" + "".join(rng.choice(CHARS) for _ in range(7))
+        got = split_vcode(code, splitter)
+        assert {k: got[k] for k in split_vcode_baseline(code)} == split_vcode_baseline(code)
+
+
+@pytest.mark.parametrize("repeat", [1, 5])   # 5: 고유 코드만 분해해 펼치는 경로
+def test_split_matches_per_code_reference(inputs, repeat):
+    schemas, lookups = inputs
+    splitter = CodeSplitter(schemas, lookups)
+    rng = random.Random(repeat)
+    codes = _random_codes(rng, 300)
+    codes = [rng.choice(codes) for _ in range(300 * repeat)] if repeat > 1 else codes
+    out = splitter.split(codes)
+    assert list(out.columns) == splitter.columns and len(out) == len(codes)
+    expected = {c: split_reference(c, schemas, lookups) for c in set(codes)}
+    for i, (code, row) in enumerate(zip(codes, out.to_dict("records"))):
+        got = {k: v for k, v in row.items() if v is not None and v == v}
+        assert got == expected[code], code
+        if i < 40:
+            assert split_vcode(code, splitter) == got
+
+
+def test_split_side_override(inputs):
+    schemas, lookups = inputs
+    splitter = CodeSplitter(schemas, lookups)
+    assert splitter.split_one("V1111234567", side="OK")["_parse_error"] == "NO_SCHEMA"
+    assert split_vcode("26551234567", splitter, side="OK") == split_reference("26551234567", schemas, lookups, "OK")
+
+
+def test_split_csv_chunks_match_whole(inputs, tmp_path):
+    schemas, lookups = inputs
+    splitter = CodeSplitter(schemas, lookups)
+    codes = _random_codes(random.Random(7), 250)
+    src = tmp_path / "codes.csv"
+    pd.DataFrame({"code": codes}).to_csv(src, index=False)
+    progress = list(splitter.split_csv(src, tmp_path / "out.csv", chunksize=60))
+    assert progress[-1][0] == len(codes) and len(progress) == 5
+    whole = splitter.split(pd.read_csv(src, dtype=str)["code"])
+    got = pd.read_csv(tmp_path / "out.csv", dtype=str, encoding="utf-8-sig", keep_default_na=False)
+    assert got.to_csv(index=False) == whole.fillna("").to_csv(index=False)
@@ -0,0 +1,70 @@
+# tests/test_codec_plans.py
+# -*- coding: utf-8 -*-
+"""
+vcode_codec: 컴파일된 플랜/PairSchema가 리팩터링 전 스칼라 인코더와 같은 결과를 내는지
+
+- GOLDEN: 리팩터링 전(baseline) encode_both / required_keys / extra_keys_from_other_side 출력
+- 버전 표시 없는 union_df 의 플랜 캐시가 내용 수정을 따라가는지
+"""
+
+import pandas as pd
+import pytest
+
+from notebooks import vcode_codec as vc
+from utils.loaders import load_pair_schemas
+
+# (pair_id, attrs) → baseline encode_both 결과 (ValueError = int 변환 불가)
+GOLDEN_CODES = [
+    ("V111_2655", {"material_code": "7", "surface_code": "6", "nominal": 4, "length_mm": 8, "thread_grade": "2"},
+     ("V1117604008", "26557204086")),
+    ("V111_2655", {"material_code": "3", "nominal": "12", "length_mm": "123"}, ("V1113?12123", "26553?1223?")),
+    ("V111_2655", {}, ("V111???????", "2655???????")),
+    ("V111_2655", {"material_code": " ", "nominal": None, "length_mm": "4567"}, ("V111????567", "2655????67?")),
+    ("V112_26551", {"material_code": "1", "seal_code": "2", "nominal": "30"}, ("V11212030??", "265511030??")),
+    ("V112_26551", {"material_code": "7", "nominal": 5}, ("V1127?005??", "265517005??")),
+    ("V111_2655", {"nominal": "abc"}, ValueError),
+]
+
+# (pair_id, side) → (required_keys, extra_keys_from_other_side)
+GOLDEN_KEYS = {
+    ("V111_2655", "IK"): (["length_mm", "material_code", "nominal", "surface_code"], ["thread_grade"]),
+    ("V111_2655", "OK"): (["length_mm", "material_code", "nominal", "surface_code", "thread_grade"], []),
+    ("V112_26551", "IK"): (["material_code", "nominal", "seal_code"], []),
+    ("V112_26551", "OK"): (["material_code", "nominal"], ["seal_code"]),
+}
+
+@pytest.mark.parametrize("pair_id, attrs, expected", GOLDEN_CODES)
+def test_encode_matches_baseline(union_df, pair_id, attrs, expected):
+    schema = load_pair_schemas()[pair_id]
+    if expected is ValueError:
+        with pytest.raises(ValueError):
+            vc.encode_both(union_df, pair_id, attrs)
+        with pytest.raises(ValueError):
+            vc.encode_many(union_df, pair_id, pd.DataFrame([attrs]))
+        return
+    assert vc.encode_both(union_df, pair_id, attrs) == expected
+    assert schema.encode_both(attrs) == expected
+    assert (vc.encode_code("IK", union_df, pair_id, attrs), vc.encode_code("OK", union_df, pair_id, attrs)) == expected
+    got = vc.encode_many(union_df, pair_id, pd.DataFrame([attrs], columns=list(attrs) or None))
+    assert tuple(got.iloc[0]) == expected
+
+
+@pytest.mark.parametrize("pair_id, side", list(GOLDEN_KEYS))
+def test_keys_match_baseline(union_df, pair_id, side):
+    required, extra = GOLDEN_KEYS[(pair_id, side)]
+    schema = load_pair_schemas()[pair_id]
+    assert vc.required_keys(union_df, pair_id, side) == required
+    assert vc.extra_keys_from_other_side(union_df, pair_id, side) == extra
+    assert schema.required_keys(side) == required
+    assert schema.extra_keys(side) == extra
+
+
+def test_plan_cache_follows_in_place_edit(union_df):
+    """버전 표시가 없는 union_df는 내용 해시로 캐시 → 행 수가 같은 in-place 수정도 반영"""
+    assert union_df.attrs.get(vc.SCHEMA_VERSION_ATTR) == vc.schema_version(union_df)
+    u = union_df.copy()
+    u.attrs = {}
+    attrs = {"material_code": "7", "nominal": 4}
+    assert vc.encode_both(u, "V111_2655", attrs)[0] == "V1117?04???"
+    u.loc[u.key == "nominal", "ik_slot"] = "8–9"
+    assert vc.encode_both(u, "V111_2655", attrs)[0] == "V1117??04??"
@@ -0,0 +1,62 @@
+# tests/test_crossmap_rules.py
+# -*- coding: utf-8 -*-
+"""
+notebooks.match_iksan_okc.CrossMapRules: 리팩터링 전 attach_km(행마다 Cross_Map 전체 스캔, first-hit)과 같은 결과인지
+"""
+
+import random
+
+import pandas as pd
+
+from notebooks.match_iksan_okc import CrossMapRules
+
+
+def attach_km_baseline(df_ik, xmap_df):
+    """리팩터링 전 match_iksan_okc.ipynb 의 attach_km (기준 구현, 그대로 옮김)"""
+    rows = []
+    for _, r in df_ik.iterrows():
+        cond = (
+            (xmap_df.ik_part_type == r.part_type) &
+            ((xmap_df.ik_grade_code == '') | (xmap_df.ik_grade_code == r.grade_code)) &
+            ((xmap_df.ik_seal_code  == '') | (xmap_df.ik_seal_code  == r.seal_snap_code))
+        )
+        hit = xmap_df[cond]
+        km  = hit.ok_km_code.iloc[0] if not hit.empty else ''
+        note= hit.note.iloc[0]       if not hit.empty else ''
+        rows.append({**r, 'ok_km_code': km, 'map_note': note})
+    return pd.DataFrame(rows)
+
+
+PTS = ["V111", "V112", "V113", "V999"]
+CODES = ["", "1", "2", "3"]
+
+
+def _random_case(seed: int):
+    rng = random.Random(seed)
+    xmap = pd.DataFrame([{
+        "ik_part_type": rng.choice(PTS[:3]), "ik_grade_code": rng.choice(CODES),
+        "ik_seal_code": rng.choice(CODES), "ok_km_code": f"K{i:03d}", "note": f"n{i}",
+    } for i in range(rng.randint(0, 40))], columns=["ik_part_type", "ik_grade_code", "ik_seal_code",
+                                                      "ok_km_code", "note"])
+    ik = pd.DataFrame([{
+        "part_type": rng.choice(PTS), "grade_code": rng.choice(CODES), "seal_snap_code": rng.choice(CODES),
+        "remark": f"r{i}",
+    } for i in range(120)])
+    return ik, xmap
+
+
+def test_rules_match_first_hit_baseline():
+    for seed in range(12):
+        ik, xmap = _random_case(seed)
+        expected = attach_km_baseline(ik, xmap)
+        got = CrossMapRules(xmap).attach(ik)
+        assert got["ok_km_code"].tolist() == expected["ok_km_code"].tolist(), seed
+        assert got["map_note"].tolist() == expected["map_note"].tolist(), seed
+
+
+def test_rule_id_prefers_earliest_rule_over_specificity():
+    xmap = pd.DataFrame({"ik_part_type": ["V111", "V111"], "ik_grade_code": ["", "2"],
+                         "ik_seal_code": ["", "1"], "ok_km_code": ["2655", "26551"], "note": ["a", "b"]})
+    rules = CrossMapRules(xmap)
+    assert rules.rule_id("V111", "2", "1") == 0          # 와일드카드 규칙이 먼저 나오면 그 규칙
+    assert rules.rule_id("V999") == -1
@@ -0,0 +1,73 @@
+# tests/test_decode.py
+# -*- coding: utf-8 -*-
+"""
+vcode_codec.decode_many: 무작위 코드에서 스칼라 경로(decode_attrs_from_code)와 같은 해석을 내는지,
+encode → decode 왕복 (lookup slot 폭이 코드보다 넓은 경우 포함)
+"""
+
+import random
+
+import numpy as np
+import pandas as pd
+
+from notebooks import vcode_codec as vc
+
+KEYS = ["material_code", "surface_code", "nominal", "length_mm", "thread_grade", "seal_code"]
+VALUES = ["", "1", "7", "12", "123", "4567", 3, None, " ", 8.0]
+PAIRS = ["V111_2655", "V112_26551"]
+
+
+def _random_rows(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    rows = [{k: rng.choice(VALUES) for k in KEYS if rng.random() < 0.8} for _ in range(n)]
+    return rows, [rng.choice(PAIRS) for _ in range(n)]
+
+
+def test_decode_many_matches_scalar(union_df):
+    rows, pids = _random_rows(1000, seed=1)
+    codes = []
+    for attrs, pid in zip(rows, pids):
+        try:
+            codes.extend(vc.encode_both(union_df, pid, attrs))
+        except ValueError:
+            pass
+    codes += ["XXX", "", None, "v1117604008 ", "99999999999"]
+    df = vc.decode_many(union_df, codes)
+    attr_cols = list(df.columns[4:])
+    for i, code in enumerate(codes):
+        pid, attrs, pt = vc.decode_attrs_from_code(union_df, None, code if code is not None else "")
+        row = df.iloc[i]
+        assert row.pair_id == pid and row.part_type == (pt if pid else None), code
+        assert {k: row[k] for k in attr_cols if row[k] is not None} == attrs, code
+
+
+def test_decode_many_unmatched_rows_are_none(union_df):
+    df = vc.decode_many(union_df, ["ZZZ"])
+    assert df.iloc[0].drop(["code", "side"]).tolist() == [None] * (len(df.columns) - 2)
+
+
+def test_encode_decode_round_trip(union_df):
+    attrs = {"material_code": "7", "surface_code": "6", "nominal": "4", "length_mm": "8", "thread_grade": "2"}
+    ik, ok = vc.encode_both(union_df, "V111_2655", attrs)
+    dec = vc.decode_many(union_df, np.array([ik, ok], dtype=object))
+    assert dec.pair_id.tolist() == ["V111_2655", "V111_2655"]
+    assert dec.part_type.tolist() == ["V111", "2655"]
+    assert dec.loc[0, "length_mm"] == "8" and dec.loc[1, "thread_grade"] == "2"
+
+
+def test_round_trip_lookup_slot_wider_than_code():
+    """2자리 lookup slot에 1자리 코드: 인코더가 붙인 '0'을 해석에서 걷어내야 함"""
+    union = pd.DataFrame({
+        "pair_id": ["V900_9000"] * 2, "ik_part_type": ["V900"] * 2, "ok_part_type": ["9000"] * 2,
+        "key": ["mat", "nominal"], "dtype": ["lookup", "int"], "lookup": ["material_lookup", ""],
+        "required_ik": [True, True], "required_ok": [True, True],
+        "ik_slot": ["5–6", "7–8"], "ik_codec": ["lookup:code", "int:width=2,pad=0"],
+        "ok_slot": ["5–6", "7–8"], "ok_codec": ["lookup:code", "int:width=2,pad=0"],
+    })
+    for mat in ("7", "0", "12"):
+        ik, ok = vc.encode_both(union, "V900_9000", {"mat": mat, "nominal": 4})
+        assert ik[4:6] == mat.rjust(2, "0")
+        pid, attrs, _ = vc.decode_attrs_from_code(union, None, ik)
+        assert pid == "V900_9000" and attrs == {"mat": mat, "nominal": "4"}
+        assert vc.decode_many(union, [ik, ok])["mat"].tolist() == [mat, mat]
+        assert vc.encode_both(union, pid, attrs) == (ik, ok)
@@ -0,0 +1,35 @@
+# tests/test_encode_many.py
+# -*- coding: utf-8 -*-
+"""
+vcode_codec.encode_many: 무작위 입력(여러 pair_id 섞임)에서 스칼라 경로(encode_both)와 같은 코드를 내는지
+"""
+
+import random
+
+import pandas as pd
+
+from notebooks import vcode_codec as vc
+
+KEYS = ["material_code", "surface_code", "nominal", "length_mm", "thread_grade", "seal_code"]
+VALUES = ["", "1", "7", "12", "123", "4567", 3, None, " ", 8.0]
+PAIRS = ["V111_2655", "V112_26551"]
+
+
+def _random_rows(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    rows = [{k: rng.choice(VALUES) for k in KEYS if rng.random() < 0.8} for _ in range(n)]
+    return rows, [rng.choice(PAIRS) for _ in range(n)]
+
+
+def test_encode_many_matches_scalar(union_df):
+    rows, pids = _random_rows(3000)
+    res = vc.encode_many(union_df, pids, pd.DataFrame(rows), errors="coerce")
+    checked = 0
+    for i, (attrs, pid) in enumerate(zip(rows, pids)):
+        try:
+            expected = vc.encode_both(union_df, pid, attrs)
+        except ValueError:
+            continue
+        assert (res.ik_code.iloc[i], res.ok_code.iloc[i]) == expected, (attrs, pid)
+        checked += 1
+    assert checked > 1000
@@ -0,0 +1,83 @@
+# tests/test_incremental.py
+# -*- coding: utf-8 -*-
+"""
+utils.incremental: 입력을 고친 뒤 증분 재빌드 결과가 전체 재계산(--force)과 바이트 단위로 같은지
+(lookup / Cross_Map / part_master 수정 각각)
+"""
+
+import random
+import shutil
+
+import pandas as pd
+import pytest
+
+from utils.incremental import rebuild_matched, rebuild_parsed
+from utils.parsers import default_paths
+
+PART_TYPES = [("IKSAN", "V111"), ("IKSAN", "V112"), ("IKSAN", "V999"), ("OKCHEON", "2655"),
+              ("OKCHEON", "26551"), ("OKCHEON", "9999")]
+
+
+@pytest.fixture
+def inc_data(fresh_data):
+    """part_master를 60행으로 늘린 데이터 폴더 (같은 part_type이 여러 행)"""
+    rng = random.Random(0)
+    rows = [(site, pt, f"r{i}", rng.choice(["볼트", "와셔"])) for i, (site, pt) in
+            enumerate(rng.choice(PART_TYPES) for _ in range(60))]
+    pd.DataFrame(rows, columns=["site", "part_type", "remark", "category"]).to_csv(
+        fresh_data / "part_master.csv", index=False)
+    with open(fresh_data / "Cross_Map.csv", "a", encoding="utf-8") as f:
+        f.write("V112,,,2655,2655,plain,와셔,평와셔\n")
+    return fresh_data
+
+
+def _run(data, force=False):
+    paths = default_paths(data)
+    parsed = rebuild_parsed(paths, force=force)
+    matched = rebuild_matched(paths["out"], data / "Cross_Map.csv", data / "matched_parts.csv", force=force)
+    return parsed, matched
+
+
+def _assert_same_as_force(data, tmp_path):
+    """증분 결과를 남겨 두고, 같은 입력으로 전체 재계산한 결과와 비교"""
+    _run(data)
+    outputs = ("parsed_parts.csv", "matched_parts.csv")
+    for name in outputs:
+        shutil.copy(data / name, tmp_path / f"inc_{name}")
+    _run(data, force=True)
+    for name in outputs:
+        assert (data / name).read_bytes() == (tmp_path / f"inc_{name}").read_bytes(), name
+
+
+def test_rerun_without_changes_recomputes_nothing(inc_data):
+    _run(inc_data)
+    before = (inc_data / "parsed_parts.csv").read_bytes()
+    parsed, matched = _run(inc_data)
+    assert not parsed.recompute and not matched.recompute
+    assert (inc_data / "parsed_parts.csv").read_bytes() == before
+
+
+def test_lookup_change_matches_force(inc_data, tmp_path):
+    _run(inc_data)
+    with open(inc_data / "lookup" / "material_lookup.csv", "a", encoding="utf-8") as f:
+        f.write("V111,5,S20C\n")
+    _assert_same_as_force(inc_data, tmp_path)
+
+
+def test_crossmap_change_matches_force(inc_data, tmp_path):
+    _run(inc_data)
+    p = inc_data / "Cross_Map.csv"
+    p.write_text(p.read_text(encoding="utf-8").replace("V112,,,2655,2655,plain", "V112,,,26551,26551,plain"),
+                 encoding="utf-8")
+    _assert_same_as_force(inc_data, tmp_path)
+
+
+def test_part_master_change_matches_force(inc_data, tmp_path):
+    _run(inc_data)
+    p = inc_data / "part_master.csv"
+    pm = pd.read_csv(p, dtype=str)
+    pm = pm.drop(index=[3, 10, 50])
+    pm.loc[5, "remark"] = "edited"
+    extra = pd.DataFrame([{"site": "IKSAN", "part_type": "V112", "remark": "new", "category": "와셔"}])
+    pd.concat([pm.iloc[:20], extra, pm.iloc[20:]]).to_csv(p, index=False)
+    _assert_same_as_force(inc_data, tmp_path)
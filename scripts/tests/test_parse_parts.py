@@ -0,0 +1,85 @@
+# tests/test_parse_parts.py
+# -*- coding: utf-8 -*-
+"""
+utils.parsers.parse_parts: 리팩터링 전 parse_vcode 스크립트(행마다 스키마 필터)와 같은 parsed_parts를 내는지
+"""
+
+import random
+
+import pandas as pd
+
+from utils.lookups import load_lookup_tables
+from utils.parsers import candidate_keys, default_paths, load_inputs, parse_parts
+
+
+def _baseline_lookup_map(lookup_dir):
+    """리팩터링 전 build_lookup: 테이블명 → (spec{(pt, code): 라벨}, common{code: 라벨})"""
+    out = {}
+    for path in sorted(lookup_dir.glob("*_lookup.csv")):
+        col = [c for c in pd.read_csv(path, nrows=1).columns if c not in ("part_type", "code")][0]
+        df = pd.read_csv(path, dtype=str).fillna("")
+        df["part_type"] = df["part_type"].astype(str).str.strip().str.upper()
+        spec = df[df.part_type != "*"].set_index(["part_type", "code"])[col].to_dict()
+        common = df[df.part_type == "*"].set_index("code")[col].to_dict()
+        out[path.stem] = (spec, common)
+    return out
+
+
+def parse_baseline(pm, schema_ik, schema_ok, lookup_map):
+    """리팩터링 전 parse_vcode 의 파싱 루프 (기준 구현, 그대로 옮김)"""
+    pm = pm.copy()
+    schema_ik = schema_ik.copy()
+    schema_ok = schema_ok.copy()
+    schema_ik["part_type"] = schema_ik["part_type"].astype(str).str.strip().str.upper()
+    schema_ok["part_type"] = schema_ok["part_type"].astype(str).str.strip().str.upper()
+    pm["system"] = pm["part_type"].str.startswith("V").map({True: "IK", False: "OK"})
+    pm["part_type"] = pm["part_type"].astype(str).str.strip()
+    rows = []
+    for _, row in pm.iterrows():
+        ptype, system = row.part_type, row.system
+        rules_src = schema_ik if system == "IK" else schema_ok
+        rules = pd.DataFrame()
+        for key in candidate_keys(system, ptype):
+            rules = rules_src[rules_src.part_type == key]
+            if not rules.empty:
+                break
+        if rules.empty:
+            rows.append({**row.to_dict(), "_parse_error": f'NO_SCHEMA({"/".join(candidate_keys(system, ptype))})'})
+            continue
+        parsed = row.to_dict()
+        for _, r in rules.iterrows():
+            table = r.lookup_table
+            if table in lookup_map:
+                spec, common = lookup_map[table]
+                cand = set(candidate_keys(system, ptype))
+                spec_codes = {code for (pt, code) in spec.keys() if pt in cand}
+                parsed[r.attr_name] = "|".join(sorted(spec_codes | set(common.keys())))
+            else:
+                parsed[r.attr_name] = "(free)"
+        rows.append(parsed)
+    return pd.DataFrame(rows)
+
+
+def test_parse_parts_matches_baseline(fresh_data):
+    paths = default_paths(fresh_data)
+    with open(fresh_data / "codeSchema_IK.csv", "a", encoding="utf-8") as f:   # 그룹키(V12) 스키마
+        f.write("V12,5,5,material_code,material_lookup\nV12,6,8,nominal,\n")
+    rng = random.Random(0)
+    pts = ["V111", "V112", "V121", "V12", "V113", "2655", "26551", "9999"]
+    pd.DataFrame([{"site": "", "part_type": rng.choice(pts), "remark": f"r{i}", "category": "c"}
+                  for i in range(80)]).to_csv(paths["part_master"], index=False)
+
+    pm, schemas, lookups = load_inputs(paths)
+    expected = parse_baseline(pm, pd.read_csv(paths["schema_ik"]), pd.read_csv(paths["schema_ok"]),
+                              _baseline_lookup_map(paths["lookup_dir"]))
+    got = parse_parts(pm, schemas, lookups)
+    assert list(got.columns) == list(expected.columns)
+    assert got.to_csv(index=False) == expected.to_csv(index=False)
+
+
+def test_parse_parts_includes_group_codes(fresh_data):
+    paths = default_paths(fresh_data)
+    pm, schemas, _ = load_inputs(paths)
+    got = parse_parts(pm, schemas, load_lookup_tables(paths["lookup_dir"]))
+    v111 = got[got.part_type == "V111"].iloc[0]   # 공통(*) + 그룹(V11) + 정확(V111) 코드
+    assert v111["material_code"] == "1|2|3|7" and v111["nominal"] == "(free)"
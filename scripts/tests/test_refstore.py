@@ -0,0 +1,109 @@
+# tests/test_refstore.py
+# -*- coding: utf-8 -*-
+"""
+utils.refstore.RefStore: 바뀐 파일에서 파생된 항목(+전이 의존)만 새 세대로 다시 만드는지,
+빌드 실패 시 이전 세대 유지, 재빌드 중에도 다른 스레드는 이전 세대 값을 보는지
+"""
+
+import threading
+
+import pytest
+
+from utils.refstore import RefStore
+
+
+@pytest.fixture
+def files(tmp_path):
+    out = {}
+    for name in ("a", "b", "c"):
+        out[name] = tmp_path / f"{name}.csv"
+        out[name].write_text(f"{name}0", encoding="utf-8")
+    return out
+
+
+@pytest.fixture
+def store(files):
+    """a ← ab(a, b 파일 없이 항목 의존) ← top,  b, c 는 독립"""
+    s = RefStore()
+    s.builds = []
+    def reader(name):
+        def build(st):
+            s.builds.append(name)
+            return [files[name].read_text(encoding="utf-8")]
+        return build
+    for name in files:
+        s.register(name, reader(name), files=[files[name]])
+    s.register("ab", lambda st: (s.builds.append("ab"), st.get("a") + st.get("b"))[1], deps=["a", "b"])
+    s.register("top", lambda st: (s.builds.append("top"), ["top"] + st.get("ab"))[1], deps=["ab"])
+    return s
+
+
+def test_refresh_rebuilds_only_affected(store, files):
+    top, c = store.get("top"), store.get("c")
+    store.builds.clear()
+    files["a"].write_text("a1", encoding="utf-8")
+    assert store.refresh([files["a"]]) == {"a", "ab", "top"}
+    assert store.version == 1
+    assert sorted(store.builds) == ["a", "ab", "top"]
+    assert store.get("top") == ["top", "a1", "b0"] and store.get("top") is not top
+    assert store.get("c") is c and store.get("b") == ["b0"]
+    assert store.builds.count("b") == 0
+
+
+def test_refresh_of_unrelated_file_is_noop(store, tmp_path):
+    store.get("top")
+    store.builds.clear()
+    assert store.refresh([tmp_path / "other.csv"]) == set()
+    assert store.version == 0 and store.builds == []
+
+
+def test_unbuilt_items_stay_lazy(store, files):
+    store.get("a")
+    store.builds.clear()
+    store.refresh([files["a"], files["c"]])
+    assert store.builds == ["a"]            # ab/top/c 는 아직 안 쓰였으므로 다음 get 때 빌드
+    assert store.get("top") == ["top", "a0", "b0"]
+    assert sorted(store.builds) == ["a", "ab", "b", "top"]
+
+
+def test_failed_build_keeps_previous_generation(store, files):
+    top = store.get("top")
+    seen = []
+    store.listeners.append(lambda changed, affected: seen.append(affected))
+    def broken(st):
+        raise ValueError("half-written csv")
+    store._items["a"].build = broken
+    assert store.refresh([files["a"]]) == set()
+    assert store.version == 0 and store.get("top") is top and seen == []
+
+
+def test_readers_see_old_generation_until_swap(store, files):
+    old_a = store.get("a")
+    store.get("ab")
+    during = []
+    def ab_build(st):
+        t = threading.Thread(target=lambda: during.append(st.get("a")))   # 다른 세션(스레드)의 조회
+        t.start()
+        t.join()
+        return st.get("a") + st.get("b")
+    store._items["ab"].build = ab_build
+    files["a"].write_text("a1", encoding="utf-8")
+    store.refresh([files["a"]])
+    assert during == [old_a]
+    assert store.get("ab") == ["a1", "b0"]
+
+
+def test_check_detects_changed_files(store, files):
+    store.get("top")
+    files["b"].write_text("b-changed", encoding="utf-8")
+    assert store.check() == {"b", "ab", "top"}
+    assert store.get("top") == ["top", "a0", "b-changed"]
+    assert store.check() == set()
+
+
+def test_listeners_get_changed_and_affected(store, files):
+    store.get("ab")
+    calls = []
+    store.listeners.append(lambda changed, affected: calls.append((changed, affected)))
+    store.refresh([files["b"]])
+    assert calls == [({str(files["b"])}, {"b", "ab", "top"})]
@@ -0,0 +1,48 @@
+# tests/test_service.py
+# -*- coding: utf-8 -*-
+"""
+service: POST /encode 배치 경로가 단건 경로와 같은 코드를 내고, 변환 불가 값은 항목별 error로 보고하는지
+"""
+
+import pytest
+
+from service import HTTPError, h_encode
+
+GOOD = {"pair_id": "V111_2655", "attrs": {"material_code": "7", "surface_code": "6", "nominal": 4,
+                                          "length_mm": 8, "thread_grade": "2"}}
+
+
+def test_batch_matches_single():
+    single = h_encode({}, GOOD)
+    batch = h_encode({}, {"items": [GOOD, GOOD]})["items"]
+    assert [(it["ik_code"], it["ok_code"]) for it in batch] == [(single["ik_code"], single["ok_code"])] * 2
+
+
+def test_batch_reports_invalid_value_per_item():
+    bad = {"pair_id": "V111_2655", "attrs": {"nominal": "abc"}}
+    items = h_encode({}, {"items": [GOOD, bad, {"pair_id": "NOPE", "attrs": {}}]})["items"]
+    assert items[0]["ik_code"] == "V1117604008" and "error" not in items[0]
+    assert "error" in items[1] and "ik_code" not in items[1]
+    assert items[2]["error"] == "unknown pair_id"
+
+
+def test_single_invalid_value_raises():
+    with pytest.raises(ValueError):      # 디스패처에서 400
+        h_encode({}, {"pair_id": "V111_2655", "attrs": {"nominal": "abc"}})
+
+
+@pytest.mark.parametrize("item", [
+    {"pair_id": "V111_2655", "attrs": {"nominal": [1]}},        # 스칼라가 아닌 값
+    {"pair_id": "V111_2655", "attrs": "x"},                     # attrs가 객체가 아님
+    {"pair_id": "V111_2655", "attrs": {"nominal": 123}},        # 2자리 slot 초과
+])
+def test_batch_bad_item_does_not_fail_others(item):
+    items = h_encode({}, {"items": [GOOD, item]})["items"]
+    assert items[0]["ik_code"] == "V1117604008"
+    assert "error" in items[1] and "ik_code" not in items[1]
+
+
+def test_single_overflow_is_400():
+    with pytest.raises(HTTPError) as e:
+        h_encode({}, {"pair_id": "V111_2655", "attrs": {"nominal": 123}})
+    assert e.value.status == 400 and "nominal" in str(e.value)
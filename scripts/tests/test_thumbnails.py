@@ -0,0 +1,67 @@
+# tests/test_thumbnails.py
+# -*- coding: utf-8 -*-
+"""
+utils.thumbnails: 용량 상한 LRU 삭제 / 메모 상한
+"""
+
+import os
+
+from PIL import Image
+
+import utils.thumbnails as th
+from utils.thumbnails import ThumbnailStore
+
+
+def _images(d, n):
+    d.mkdir()
+    out = []
+    for i in range(n):
+        p = d / f"img{i}.png"
+        Image.new("RGB", (400, 300), (i * 20 % 256, 80, 160)).save(p)
+        out.append(p)
+    return out
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    store = ThumbnailStore(tmp_path / "cache")
+    srcs = _images(tmp_path / "src", 4)
+    outs = [store.thumbnail(p, 160) for p in srcs]
+    assert all(o.parent.parent == store.dir for o in outs)
+    for i, o in enumerate(outs):                        # img0이 가장 오래 안 쓴 것
+        os.utime(o, (1000 + i, 1000 + i))
+    sizes = [o.stat().st_size for o in outs]
+
+    left = store.evict(sum(sizes[2:]))
+    assert left == sum(sizes[2:])
+    assert [o.exists() for o in outs] == [False, False, True, True]
+
+
+def test_evict_keeps_protected_file(tmp_path):
+    store = ThumbnailStore(tmp_path / "cache")
+    outs = [store.thumbnail(p, 160) for p in _images(tmp_path / "src", 3)]
+    for i, o in enumerate(outs):
+        os.utime(o, (1000 + i, 1000 + i))
+    store.evict(0, keep=outs[0])
+    assert [o.exists() for o in outs] == [True, False, False]
+
+
+def test_max_bytes_triggers_eviction_on_add(tmp_path):
+    srcs = _images(tmp_path / "src", 6)
+    one = ThumbnailStore(tmp_path / "probe").thumbnail(srcs[0], 160).stat().st_size
+    store = ThumbnailStore(tmp_path / "cache", max_bytes=one * 3)
+    outs = []
+    for i, p in enumerate(srcs):
+        outs.append(store.thumbnail(p, 160))
+        os.utime(outs[-1], (1000 + i, 1000 + i))
+    total = sum(o.stat().st_size for o in outs if o.exists())
+    assert total <= one * 3 and outs[-1].exists() and not outs[0].exists()
+
+
+def test_memos_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(th, "MEMO_LIMIT", 3)
+    monkeypatch.setattr(th, "TOUCH_INTERVAL", 0.0)
+    store = ThumbnailStore(tmp_path / "cache")
+    for p in _images(tmp_path / "src", 6):
+        store.thumbnail(p, 160)
+        store.thumbnail(p, 160)                         # 적중 → 터치 메모
+    assert len(store._hashes) <= 3 and len(store._touched) <= 3
@@ -0,0 +1,111 @@
+# tests/test_translate.py
+# -*- coding: utf-8 -*-
+"""
+utils.translate: 워커 1개와 N개의 결과가 같은지 (코드/속성 모드, 출력·오류 파일 바이트 단위, 입력 순서 유지),
+코덱 조립 결과가 코드 1개씩 스칼라 decode → encode 한 결과와 같은지
+"""
+
+import random
+
+import pandas as pd
+import pytest
+
+from notebooks import vcode_codec as vc
+from utils.translate import translate_codes, translate_file
+
+JUNK = ["", "XXX", "V999123", "v1117604008 ", "26559999999", "ABCDEFGHIJK"]
+
+
+def _codes(union_df, n: int, seed: int = 0):
+    """인코딩한 IK/OK 코드 + 잡음(빈 값, 모르는 접두, 공백/소문자) 섞어서"""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        if rng.random() < 0.2:
+            out.append(rng.choice(JUNK))
+            continue
+        pid = rng.choice(["V111_2655", "V112_26551"])
+        attrs = {"material_code": rng.choice(["1", "3", "7"]), "nominal": rng.randint(0, 99),
+                 "length_mm": rng.randint(0, 99), "surface_code": rng.choice(["0", "6", ""]),
+                 "thread_grade": rng.choice(["2", "3"]), "seal_code": rng.choice(["1", "2"])}
+        out.append(vc.encode_both(union_df, pid, attrs)[rng.randrange(2)])
+    return out
+
+
+@pytest.fixture(scope="module")
+def codes_csv(union_df, tmp_path_factory):
+    p = tmp_path_factory.mktemp("translate") / "codes.csv"
+    pd.DataFrame({"code": _codes(union_df, 3000)}).to_csv(p, index=False)
+    return p
+
+
+def test_workers_give_same_output(codes_csv, tmp_path):
+    results = []
+    for workers in (1, 2):
+        out = tmp_path / f"out{workers}.csv"
+        translate_file(codes_csv, out, workers=workers, chunksize=500)
+        err = out.with_name(f"{out.stem}.errors.csv")
+        results.append((out.read_bytes(), err.read_bytes() if err.exists() else None))
+    assert results[0] == results[1]
+    assert results[0][1] is not None            # 잡음 행이 오류 파일로 보고됨
+
+
+def test_translate_codes_chunks_match_whole(codes_csv):
+    codes = pd.read_csv(codes_csv, dtype=str, keep_default_na=False)["code"].tolist()
+    whole = translate_codes(codes)
+    parts = pd.concat([translate_codes(codes[i:i + 500]) for i in range(0, len(codes), 500)],
+                      ignore_index=True)
+    pd.testing.assert_frame_equal(whole.reset_index(drop=True), parts)
+
+
+def test_translate_codes_matches_scalar_codec(union_df, codes_csv):
+    """코덱 조립 행: 코드 1개씩 decode_attrs_from_code → encode_both 한 상대측 코드와 같음"""
+    codes = pd.read_csv(codes_csv, dtype=str, keep_default_na=False)["code"].tolist()[:600]
+    res = translate_codes(codes)
+    checked = 0
+    for code, row in zip(codes, res.to_dict("records")):
+        pid, attrs, _ = vc.decode_attrs_from_code(union_df, None, code.strip().upper())
+        assert (None if pd.isna(row["pair_id"]) else row["pair_id"]) == pid, code
+        if row["source"] != "codec":
+            continue
+        ik, ok = vc.encode_both(union_df, pid, attrs)
+        assert row["target_code"] == (ok if row["side"] == "IK" else ik), code
+        assert row["complete"] == ("?" not in row["target_code"])
+        checked += 1
+    assert checked > 300
+
+
+@pytest.fixture(scope="module")
+def attrs_tsv(union_df, tmp_path_factory):
+    """속성 모드 입력: pair_id + 속성 컬럼 (빈/모르는 pair 섞어서)"""
+    rng = random.Random(3)
+    rows = []
+    for _ in range(1200):
+        pid = rng.choice(["V111_2655", "V112_26551", "V112_26551", "", "V999_0000"])
+        rows.append({"pair_id": pid, "material_code": rng.choice(["1", "3", "7", ""]),
+                     "nominal": str(rng.randint(0, 99)), "length_mm": rng.choice(["", "8", "45"]),
+                     "seal_code": rng.choice(["1", "2", ""])})
+    p = tmp_path_factory.mktemp("translate") / "attrs.tsv"
+    pd.DataFrame(rows).to_csv(p, index=False, sep="\t")
+    return p
+
+
+def test_attr_mode_workers_give_same_output(union_df, attrs_tsv, tmp_path):
+    results = []
+    for workers in (1, 2):
+        out = tmp_path / f"codes{workers}.tsv"
+        translate_file(attrs_tsv, out, workers=workers, chunksize=250)
+        results.append((out.read_bytes(), out.with_name(f"{out.stem}.errors.tsv").read_bytes()))
+    assert results[0] == results[1]
+
+    src = pd.read_csv(attrs_tsv, dtype=str, sep="\t", keep_default_na=False)
+    got = pd.read_csv(tmp_path / "codes1.tsv", dtype=str, sep="\t", keep_default_na=False)
+    for (_, a), (_, g) in zip(src.iterrows(), got.iterrows()):
+        if a.pair_id in ("V111_2655", "V112_26551"):
+            attrs = {k: v for k, v in a.drop("pair_id").items() if v != ""}
+            assert (g.ik_code, g.ok_code) == vc.encode_both(union_df, a.pair_id, attrs)
+        else:
+            assert g.error == ("EMPTY_PAIR" if a.pair_id == "" else "UNKNOWN_PAIR")
+
+    errs = pd.read_csv(tmp_path / "codes1.errors.tsv", dtype=str, sep="\t", keep_default_na=False)
+    assert len(errs) and (src.pair_id.iloc[errs.row.astype(int) - 1].isin(["", "V999_0000"])).all()
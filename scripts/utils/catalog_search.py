@@ -0,0 +1,204 @@
+# utils/catalog_search.py
+# -*- coding: utf-8 -*-
+"""
+빠른 검색 자동완성 색인 (part_type / Cross_Map 짝 / remark / category)
+
+- 카탈로그(part_master) 버전마다 한 번 만들고 키 입력마다 조회만 한다
+  · 코드 키 : part_type, Cross_Map 짝 part_type (대문자, 정렬 목록 + bisect)
+  · 텍스트 키: remark / category 정규화 전체 + 토큰 (정렬 목록 + bisect)
+  · 부분일치: remark / category 3-gram → 항목 id 집합 (접두 결과가 모자랄 때만)
+  · 11자리 코드 입력: 코드 앞부분과 일치하는 part_type (길이별 dict 조회)
+- 같은 점수면 코드로 걸린 항목은 짧은/사전순 part_type, 텍스트로 걸린 항목은 짧은 remark가 위
+  (항목 id를 remark 길이 순으로 매겨 부분일치 후보도 id 순으로 훑으면 짧은 것부터)
+- 접두 범위는 앞에서부터 limit 배수만큼만 훑음 → 카탈로그 크기와 무관하게 키 입력당 수십 µs
+"""
+
+from __future__ import annotations
+
+import bisect
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import pandas as pd
+
+from utils.lookups import label_tokens, normalize_label
+from utils.matched_index import normalize_code
+from utils.prefix_index import site_of, str_column
+
+# 점수 (높을수록 위)
+SCORE_EXACT = 1.0       # part_type 완전일치
+SCORE_CODE = 0.95       # 11자리 코드의 part_type 접두
+SCORE_PREFIX = 0.9      # part_type 접두
+SCORE_PAIRED = 0.8      # Cross_Map 짝 part_type 완전일치 (접두면 -0.05)
+SCORE_TEXT = 0.6        # remark/category 전체 접두 (토큰 접두면 -0.1)
+SCORE_SUBSTR = 0.4      # remark/category 부분일치
+
+SCAN_FACTOR = 4         # 접두 범위에서 limit × SCAN_FACTOR 개까지만 확인
+
+_SCORE_KIND = {"part_type": SCORE_PREFIX, "paired": SCORE_PAIRED - 0.05}
+
+
+class CatalogHit(NamedTuple):
+    part_type: str
+    site: str           # "IK" / "OK"
+    paired: str         # Cross_Map 상대 part_type ("" = 없음)
+    category: str
+    remark: str
+    field: str          # 일치한 항목: part_type / code / paired / remark / category
+    score: float
+
+
+class CatalogIndex:
+    """part_master + Cross_Map 자동완성 색인 (불변, 카탈로그가 바뀌면 새로 만들어 교체)"""
+
+    def __init__(self, catalog: pd.DataFrame | None, crossmap: Tuple[dict, dict] | None = None):
+        ik2ok, ok2ik = crossmap or ({}, {})
+        rows: Dict[str, Tuple[str, str]] = {}                  # part_type → (category, remark) 첫 행
+        if catalog is not None and len(catalog):
+            for pt, cat, rem in zip(str_column(catalog, "part_type"), str_column(catalog, "category"),
+                                    str_column(catalog, "remark")):
+                pt = pt.upper()
+                if pt and pt not in rows:
+                    rows[pt] = (cat, rem)
+
+        def paired_of(pt: str) -> str:
+            return str((ik2ok if site_of(pt) == "IK" else ok2ik).get(pt, "") or "").strip().upper()
+
+        # Cross_Map에만 있는 part_type도 항목으로 (category/remark는 짝의 카탈로그 행에서)
+        for pt in [str(p).strip().upper() for p in list(ik2ok) + list(ok2ik)]:
+            if pt and pt not in rows:
+                rows[pt] = rows.get(paired_of(pt), ("", ""))
+
+        items = sorted(rows.items(), key=lambda kv: (len(kv[1][1]) or 999, len(kv[0]), kv[0]))
+        self.entries: List[Tuple[str, str, str, str, str]] = [
+            (pt, site_of(pt), paired_of(pt), cat, rem) for pt, (cat, rem) in items
+        ]
+
+        self._pt: Dict[str, List[int]] = {}
+        code_keys: List[tuple] = []                              # (키, 항목 id, 종류)
+        text_keys: List[tuple] = []                              # (키, 항목 id, 종류, 전체 여부)
+        self._grams: Dict[str, set] = {}
+        self._norm: List[Tuple[str, str]] = []                   # 항목별 (remark, category) 정규화
+        memo: Dict[str, tuple] = {}                              # 텍스트 → (정규화, 토큰, 3-gram) (category는 반복이 많음)
+
+        def analyze(text: str) -> tuple:
+            hit = memo.get(text)
+            if hit is None:
+                norm = normalize_label(text)
+                hit = memo[text] = (norm, [t for t in label_tokens(text) if t != norm],
+                                    {norm[j:j + 3] for j in range(len(norm) - 2)})
+            return hit
+
+        for i, (pt, _, paired, cat, rem) in enumerate(self.entries):
+            self._pt.setdefault(pt, []).append(i)
+            code_keys.append((pt, i, "part_type"))
+            if paired:
+                code_keys.append((paired, i, "paired"))
+            r, c = analyze(rem), analyze(cat)
+            self._norm.append((r[0], c[0]))
+            for field, (norm, tokens, grams) in (("remark", r), ("category", c)):
+                if not norm:
+                    continue
+                text_keys.append((norm, i, field, True))
+                text_keys.extend((t, i, field, False) for t in tokens)
+                for g in grams:
+                    self._grams.setdefault(g, set()).add(i)
+        code_keys.sort()
+        text_keys.sort()
+        self._code_keys = [k[0] for k in code_keys]
+        self._code_meta = [(k[1], k[2]) for k in code_keys]
+        self._text_keys = [k[0] for k in text_keys]
+        self._text_meta = [(k[1], k[2], k[3]) for k in text_keys]
+        self._pt_lens = sorted({len(pt) for pt in self._pt}, reverse=True)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def _range(keys: List[str], q: str) -> Iterable[int]:
+        lo = bisect.bisect_left(keys, q)
+        return range(lo, bisect.bisect_left(keys, q + "\uffff", lo))
+
+    def _candidates(self, query: str, limit: int, site: str | None = None) -> Dict[int, Tuple[float, str]]:
+        """
+        점수 후보 {항목 id: (점수, 일치 항목)}. site가 있으면 스캔 중에 걸러서
+        다른 site 항목이 스캔 상한(cap)을 채워 버리지 않게 함
+        """
+        cap = max(limit, 1) * SCAN_FACTOR
+        found: Dict[int, Tuple[float, str]] = {}
+
+        def put(i: int, score: float, field: str) -> bool:
+            if site and self.entries[i][1] != site:
+                return False
+            if found.get(i, (0.0,))[0] < score:
+                found[i] = (score, field)
+            return True
+
+        code = normalize_code(query)
+        if code:
+            for i in self._pt.get(code, ()):
+                put(i, SCORE_EXACT, "part_type")
+            n = 0
+            for j in self._range(self._code_keys, code):
+                i, kind = self._code_meta[j]
+                exact = self._code_keys[j] == code
+                n += put(i, SCORE_PAIRED if (exact and kind == "paired") else _SCORE_KIND[kind], kind)
+                if n >= cap:
+                    break
+            for L in self._pt_lens:                              # 11자리 등 긴 코드 → part_type 접두
+                if L < len(code):
+                    for i in self._pt.get(code[:L], ()):
+                        put(i, SCORE_CODE, "code")
+
+        text = normalize_label(query)
+        if text:
+            n = 0
+            for j in self._range(self._text_keys, text):
+                i, field, whole = self._text_meta[j]
+                n += put(i, SCORE_TEXT if whole else SCORE_TEXT - 0.1, field)
+                if n >= cap:
+                    break
+            if len(text) >= 3 and len(found) < limit:
+                grams = sorted((self._grams.get(text[j:j + 3], set()) for j in range(len(text) - 2)), key=len)
+                if grams and grams[0]:
+                    cand = grams[0].intersection(*grams[1:]) if len(grams) > 1 else grams[0]
+                    n = 0
+                    for i in sorted(cand):                       # id 순 = 짧은 remark 먼저
+                        if i in found:
+                            continue
+                        rem, cat = self._norm[i]
+                        if text in rem or text in cat:
+                            n += put(i, SCORE_SUBSTR, "remark" if text in rem else "category")
+                            if n >= cap:
+                                break
+        return found
+
+    def _tiebreak(self, i: int, field: str) -> tuple:
+        """동점 정렬: 코드로 걸린 항목은 짧은/사전순 part_type, 텍스트로 걸린 항목은 짧은 remark"""
+        pt = self.entries[i][0]
+        return (len(pt), pt) if field in ("part_type", "paired", "code") else (len(self.entries[i][4]), pt)
+
+    def suggest(self, query: str, limit: int = 10, site: str | None = None) -> List[CatalogHit]:
+        """
+        입력 중인 문자열 → 추천 part_type 목록 (점수 높은 순)
+        - part_type(V###, 4/5자리 KM) 완전/접두, 11자리 코드의 part_type, Cross_Map 짝 part_type,
+          remark / category 접두·토큰 접두·부분일치
+        - site: "IK"/"OK"로 제한 (후보 스캔 단계에서 거름)
+        """
+        if limit <= 0 or not query or not str(query).strip():
+            return []
+        site = (site or "").strip().upper() or None
+        found = self._candidates(str(query), limit, site)
+        ranked = sorted(found.items(), key=lambda kv: (-kv[1][0], self._tiebreak(kv[0], kv[1][1])))
+        out = []
+        for i, (score, field) in ranked:
+            pt, st, paired, cat, rem = self.entries[i]
+            out.append(CatalogHit(pt, st, paired, cat, rem, field, score))
+            if len(out) >= limit:
+                break
+        return out
+
+
+def build_catalog_index(catalog: pd.DataFrame | None,
+                        crossmap: Tuple[dict, dict] | None = None) -> CatalogIndex:
+    """part_master DataFrame + load_crossmap() 결과 → CatalogIndex"""
+    return CatalogIndex(catalog, crossmap)
@@ -0,0 +1,127 @@
+# utils/encoding.py
+# -*- coding: utf-8 -*-
+"""
+CSV 인코딩 판별 + 파일별 인코딩 매니페스트
+
+- sniff_encoding: 파일 앞부분(기본 64KB) 바이트만 보고 utf-8-sig / utf-8 / cp949 / latin1 판별
+  (sniff_bytes: 업로드 파일처럼 메모리에 있는 바이트용)
+- EncodingManifest: (경로, size, mtime_ns) → 인코딩 을 JSON으로 보관
+  → 같은 파일은 다음부터 판별 없이 올바른 코덱으로 한 번만 읽는다
+- transcode_to_utf8: 판별된 인코딩으로 디코딩 후 UTF-8(BOM)로 다시 저장
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict
+
+SAMPLE_SIZE = 64 * 1024
+
+# 판별 실패 시 순차 시도 목록 (cp949는 euc-kr의 상위집합)
+FALLBACK_ENCODINGS = ("utf-8", "utf-8-sig", "cp949", "euc-kr", "latin1")
+
+# 이 인코딩들은 "디코딩 성공 = 올바른 해석"이라 UTF-8 변환 대상 (latin1은 추측이라 제외)
+TRANSCODABLE = ("cp949", "euc-kr")
+
+
+def _decodes(sample: bytes, enc: str, final: bool) -> bool:
+    """샘플 끝에서 잘린 멀티바이트 문자는 허용(증분 디코더, final=False)"""
+    try:
+        codecs.getincrementaldecoder(enc)("strict").decode(sample, final=final)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def sniff_encoding(path, sample_size: int = SAMPLE_SIZE) -> str:
+    """앞부분 바이트로 인코딩 판별: BOM → utf-8 → cp949 → latin1"""
+    with open(path, "rb") as f:
+        sample = f.read(sample_size)
+    return sniff_bytes(sample, len(sample) < sample_size, sample_size)   # 파일 전체를 읽었으면 끝 잘림 없음
+
+
+def sniff_bytes(data: bytes, final: bool = True, sample_size: int = SAMPLE_SIZE) -> str:
+    """메모리 바이트(업로드 파일 등)의 인코딩 판별 — sniff_encoding과 같은 규칙
+    - final=False면 끝에서 잘린 멀티바이트 문자 허용 (앞부분 샘플만 넘길 때)
+    """
+    sample = data[:sample_size]
+    final = final and len(data) <= sample_size
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if _decodes(sample, "utf-8", final):
+        return "utf-8"
+    if _decodes(sample, "cp949", final):
+        return "cp949"
+    return "latin1"
+
+
+class EncodingManifest:
+    """(경로, size, mtime_ns) → 인코딩. 파일이 바뀌면(size/mtime) 항목은 자동 무효"""
+
+    def __init__(self, path: Path | None):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._data: Dict[str, dict] = {}
+        if self.path and self.path.exists():
+            try:
+                self._data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._data = {}
+
+    @staticmethod
+    def _stat(p: Path):
+        st = os.stat(p)
+        return st.st_size, st.st_mtime_ns
+
+    def get(self, p: Path) -> str | None:
+        ent = self._data.get(str(Path(p).resolve()))
+        if not ent:
+            return None
+        try:
+            size, mtime = self._stat(p)
+        except OSError:
+            return None
+        if ent.get("size") != size or ent.get("mtime_ns") != mtime:
+            return None
+        return ent.get("encoding")
+
+    def put(self, p: Path, encoding: str) -> None:
+        try:
+            size, mtime = self._stat(p)
+        except OSError:
+            return
+        with self._lock:
+            self._data[str(Path(p).resolve())] = {"size": size, "mtime_ns": mtime, "encoding": encoding}
+            self._save()
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(self._data, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass   # 읽기 전용 볼륨이면 메모리에만 유지
+
+
+def transcode_to_utf8(path, encoding: str) -> bool:
+    """path를 encoding으로 디코딩해 UTF-8(BOM, 엑셀 호환)로 다시 저장. 성공 시 True"""
+    p = Path(path)
+    tmp = p.with_name(f"{p.name}.{os.getpid()}.utf8.tmp")
+    try:
+        text = p.read_bytes().decode(encoding)
+        tmp.write_bytes(codecs.BOM_UTF8 + text.encode("utf-8"))
+        os.replace(tmp, p)
+        return True
+    except (OSError, UnicodeError):
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
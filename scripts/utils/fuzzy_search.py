@@ -0,0 +1,292 @@
+# utils/fuzzy_search.py
+# -*- coding: utf-8 -*-
+"""
+오타/띄어쓰기에 강한 유사 검색 색인 (part_master remark·category + lookup 라벨)
+
+- 문자열 정규화: NFKC + 소문자 + 한글 음절을 자모로 분해 (볼트 → ㅂㅗㄹㅌㅡ)
+  → '볼투', '볼 트', 'BOLT'/'bolt' 처럼 한두 글자 틀리거나 띄어쓰기가 달라도 bigram 대부분이 겹침
+  (jamo=False 면 음절 단위 bigram)
+- 검색 단위(unit) = 문구 전체 + 토큰 (같은 문자열은 1개로 합치고 여러 항목이 공유)
+- 역색인: bigram → unit id 배열 (numpy). 질의 bigram의 목록만 이어 붙여 겹친 개수 계산
+  점수 = (Dice 계수 + 질의 포함률) / 2  → 완전일치 1.0, 질의가 긴 문구 안에 통째로 있으면 0.5 이상
+        Dice = 2·겹침 / (질의 bigram 수 + unit bigram 수), 포함률 = 겹침 / 질의 bigram 수
+  비용은 질의 bigram 목록 길이 합에 비례 (카탈로그 전체를 훑지 않음)
+- site / category / kind 필터: unit별 허용 여부를 배열로 걸러낸 뒤 항목으로 펼침
+  · 공통('*') 라벨은 모든 site·category에 통과
+  · IK 그룹(V11) 라벨은 그 그룹 part_type들의 category에 속함
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.prefix_index import ik_group_key, site_of, str_column
+
+KINDS = ("remark", "category", "label")
+MIN_SCORE = 0.4         # 이 점수 미만은 버림
+GRAM_N = 2
+SCAN_FACTOR = 8         # 점수 상위 limit × SCAN_FACTOR 개 unit만 먼저 정렬
+
+_SITE_BIT = {"IK": 1, "OK": 2}
+_KEEP = re.compile(r"[^0-9a-z가-힣ㄱ-ㆎ]+")
+
+
+# ---------------------------------------------------------------------
+# 0) 정규화 (한글 자모 분해)
+# ---------------------------------------------------------------------
+def _compat_jamo_map() -> Dict[str, str]:
+    """조합형 자모(초성/중성/종성, U+1100~) → 호환 자모(ㄱ, ㅏ …) 위치 무관 매핑"""
+    out = {}
+    for cp in range(0x1100, 0x1200):
+        name = unicodedata.name(chr(cp), "")
+        for part in ("CHOSEONG ", "JUNGSEONG ", "JONGSEONG "):
+            if part in name:
+                try:
+                    out[chr(cp)] = unicodedata.lookup("HANGUL LETTER " + name.split(part, 1)[1])
+                except KeyError:
+                    pass
+    return out
+
+_JAMO = str.maketrans(_compat_jamo_map())
+
+
+def fuzzy_key(text, jamo: bool = True) -> str:
+    """
+    유사 비교용 문자열: 'Zn-Plating ' → 'znplating', '육각 볼트' → 'ㅇㅠㄱㄱㅏㄱㅂㅗㄹㅌㅡ'
+    - 입력 중인 낱자모('볼ㅌ')도 같은 자모로 맞춰짐
+    """
+    s = unicodedata.normalize("NFKC", str(text or "")).lower()
+    if jamo:
+        s = unicodedata.normalize("NFD", s).translate(_JAMO)
+    return _KEEP.sub("", s)
+
+def _fuzzy_tokens(text, jamo: bool = True) -> List[str]:
+    s = unicodedata.normalize("NFKC", str(text or "")).lower()
+    return [k for t in re.split(r"[\s\-_/,()\[\]]+", s) if (k := fuzzy_key(t, jamo))]
+
+def _grams(key: str) -> set:
+    """앞뒤 경계를 붙인 bigram 집합 ('ab' → {'\\x02a', 'ab', 'b\\x03'})"""
+    s = "\x02" + key + "\x03"
+    return {s[i:i + GRAM_N] for i in range(len(s) - GRAM_N + 1)}
+
+
+# ---------------------------------------------------------------------
+# 1) 색인
+# ---------------------------------------------------------------------
+class FuzzyHit(NamedTuple):
+    kind: str           # remark / category / label
+    text: str           # 원문 (품명 / 대분류 / 라벨)
+    part_type: str      # remark·label의 part_type ('*' = 공통 라벨, category = "")
+    site: str           # "IK" / "OK" / "" (공통 라벨, 양쪽에 있는 대분류)
+    category: str       # label은 part_type이 카탈로그에 있을 때만
+    table: str          # label만: lookup 테이블
+    code: str           # label만: lookup 코드
+    score: float
+
+
+class FuzzyIndex:
+    """remark / category / lookup 라벨 n-gram(자모) 역색인 (불변, 원본이 바뀌면 새로 만들어 교체)"""
+
+    def __init__(self, catalog: pd.DataFrame | None, tables: Dict[str, dict] | None = None,
+                 jamo: bool = True):
+        self.jamo = jamo
+        # 항목: (kind, text, part_type, site, category, table, code)
+        self.docs: List[Tuple[str, str, str, str, str, str, str]] = []
+        doc_sites: List[int] = []                                # 1=IK 2=OK 3=공통
+        doc_cats: List[frozenset | None] = []                    # None = 모든 category
+
+        pt_cat: Dict[str, str] = {}
+        cat_doc: Dict[str, int] = {}                             # 대분류 → 항목 id (site 무관 1개)
+        seen = set()
+        if catalog is not None and len(catalog):
+            for pt, cat, rem in zip(str_column(catalog, "part_type"), str_column(catalog, "category"),
+                                    str_column(catalog, "remark")):
+                pt = pt.upper()
+                if not pt:
+                    continue
+                site = site_of(pt)
+                pt_cat.setdefault(pt, cat)
+                if rem and (pt, rem) not in seen:
+                    seen.add((pt, rem))
+                    self.docs.append(("remark", rem, pt, site, cat, "", ""))
+                    doc_sites.append(_SITE_BIT[site])
+                    doc_cats.append(frozenset([cat]))
+                if cat and cat not in cat_doc:
+                    cat_doc[cat] = len(self.docs)
+                    self.docs.append(("category", cat, "", site, cat, "", ""))
+                    doc_sites.append(0)
+                    doc_cats.append(frozenset([cat]))
+                if cat:
+                    doc_sites[cat_doc[cat]] |= _SITE_BIT[site]
+        for cat, i in cat_doc.items():                           # 양쪽 site에 있는 대분류는 site ""
+            if doc_sites[i] == 3:
+                self.docs[i] = self.docs[i][:3] + ("",) + self.docs[i][4:]
+
+        group_cats: Dict[str, set] = {}
+        for pt, cat in pt_cat.items():
+            if site_of(pt) == "IK":
+                group_cats.setdefault(ik_group_key(pt), set()).add(cat)
+
+        def add_label(table: str, pt: str, code: str, label: str):
+            pt = str(pt).strip().upper()
+            if not str(label).strip():
+                return
+            common = pt in ("", "*")
+            cats = None if common else frozenset(group_cats.get(pt) or [pt_cat.get(pt, "")])
+            self.docs.append(("label", str(label), "*" if common else pt, "" if common else site_of(pt),
+                              "" if common else pt_cat.get(pt, ""), table, str(code)))
+            doc_sites.append(3 if common else _SITE_BIT[site_of(pt)])
+            doc_cats.append(cats)
+
+        for table, obj in (tables or {}).items():
+            for (pt, code), label in obj.get("spec", {}).items():
+                add_label(table, pt, code, label)
+            for code, label in obj.get("common", {}).items():
+                add_label(table, "*", code, label)
+
+        # unit (문구 전체 + 토큰, 같은 문자열 공유) → 항목 id
+        unit_id: Dict[str, int] = {}
+        unit_docs: List[List[int]] = []
+        memo: Dict[str, List[str]] = {}
+        for i, (_, text, *_rest) in enumerate(self.docs):
+            keys = memo.get(text)
+            if keys is None:
+                whole = fuzzy_key(text, jamo)
+                keys = memo[text] = list(dict.fromkeys([whole] + _fuzzy_tokens(text, jamo))) if whole else []
+            for k in keys:
+                u = unit_id.get(k)
+                if u is None:
+                    u = unit_id[k] = len(unit_docs)
+                    unit_docs.append([])
+                unit_docs[u].append(i)
+
+        gram_id: Dict[str, int] = {}
+        postings: List[List[int]] = []
+        unit_len = np.zeros(len(unit_docs), dtype=np.int32)
+        for k, u in unit_id.items():
+            gs = _grams(k)
+            unit_len[u] = len(gs)
+            for g in gs:
+                gid = gram_id.get(g)
+                if gid is None:
+                    gid = gram_id[g] = len(postings)
+                    postings.append([])
+                postings[gid].append(u)
+        self._gram_id = gram_id
+        self._postings = [np.asarray(p, dtype=np.int32) for p in postings]
+        self._unit_len = unit_len
+
+        # 필터 정보: 항목별 kind/site 비트, unit별 비트 합, category → 항목/unit id 배열
+        kind_bit = {k: 1 << j for j, k in enumerate(KINDS)}
+        unit_kind = [0] * len(unit_docs)
+        unit_site = [0] * len(unit_docs)
+        cat_docs: Dict[str, set] = {}
+        cat_units: Dict[str, set] = {}
+        wild_docs = [i for i, cats in enumerate(doc_cats) if cats is None]
+        wild_units = set()
+        for u, ds in enumerate(unit_docs):
+            for i in ds:
+                unit_kind[u] |= kind_bit[self.docs[i][0]]
+                unit_site[u] |= doc_sites[i]
+                if doc_cats[i] is None:
+                    wild_units.add(u)
+                else:
+                    for c in doc_cats[i]:
+                        cat_docs.setdefault(c, set()).add(i)
+                        cat_units.setdefault(c, set()).add(u)
+        self._kind_bit = kind_bit
+        self._unit_docs = [np.asarray(ds, dtype=np.int32) for ds in unit_docs]
+        self._unit_kind = np.asarray(unit_kind, dtype=np.int8)
+        self._unit_site = np.asarray(unit_site, dtype=np.int8)
+        self._doc_kind = np.asarray([kind_bit[d[0]] for d in self.docs], dtype=np.int8)
+        self._doc_site = np.asarray(doc_sites, dtype=np.int8)
+        self._cat_docs = {c: np.asarray(sorted(ds.union(wild_docs)), dtype=np.int32) for c, ds in cat_docs.items()}
+        self._cat_units = {c: np.asarray(sorted(us | wild_units), dtype=np.int32) for c, us in cat_units.items()}
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _doc_mask(self, kinds: int, site: int, category: str | None) -> np.ndarray | None:
+        """필터를 통과하는 항목 bool 배열 (필터가 없으면 None)"""
+        if kinds == (1 << len(KINDS)) - 1 and not site and category is None:
+            return None
+        mask = (self._doc_kind & kinds) != 0
+        if site:
+            mask &= (self._doc_site & site) != 0
+        if category is not None:
+            in_cat = np.zeros(len(self.docs), dtype=bool)
+            in_cat[self._cat_docs.get(category, [])] = True
+            mask &= in_cat
+        return mask
+
+    def search(self, query: str, limit: int = 10, site: str | None = None, category: str | None = None,
+               kinds: Iterable[str] | None = None, min_score: float = MIN_SCORE) -> List[FuzzyHit]:
+        """
+        유사 검색 (점수 높은 순, 동점은 짧은 문구 우선)
+        - site: "IK"/"OK"로 제한 (공통 라벨은 포함)
+        - category: 대분류로 제한 (공통 라벨은 포함)
+        - kinds: ("remark", "category", "label") 중 일부만
+        """
+        key = fuzzy_key(query, self.jamo)
+        kbits = sum(self._kind_bit[k] for k in set(KINDS if kinds is None else kinds) if k in self._kind_bit)
+        if not key or limit <= 0 or not kbits:
+            return []
+        qgrams = _grams(key)
+        lists = [self._postings[g] for g in (self._gram_id.get(x) for x in qgrams) if g is not None]
+        if not lists:
+            return []
+        q = len(qgrams)
+        # 점수 하한을 넘을 수 있는 최소 겹침 (unit bigram 수 ≥ 겹침이므로 점수 ≤ o/(q+o) + o/2q)
+        need = next((o for o in range(1, q + 1) if o / (q + o) + 0.5 * o / q >= min_score), q)
+        counts = np.bincount(np.concatenate(lists), minlength=len(self._unit_docs))
+        units = np.flatnonzero(counts >= need)
+        overlap = counts[units]
+
+        sbit = _SITE_BIT.get((site or "").strip().upper(), 0)
+        category = (category or "").strip() or None
+        keep = (self._unit_kind[units] & kbits) != 0
+        if sbit:
+            keep &= (self._unit_site[units] & sbit) != 0
+        if category is not None:
+            keep &= np.isin(units, self._cat_units.get(category, np.empty(0, dtype=np.int32)))
+        scores = overlap / (q + self._unit_len[units]) + 0.5 * overlap / q
+        keep &= scores >= min_score
+        units, scores = units[keep], scores[keep]
+
+        # 상위 후보만 정렬 (항목 필터로 모자라면 나머지도 정렬해 이어서)
+        cap = limit * SCAN_FACTOR
+        def parts():
+            if len(units) <= cap:
+                yield np.arange(len(units))
+                return
+            split = np.argpartition(-scores, cap)
+            yield split[:cap]
+            yield split[cap:]
+        doc_mask = self._doc_mask(kbits, sbit, category)
+        out: List[FuzzyHit] = []
+        taken = set()
+        for part in parts():
+            for j in part[np.lexsort((self._unit_len[units[part]], -scores[part]))]:
+                sc = round(float(scores[j]), 4)
+                ds = self._unit_docs[units[j]]
+                if doc_mask is not None:
+                    ds = ds[doc_mask[ds]]
+                for i in ds.tolist():
+                    if i in taken:
+                        continue
+                    taken.add(i)
+                    out.append(FuzzyHit(*self.docs[i], sc))
+                    if len(out) >= limit:
+                        return out
+        return out
+
+
+def build_fuzzy_index(catalog: pd.DataFrame | None, tables: Dict[str, dict] | None = None,
+                      jamo: bool = True) -> FuzzyIndex:
+    """part_master DataFrame + load_lookups() 결과 → FuzzyIndex"""
+    return FuzzyIndex(catalog, tables, jamo)
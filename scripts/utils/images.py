@@ -1,50 +1,214 @@
 # utils/images.py
-from pathlib import Path
+# -*- coding: utf-8 -*-
+"""
+이미지 매니페스트 (images/IK, images/OK 디렉토리 색인)
+
+- 사이트 디렉토리를 한 번 훑어 메모리 색인을 만들고, 이후 조회는 디렉토리 스캔 없이 dict/트라이만 본다
+  · 폴더형 : images/<SITE>/<code>/*.{ext}
+  · 정확   : images/<SITE>/<code>.{ext}
+  · 번호형 : images/<SITE>/<code>_N.{ext}  (기존 glob '<code>_*' 와 같게, 파일명의 '_' 앞 접두마다 키 등록)
+  · 접두   : 키 트라이 → part_code의 가장 긴 접두 키 (공유 이미지, 예: V111 → V11_*.jpg)
+- 변경 감지: 사이트 디렉토리와 폴더형 하위 디렉토리의 mtime만 stat (CHECK_INTERVAL 초에 한 번)
+  → 바뀌었으면 해당 사이트만 다시 훑어 통째로 교체 (네트워크 마운트에서도 조회당 스캔 없음)
+"""
+
+from __future__ import annotations
+
+import os
 import re
-from typing import List, Union
-import streamlit as st
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
 
 IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".bmp", ".gif"}
 
+# 변경 확인 간격(초). 0이면 조회마다 확인
+CHECK_INTERVAL = float(os.environ.get("VCODE_IMAGE_CHECK_INTERVAL", "5") or 0)
+
+_END = "\0"   # 트라이 종단 표시
+
+
 def _natural_key(p: Union[str, Path]):
     s = Path(p).stem
     return [int(t) if t.isdigit() else t.lower() for t in re.split(r"(\d+)", s)]
 
-@st.cache_data(show_spinner=False)
+
+def _sort_key(p: Path):
+    return (_natural_key(p), p.name)
+
+
+def _mtime(path: Path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _image_files(d: Path) -> List[Path]:
+    """디렉토리 바로 아래 이미지 파일 (하위 폴더 제외)"""
+    out = []
+    try:
+        with os.scandir(d) as it:
+            for e in it:
+                if os.path.splitext(e.name)[1].lower() in IMAGE_EXTS and e.is_file():
+                    out.append(Path(e.path))
+    except OSError:
+        pass
+    return out
+
+
+class _SiteIndex:
+    """사이트 디렉토리 1개의 스냅샷 색인 (불변, 바뀌면 새로 만들어 교체)"""
+
+    def __init__(self, root: Path, folders: bool = True):
+        self.root = root
+        self.stamps: Dict[Path, int | None] = {root: _mtime(root)}
+        self.files: List[Path] = []                    # root 바로 아래 이미지 (이름순)
+        self.images: Dict[str, Tuple[Path, ...]] = {}  # key → 폴더형 > 정확 > 번호형 (각각 자연 정렬)
+        self._trie: dict = {}
+
+        folder_map: Dict[str, List[Path]] = {}
+        exact: Dict[str, List[Path]] = {}
+        numbered: Dict[str, List[Path]] = {}
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            entries = []
+        for e in entries:
+            name = e.name
+            if folders and e.is_dir():
+                sub = Path(e.path)
+                self.stamps[sub] = _mtime(sub)
+                imgs = _image_files(sub)
+                if imgs:
+                    folder_map[name] = sorted(imgs, key=_sort_key)
+                continue
+            stem, ext = os.path.splitext(name)
+            if ext.lower() not in IMAGE_EXTS or not e.is_file():
+                continue
+            p = Path(e.path)
+            self.files.append(p)
+            exact.setdefault(stem, []).append(p)
+            i = stem.find("_")
+            while i >= 0:
+                numbered.setdefault(stem[:i], []).append(p)
+                i = stem.find("_", i + 1)
+        self.files.sort()
+
+        for key in folder_map.keys() | exact.keys() | numbered.keys():
+            self.images[key] = tuple(
+                folder_map.get(key, [])
+                + sorted(exact.get(key, []), key=_sort_key)
+                + sorted(numbered.get(key, []), key=_sort_key)
+            )
+            node = self._trie
+            for ch in key:
+                node = node.setdefault(ch, {})
+            node[_END] = key
+
+    def changed(self) -> bool:
+        """색인을 만든 뒤 root 또는 폴더형 하위 디렉토리가 바뀌었는지 (mtime stat만)"""
+        if _mtime(self.root) != self.stamps[self.root]:
+            return True
+        return any(_mtime(d) != m for d, m in self.stamps.items() if d != self.root)
+
+    def prefix_keys(self, code: str, min_len: int = 1) -> List[str]:
+        """code의 접두이면서 이미지가 있는 키, 긴 것부터 (min_len 글자 이상)"""
+        hits = []
+        node = self._trie
+        for ch in code:
+            node = node.get(ch)
+            if node is None:
+                break
+            key = node.get(_END)
+            if key is not None and len(key) >= min_len:
+                hits.append(key)
+        hits.reverse()
+        return hits
+
+
+class ImageManifest:
+    """images/ 아래 사이트별 색인. 사이트는 처음 조회할 때 훑고, CHECK_INTERVAL마다 변경 확인"""
+
+    def __init__(self, base_dir: Union[str, Path] = "images", check_interval: float | None = None):
+        self.base = Path(base_dir)
+        self.check_interval = CHECK_INTERVAL if check_interval is None else check_interval
+        self._sites: Dict[str, Tuple[_SiteIndex, float]] = {}   # site → (색인, 마지막 확인 시각)
+        self._lock = threading.Lock()
+
+    def site(self, site: str) -> _SiteIndex:
+        """site("IK"/"OK") 색인. ""이면 base 디렉토리 자체(폴더형 없이)"""
+        site = (site or "").strip()
+        now = time.monotonic()
+        hit = self._sites.get(site)
+        if hit is not None and now - hit[1] < self.check_interval:
+            return hit[0]
+        with self._lock:
+            hit = self._sites.get(site)
+            if hit is None or hit[0].changed():
+                idx = _SiteIndex(self.base / site if site else self.base, folders=bool(site))
+            else:
+                idx = hit[0]
+            self._sites[site] = (idx, time.monotonic())
+            return idx
+
+    def refresh(self) -> None:
+        """다음 조회 때 모든 사이트를 다시 훑도록 색인 폐기"""
+        with self._lock:
+            self._sites.clear()
+
+    def images(self, site: str, part_code: str) -> Tuple[Path, ...]:
+        """part_code 자체의 이미지 (폴더형 > 정확 > 번호형)"""
+        return self.site(site).images.get((part_code or "").strip(), ())
+
+    def images_with_prefix_fallback(self, site: str, part_code: str,
+                                    min_prefix_len: int = 3) -> Tuple[Tuple[Path, ...], str | None]:
+        """개별 이미지가 없으면 가장 긴 접두 키의 공유 이미지 → (이미지, 사용한 키)"""
+        code = (part_code or "").strip()
+        idx = self.site(site)
+        for key in idx.prefix_keys(code, min_len=min(max(1, min_prefix_len), len(code) or 1)):
+            imgs = idx.images.get(key)
+            if imgs:
+                return imgs, key
+        return (), None
+
+
+_MANIFESTS: Dict[str, ImageManifest] = {}
+_MANIFEST_LOCK = threading.Lock()
+
+
+def image_manifest(base_dir: Union[str, Path] = "images") -> ImageManifest:
+    """base_dir(절대경로 기준)별 프로세스 공유 매니페스트"""
+    k = os.path.abspath(base_dir)
+    m = _MANIFESTS.get(k)
+    if m is None:
+        with _MANIFEST_LOCK:
+            m = _MANIFESTS.setdefault(k, ImageManifest(k))
+    return m
+
+
 def find_images(
     part_code: str,
     site: str,
     base_dir: Union[str, Path] = "images",
     max_n: int = 5,
 ) -> List[Path]:
-    part_code = (part_code or "").strip()  # 공백 제거
-    site = (site or "").strip()
-    base = Path(base_dir)
-    candidates: List[Path] = []
-
-    # 1) 폴더형(있으면 우선)
-    folder = base / site / part_code
-    if folder.exists() and folder.is_dir():
-        for p in sorted(folder.iterdir(), key=_natural_key):
-            if p.suffix.lower() in IMAGE_EXTS:
-                candidates.append(p)
-
-    # 2) 파일형: images/<SITE>/<PART_CODE>_*.{ext}
-    if len(candidates) < max_n:
-        pattern_dir = base / site
-        if pattern_dir.exists():
-            # 확장자별로 글롭
-            for ext in IMAGE_EXTS:
-                for p in sorted(pattern_dir.glob(f"{part_code}_*{ext}"), key=_natural_key):
-                    candidates.append(p)
-
-    # 중복 제거 & 상한
-    uniq, seen = [], set()
-    for p in candidates:
-        if p not in seen and p.exists():
-            uniq.append(p)
-            seen.add(p)
-        if len(uniq) >= max_n:
-            break
-
-    return uniq
+    """images/<SITE>/ 에서 part_code 이미지 (폴더형 우선, 최대 max_n장)"""
+    return list(image_manifest(base_dir).images(site, part_code)[:max_n])
+
+
+def find_images_with_prefix_fallback(
+    part_code: str,
+    site: str,
+    base_dir: Union[str, Path] = "images",
+    max_n: int = 5,
+    min_prefix_len: int = 3,
+) -> Tuple[List[Path], str | None]:
+    """
+    개별 품번 이미지 > 접두 공통 이미지 (예: V113 → V11_*.jpg)
+    - 접두는 min_prefix_len 글자 이상인 것 중 가장 긴 것
+    - 반환: (이미지 경로 목록, 사용한 키 — 개별이면 part_code, 없으면 None)
+    """
+    imgs, key = image_manifest(base_dir).images_with_prefix_fallback(site, part_code, min_prefix_len)
+    return list(imgs[:max_n]), key
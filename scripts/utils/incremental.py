@@ -0,0 +1,326 @@
+# utils/incremental.py
+# -*- coding: utf-8 -*-
+"""
+parsed_parts / matched_parts 증분 재빌드 (입력 지문 기반)
+
+출력 행마다 "그 행을 만든 입력"의 지문(64bit 해시)을 상태 파일에 보관하고,
+다시 돌릴 때 지문이 바뀐 행만 새로 계산해 기존 출력에 덮어 쓴다.
+
+- parsed_parts 행 지문 = part_master 행 내용
+                      + 해석된 스키마 규칙(속성, 룩업테이블)
+                      + 그 part_type에서 쓰이는 룩업 행(코드, 라벨)
+- matched_parts 지문   = parsed_parts IK 행 내용
+                      + 첫 매칭 Cross_Map 규칙 행
+                      + Join 되는 OK 행(part_type, remark)
+- 행 키 = system|part_type|같은 part_type 내 순번 (matched는 IK 행 키 1개에 출력 여러 행 가능)
+- 변경 요약(<출력>.changes.csv): key, change(added / changed / removed)
+- 상태: <출력 폴더>/.snapshot/<출력 파일명>.state.pkl  (없거나 형식이 다르면 전체 재계산)
+
+직접 실행(scripts/ 에서):
+    python -m utils.incremental                 # parse → match 순서로 증분 재빌드
+    python -m utils.incremental --force         # 전체 재계산
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from utils.lookups import resolve_options
+from utils.parsers import (
+    default_paths, load_inputs, normalize_master, parse_parts, parsed_columns, resolve_schema_combos,
+)
+
+STATE_FORMAT = 1
+
+
+# ---------------------------------------------------------------------
+# 지문 / 상태
+# ---------------------------------------------------------------------
+def _h64(obj) -> int:
+    """임의 파이썬 값(repr) → 부호 없는 64bit 해시"""
+    return int.from_bytes(hashlib.blake2b(repr(obj).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _row_hash(frame: pd.DataFrame) -> np.ndarray:
+    """행 내용 해시 (uint64, 컬럼 순서/값 기준)"""
+    if frame.empty:
+        return np.zeros(0, dtype=np.uint64)
+    return pd.util.hash_pandas_object(frame.astype(object), index=False).to_numpy(dtype=np.uint64)
+
+
+def _combine(*cols: np.ndarray) -> np.ndarray:
+    """같은 길이의 uint64 해시 열 여러 개 → 행별 해시 1개"""
+    if not len(cols[0]):
+        return np.zeros(0, dtype=np.uint64)
+    frame = pd.DataFrame({f"h{i}": c for i, c in enumerate(cols)})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+def row_keys(frame: pd.DataFrame) -> np.ndarray:
+    """system|part_type|순번 (같은 part_type 행이 여러 개면 등장 순서로 구분)"""
+    system = frame["system"].fillna("").astype(str)
+    pt = frame["part_type"].fillna("").astype(str)
+    nth = pt.groupby([system, pt], sort=False).cumcount().astype(str)
+    return (system + "|" + pt + "|" + nth).to_numpy(dtype=object)
+
+
+def state_path_for(out_path: Path) -> Path:
+    out_path = Path(out_path)
+    return out_path.parent / ".snapshot" / f"{out_path.name}.state.pkl"
+
+
+def _load_state(path: Path, kind: str) -> dict | None:
+    try:
+        with open(path, "rb") as f:
+            st = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(st, dict) or st.get("format") != STATE_FORMAT or st.get("kind") != kind:
+        return None
+    return st
+
+
+def _save_state(path: Path, state: dict) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump({"format": STATE_FORMAT, **state}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _write_csv(df: pd.DataFrame, path: Path, encoding: str) -> None:
+    """임시 파일에 쓴 뒤 교체 (앱이 반쯤 쓴 파일을 읽지 않도록)"""
+    tmp = Path(path).with_name(f"{Path(path).name}.{os.getpid()}.tmp")
+    df.to_csv(tmp, index=False, encoding=encoding)
+    os.replace(tmp, path)
+
+
+def _read_prev_output(path: Path, encoding: str, n_rows: int, columns: List[str]) -> pd.DataFrame | None:
+    """이전 출력을 문자열 그대로(NA 변환 없이) 읽음. 행 수/컬럼이 상태와 다르면 None"""
+    try:
+        prev = pd.read_csv(path, dtype=str, encoding=encoding, keep_default_na=False, na_filter=False)
+    except (OSError, ValueError, UnicodeDecodeError):
+        return None
+    if len(prev) != n_rows or list(prev.columns) != list(columns):
+        return None
+    return prev
+
+
+# ---------------------------------------------------------------------
+# 변경 요약
+# ---------------------------------------------------------------------
+class ChangeSummary:
+    """증분 재빌드 결과: 키별 added / changed / removed"""
+
+    def __init__(self, name: str, keys: np.ndarray, fps: np.ndarray, prev: dict | None):
+        self.name = name
+        old = dict(zip(prev["keys"], prev["fps"])) if prev else {}
+        self.added: List[str] = []
+        self.changed: List[str] = []
+        for k, fp in zip(keys, fps):
+            was = old.get(k)
+            if was is None:
+                self.added.append(k)
+            elif was != fp:
+                self.changed.append(k)
+        current = set(keys)
+        self.removed: List[str] = [k for k in old if k not in current]
+        self.full = False          # True면 이전 출력을 쓰지 못해 전체 재계산
+
+    @property
+    def recompute(self) -> set:
+        return set(self.added) | set(self.changed)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "key": self.added + self.changed + self.removed,
+            "change": ["added"] * len(self.added) + ["changed"] * len(self.changed)
+                      + ["removed"] * len(self.removed),
+        })
+
+    def write(self, out_path: Path, encoding: str) -> Path:
+        path = Path(out_path).with_name(Path(out_path).stem + ".changes.csv")
+        self.to_frame().to_csv(path, index=False, encoding=encoding)
+        return path
+
+    def __repr__(self) -> str:
+        mode = " (full)" if self.full else ""
+        return (f"{self.name}: added={len(self.added)} changed={len(self.changed)} "
+                f"removed={len(self.removed)}{mode}")
+
+
+def _patch(keys: np.ndarray, recompute_mask: np.ndarray, fresh: pd.DataFrame, fresh_keys: np.ndarray,
+           prev_out: pd.DataFrame, prev_keys: np.ndarray, columns: List[str]):
+    """
+    현재 키 순서대로 출력 재조립: 다시 계산한 키는 fresh 행, 나머지는 이전 출력 행 재사용
+    (키 1개에 여러 행일 수 있으며, 키 내부 행 순서는 보존)
+    반환: (출력 프레임, 출력 행별 키)
+    """
+    order = {k: i for i, k in enumerate(keys)}
+    keep_keys = set(np.asarray(keys, dtype=object)[~recompute_mask])
+    reuse = np.fromiter((k in keep_keys for k in prev_keys), dtype=bool, count=len(prev_keys))
+    old_part = prev_out.loc[reuse, columns]
+    new_part = fresh[columns] if len(fresh) else fresh.reindex(columns=columns)
+    pos = np.concatenate([
+        np.fromiter((order[k] for k in np.asarray(prev_keys, dtype=object)[reuse]), dtype=np.int64),
+        np.fromiter((order[k] for k in fresh_keys), dtype=np.int64, count=len(fresh_keys)),
+    ])
+    merged = pd.concat([old_part, new_part], ignore_index=True)
+    idx = np.argsort(pos, kind="stable")       # 같은 키 안에서는 원래 순서 유지
+    out = merged.iloc[idx].reset_index(drop=True)
+    out_keys = np.concatenate([np.asarray(prev_keys, dtype=object)[reuse],
+                               np.asarray(fresh_keys, dtype=object)])[idx]
+    return out, out_keys
+
+
+# ---------------------------------------------------------------------
+# parsed_parts
+# ---------------------------------------------------------------------
+def parsed_fingerprints(part_master: pd.DataFrame, schemas: Dict[str, pd.DataFrame],
+                        lookups: Dict[str, dict]):
+    """(행 키, 행 지문, 출력 컬럼) — 지문은 조합(system, part_type)별로 한 번만 계산"""
+    pm = normalize_master(part_master)
+    codes, combos = resolve_schema_combos(pm, schemas)
+    combo_fp = np.empty(len(combos), dtype=np.uint64)
+    for i, (system, ptype, keys, rules) in enumerate(combos):
+        used = []
+        for attr, table in (rules or ()):
+            if table in lookups:
+                used.append((table, sorted(resolve_options(lookups[table], ptype).items())))
+        combo_fp[i] = _h64((system, ptype, keys, rules, used))
+    fps = _combine(_row_hash(part_master), combo_fp[codes]) if len(pm) else np.zeros(0, dtype=np.uint64)
+    columns = list(pm.columns) + parsed_columns(combos)
+    return row_keys(pm), fps, columns
+
+
+def rebuild_parsed(paths: Dict[str, Path] | None = None, encoding: str = "cp949",
+                   force: bool = False) -> ChangeSummary:
+    """part_master → parsed_parts.csv 증분 재빌드 (지문이 바뀐 행만 parse_parts 재실행)"""
+    paths = paths or default_paths()
+    out_path = Path(paths["out"])
+    spath = state_path_for(out_path)
+    pm_raw, schemas, lookups = load_inputs(paths)
+    pm_raw = pm_raw.reset_index(drop=True)
+
+    keys, fps, columns = parsed_fingerprints(pm_raw, schemas, lookups)
+    prev = None if force else _load_state(spath, "parsed")
+    summary = ChangeSummary("parsed_parts", keys, fps, prev)
+
+    prev_out = None
+    if prev is not None and prev.get("columns") == columns and out_path.exists():
+        prev_out = _read_prev_output(out_path, encoding, len(prev["row_keys"]), columns)
+
+    if prev_out is None:
+        summary.full = True
+        out = parse_parts(pm_raw, schemas, lookups)
+    else:
+        mask = np.fromiter((k in summary.recompute for k in keys), dtype=bool, count=len(keys))
+        fresh = parse_parts(pm_raw[mask], schemas, lookups) if mask.any() else pd.DataFrame(columns=columns)
+        out, _ = _patch(keys, mask, fresh.reindex(columns=columns), keys[mask],
+                        prev_out, prev["row_keys"], columns)
+
+    _write_csv(out, out_path, encoding)
+    _save_state(spath, {"kind": "parsed", "keys": keys, "fps": fps, "row_keys": keys, "columns": columns})
+    summary.write(out_path, encoding)
+    return summary
+
+
+# ---------------------------------------------------------------------
+# matched_parts
+# ---------------------------------------------------------------------
+def matched_fingerprints(parts: pd.DataFrame, xmap: pd.DataFrame, rules=None):
+    """(IK 행, IK 행 키, 지문, OK Join 프레임, 규칙)"""
+    from notebooks.match_iksan_okc import NO_RULE, compile_crossmap_rules
+
+    rules = rules or compile_crossmap_rules(xmap)
+    ik = parts[parts.system == 'IK'].reset_index(drop=True)
+    ok = parts.loc[parts.system == 'OK', ['part_type', 'remark']].reset_index(drop=True)
+
+    ids = rules.rule_ids(ik)
+    rule_h = np.concatenate([_row_hash(xmap), np.zeros(1, dtype=np.uint64)])   # 마지막 = 규칙 없음
+    rule_part = rule_h[np.where(ids == NO_RULE, len(rule_h) - 1, ids)]
+
+    # OK 측: part_type별 Join 행 묶음 해시 (행 순서 포함)
+    ok_h = pd.Series(_row_hash(ok), index=ok.index)
+    ok_group = {pt: _h64(tuple(h)) for pt, h in ok_h.groupby(ok["part_type"], sort=False)}
+    km = np.where(ids == NO_RULE, "", rules.ok_km_code[np.where(ids == NO_RULE, 0, ids)]) if len(rules) \
+        else np.full(len(ik), "", dtype=object)
+    ok_part = np.fromiter((ok_group.get(k, 0) for k in km), dtype=np.uint64, count=len(ik))
+
+    fps = _combine(_row_hash(ik), rule_part, ok_part)
+    return ik, row_keys(ik), fps, ok, rules
+
+
+def _match_rows(ik: pd.DataFrame, keys: np.ndarray, ok: pd.DataFrame, rules):
+    """IK 행 → matched 행 + 출력 행별 IK 키"""
+    from notebooks.match_iksan_okc import join_ok
+
+    tagged = rules.attach(ik)
+    tagged["__row"] = np.arange(len(tagged))
+    merged = join_ok(tagged, ok)
+    row_of = merged.pop("__row").to_numpy()
+    return merged, np.asarray(keys, dtype=object)[row_of]
+
+
+def rebuild_matched(parsed_path: Path, xmap_path: Path, out_path: Path,
+                    encoding: str = "cp949", force: bool = False) -> ChangeSummary:
+    """parsed_parts + Cross_Map → matched_parts.csv 증분 재빌드 (지문이 바뀐 IK 행만 다시 매칭)"""
+    out_path = Path(out_path)
+    spath = state_path_for(out_path)
+    parts = pd.read_csv(parsed_path, dtype=str, encoding=encoding).fillna('')
+    xmap = pd.read_csv(xmap_path, dtype=str).fillna('')
+
+    ik, keys, fps, ok, rules = matched_fingerprints(parts, xmap)
+    prev = None if force else _load_state(spath, "matched")
+    summary = ChangeSummary("matched_parts", keys, fps, prev)
+
+    columns = list(_match_rows(ik.iloc[:0], keys[:0], ok.iloc[:0], rules)[0].columns)
+    prev_out = None
+    if prev is not None and prev.get("columns") == columns and out_path.exists():
+        prev_out = _read_prev_output(out_path, encoding, len(prev["row_keys"]), columns)
+
+    if prev_out is None:
+        summary.full = True
+        out, out_keys = _match_rows(ik, keys, ok, rules)
+    else:
+        mask = np.fromiter((k in summary.recompute for k in keys), dtype=bool, count=len(keys))
+        fresh, fresh_keys = _match_rows(ik[mask], keys[mask], ok, rules)
+        out, out_keys = _patch(keys, mask, fresh, fresh_keys, prev_out, prev["row_keys"], columns)
+
+    _write_csv(out, out_path, encoding)
+    _save_state(spath, {"kind": "matched", "keys": keys, "fps": fps, "row_keys": out_keys, "columns": columns})
+    summary.write(out_path, encoding)
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from utils.parsers import DATA_DIR
+
+    ap = argparse.ArgumentParser(description="parsed_parts / matched_parts 증분 재빌드")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="입력/출력 CSV 폴더 (기본 scripts/data)")
+    ap.add_argument("--encoding", default="cp949", help="parsed/matched 입출력 인코딩")
+    ap.add_argument("--force", action="store_true", help="지문과 무관하게 전체 재계산")
+    ap.add_argument("--skip-match", action="store_true", help="parsed_parts 만 갱신")
+    args = ap.parse_args()
+
+    paths = default_paths(Path(args.data_dir))
+    print("✅", rebuild_parsed(paths, encoding=args.encoding, force=args.force))
+    if not args.skip_match:
+        data = Path(args.data_dir)
+        print("✅", rebuild_matched(paths["out"], data / "Cross_Map.csv", data / "matched_parts.csv",
+                                   encoding=args.encoding, force=args.force))
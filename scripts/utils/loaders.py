@@ -8,8 +8,25 @@
 from pathlib import Path              # OS 독립적인 경로 처리 유틸
 from PIL import Image                 # 이미지 파일 열기/처리(Pillow)
 import pandas as pd                   # 표 형식 데이터 처리(pandas)
-import re, inspect, sys               # re: 정규식, inspect: 실행 프레임/파일 추적, sys: 인터프리터(현재 미사용)
-import streamlit as st                # Streamlit 캐시/위젯용
+import re, inspect, sys, os           # re: 정규식, inspect: 실행 프레임/파일 추적, sys: 로드된 모듈(코드 지문), os: 환경변수
+import threading                      # 참조 저장소 최초 적재 잠금
+from typing import Mapping            # 읽기 전용 dict 타입 힌트
+
+from utils.prefix_index import PartTypeIndex, build_part_type_index  # part_type 최장 접두 인덱스
+from utils.matched_index import MatchedIndex, build_matched_index     # matched_parts 코드 해시 색인
+from utils.catalog_search import CatalogIndex, build_catalog_index     # 빠른 검색 자동완성 색인
+from utils.fuzzy_search import FuzzyIndex, build_fuzzy_index           # remark/category/라벨 유사 검색 색인
+from utils.images import image_manifest                               # images/ 디렉토리 메모리 색인
+from utils.lookups import (                                           # lookup 7종 공통 저장소
+    LOOKUP_FILES, LabelIndex, build_label_index, build_lookup_table, load_lookup_tables, resolve_options,
+)
+from utils.snapshot import SNAPSHOT_NAME, code_fingerprint, load_or_build, save_snapshot  # 참조 데이터 스냅샷
+from utils.refstore import RefStore                                   # 파일 감시 기반 참조 데이터 저장소
+from utils.encoding import (                                          # CSV 인코딩 판별/매니페스트
+    FALLBACK_ENCODINGS, TRANSCODABLE, EncodingManifest, sniff_encoding, transcode_to_utf8,
+)
+from notebooks.vcode_codec import PairSchema, compile_pair_schemas    # union_schema → pair별 불변 스키마
+from notebooks.vcode_codec import SCHEMA_VERSION_ATTR, schema_version # 코덱 플랜 캐시 키 (내용 해시)
 
 # In[2]:
 def _base_dir():
@@ -26,38 +43,54 @@ def _base_dir():
     return Path(fname).resolve().parents[1]         # 노트북 파일 기준 상위의 상위 폴더 반환
 
 BASE_DIR = _base_dir()               # 프로젝트 루트(어디서 실행하든 일관된 기준)
-DATA_DIR  = BASE_DIR / "data"   
-LOOKUP_DIR = BASE_DIR / "data" / "lookup"   # 데이터 폴더(입·출력 CSV 등)
+DATA_DIR  = Path(os.environ.get("VCODE_DATA_DIR") or BASE_DIR / "data")   # 데이터 폴더(입·출력 CSV 등, VCODE_DATA_DIR로 변경 가능)
+LOOKUP_DIR = DATA_DIR / "lookup"
 IMG_DIR   = BASE_DIR / "images"      # 이미지 폴더
 
-# 안전 CSV 로더: UTF-8 → UTF-8-SIG → CP949 → EUC-KR 순서로 시도
-def read_csv_safe(pathlike):
-    """여러 인코딩 후보를 순차 시도하여 CSV를 안전하게 읽습니다.
+# 안전 CSV 로더: 앞부분 바이트로 인코딩 판별 → 매니페스트에 기록 → 한 번만 파싱
+ENCODING_MANIFEST = EncodingManifest(DATA_DIR / ".snapshot" / "encodings.json")
+
+# 첫 로드 시 cp949/euc-kr 원본을 UTF-8(BOM)로 변환 저장할지 (환경변수 VCODE_TRANSCODE_UTF8=1)
+TRANSCODE_TO_UTF8 = os.environ.get("VCODE_TRANSCODE_UTF8", "").strip().lower() in ("1", "true", "yes")
+
+def read_csv_safe(pathlike, transcode: bool | None = None):
+    """인코딩을 판별해 CSV를 한 번에 안전하게 읽습니다.
     - pathlike가 문자열이면 DATA_DIR/<pathlike>로 간주
-    - 모든 시도가 실패해도 마지막에 errors='ignore'로 강제 로드(깨진 문자는 무시)
+    - 인코딩: 매니페스트((경로, size, mtime) → 인코딩) → 없으면 앞 64KB 바이트로 판별(sniff_encoding)
+    - 판별 인코딩이 뒤쪽에서 깨지면 UTF-8 → UTF-8-SIG → CP949 → EUC-KR → latin1 순으로 재시도
+    - 모든 시도가 실패해도 마지막에 encoding_errors='ignore'로 강제 로드(깨진 문자는 무시)
+    - transcode=True(기본: TRANSCODE_TO_UTF8)면 cp949/euc-kr 파일을 UTF-8로 변환 저장 후 매니페스트 갱신
     - 항상 dtype=str + fillna("")로 문자열/결측치 정규화
     """
     p = pathlike if isinstance(pathlike, Path) else (DATA_DIR / pathlike)  # Path 인스턴스면 그대로, 아니면 DATA_DIR 상대경로
-    for enc in ("utf-8", "utf-8-sig", "cp949", "euc-kr", "latin1"):        # 실무에서 자주 쓰는 인코딩 순으로 시도
+    if transcode is None:
+        transcode = TRANSCODE_TO_UTF8
+
+    enc = ENCODING_MANIFEST.get(p) or sniff_encoding(p)
+    for cand in (enc,) + tuple(e for e in FALLBACK_ENCODINGS if e != enc):
         try:
-            return pd.read_csv(p, dtype=str, encoding=enc).fillna("")
+            df = pd.read_csv(p, dtype=str, encoding=cand).fillna("")
         except UnicodeDecodeError:
             continue                                                       # 디코딩 안 되면 다음 인코딩 시도
-    # 그래도 안 되면 pandas 기본 디코딩으로 무시 옵션
-    return pd.read_csv(p, dtype=str, errors="ignore").fillna("")           # 일부 문자가 깨져도 일단 로드
+        if transcode and cand in TRANSCODABLE and transcode_to_utf8(p, cand):
+            cand = "utf-8-sig"
+        ENCODING_MANIFEST.put(p, cand)
+        return df
+    # 그래도 안 되면 디코딩 오류 무시 옵션
+    return pd.read_csv(p, dtype=str, encoding="utf-8", encoding_errors="ignore").fillna("")  # 일부 문자가 깨져도 일단 로드
 
 
 # In[3]:
 
 
-def load_union_schema() -> pd.DataFrame:
-    """IK/OK 통합 스키마(union_schema.csv)를 로드하고 컬럼 표준화를 수행합니다.
+def _read_union_schema(path: Path) -> pd.DataFrame:
+    """IK/OK 통합 스키마(union_schema.csv)를 읽고 컬럼 표준화를 수행합니다.
     - 모든 컬럼 문자열화(detype=str)
     - 주요 텍스트 컬럼 strip(공백 제거)
     - required_ik/required_ok 문자열 불리언("TRUE","1" 등) → 실제 bool 변환
     """
     # CSV는 항상 문자열로 읽고(엑셀 BOM 호환), 불리언/문자 정규화
-    df = pd.read_csv(DATA_DIR / "union_schema.csv", dtype=str, encoding="utf-8-sig")
+    df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
 
     # 트림 & 대소문자 정규화: 주요 키/속성 컬럼을 공백 제거/문자열화
     for c in ["pair_id", "ik_part_type", "ok_part_type", "key", "dtype", "lookup",
@@ -76,8 +109,98 @@ def load_union_schema() -> pd.DataFrame:
         if c in df.columns:
             df[c] = _to_bool_series(df[c])
 
+    # 코덱 pair 플랜 캐시 키: 읽을 때 한 번만 내용 해시 (이후 코덱 호출마다 해시하지 않음)
+    df.attrs[SCHEMA_VERSION_ATTR] = schema_version(df)
+    return df
+
+
+# In[3-1]: 참조 데이터 스냅샷 (콜드 스타트 시 CSV 재파싱 없이 한 번에 로드)
+SNAPSHOT_PATH = DATA_DIR / ".snapshot" / SNAPSHOT_NAME
+
+REFERENCE_FILES = {
+    "part_master":   DATA_DIR / "part_master.csv",
+    "Cross_Map":     DATA_DIR / "Cross_Map.csv",
+    "union_schema":  DATA_DIR / "union_schema.csv",
+    "codeSchema_IK": DATA_DIR / "codeSchema_IK.csv",
+    "codeSchema_OK": DATA_DIR / "codeSchema_OK.csv",
+}
+
+def reference_sources() -> list:
+    """스냅샷 버전(내용 해시)을 결정하는 원본 파일 목록"""
+    return list(REFERENCE_FILES.values()) + [LOOKUP_DIR / f for f in LOOKUP_FILES]
+
+def reference_code() -> str:
+    """스냅샷 payload를 만드는 코드(이 파일 + lookup/인코딩/그룹키 모듈) 소스 해시
+    - 배포로 build_lookup_table / _read_union_schema / read_csv_safe 등이 바뀌면 스냅샷을 재빌드
+    """
+    names = (__name__, "utils.encoding", "utils.lookups", "utils.prefix_index", "utils.snapshot")
+    files = [getattr(sys.modules.get(n), "__file__", None) for n in names]
+    return code_fingerprint(Path(f) for f in files if f)
+
+def build_reference() -> dict:
+    """원본 CSV 전체 파싱 → 스냅샷 payload {이름: DataFrame | None, "lookups": {...}}
+    - 없는 파일은 None (해당 로더 호출 시 FileNotFoundError)
+    """
+    out = {}
+    for name, p in REFERENCE_FILES.items():
+        if not p.exists():
+            out[name] = None
+            continue
+        out[name] = _read_union_schema(p) if name == "union_schema" else read_csv_safe(p)
+    out["lookups"] = load_lookup_tables(LOOKUP_DIR, read_csv=read_csv_safe)
+    return out
+
+# In[3-2]: 참조 데이터 저장소 (파일 감시 → 바뀐 파일에서 파생된 캐시만 백그라운드 재빌드 후 교체)
+REF = RefStore()
+MATCHED_CSV = DATA_DIR / "matched_parts.csv"
+
+# 감시 주기(초). 0이면 감시하지 않음(기존처럼 재시작해야 반영)
+WATCH_INTERVAL = float(os.environ.get("VCODE_WATCH_INTERVAL", "2") or 0)
+
+_START_LOCK = threading.Lock()
+_started = False
+
+def reference_store() -> RefStore:
+    """프로세스 공유 참조 데이터 저장소. 첫 호출 때 스냅샷으로 채우고 파일 감시를 시작"""
+    global _started
+    if not _started:
+        with _START_LOCK:
+            if not _started:
+                payload, _state = load_or_build(SNAPSHOT_PATH, reference_sources(), build_reference,
+                                                code=reference_code())
+                seed = {name: payload.get(name) for name in REFERENCE_FILES}
+                for f in LOOKUP_FILES:
+                    t = f.replace(".csv", "")
+                    seed[f"lookup:{t}"] = payload.get("lookups", {}).get(t)
+                seed["lookups"] = payload.get("lookups", {})
+                REF.seed(seed)
+                REF.start_watcher(WATCH_INTERVAL, dirs=[DATA_DIR, LOOKUP_DIR])
+                _started = True
+    return REF
+
+def _reference_frame(name: str) -> pd.DataFrame:
+    df = reference_store().get(name)
+    if df is None:
+        raise FileNotFoundError(REFERENCE_FILES[name])
     return df
 
+
+def load_union_schema() -> pd.DataFrame:
+    """IK/OK 통합 스키마(union_schema.csv) — 스냅샷에서 표준화된 DataFrame을 반환
+    - 프로세스 공유 객체(코덱 pair 플랜 캐시가 재사용됨): 수정하지 말고 읽기만 할 것
+    """
+    return _reference_frame("union_schema")
+
+def load_pair_schemas() -> Mapping[str, PairSchema]:
+    """union_schema를 pair별 불변 객체로 묶은 {pair_id: PairSchema} (읽기 전용)
+    - 프로세스 공유: 재실행마다 DataFrame 필터 없이 dict 조회만 (union_schema가 바뀌면 자동 재빌드)
+    - load_union_schema()와 같은 DataFrame에서 만들어지므로 코덱 함수와 같은 객체를 공유
+    """
+    schemas = reference_store().get("pair_schemas")
+    if schemas is None:
+        raise FileNotFoundError(REFERENCE_FILES["union_schema"])
+    return schemas
+
 def load_images(part_type: str, max_imgs: int = 2):
     """
     images/<part_type>*.{png,jpg,jpeg} 를 찾아 PIL Image 리스트로 반환.
@@ -101,8 +224,9 @@ def load_images(part_type: str, max_imgs: int = 2):
         return []                              # 이미지 폴더 자체가 없으면 빈 리스트
 
     # 2) 파일 매칭: part_type 또는 part_type_1, part_type_2 ... 와 확장자 png/jpg/jpeg
+    #    (디렉토리 목록은 이미지 매니페스트 캐시 사용 → 호출마다 iterdir 하지 않음)
     patt = re.compile(rf"^{re.escape(str(part_type))}(_\d+)?\.(png|jpe?g)$", re.I)
-    files = sorted([p for p in img_dir.iterdir() if patt.match(p.name)])[:max_imgs]
+    files = [p for p in image_manifest(img_dir).site("").files if patt.match(p.name)][:max_imgs]
 
     # 3) 이미지 열기 (깨진 파일은 건너뜀)
     out = []
@@ -126,79 +250,49 @@ def load_catalog():
     part_master.csv + category 컬럼을 읽어 DataFrame 반환
     - site/part_type/category 등 카탈로그 메타
     """
-    return read_csv_safe(DATA_DIR / "part_master.csv")
+    return _reference_frame("part_master").copy()
 
-@st.cache_data
 def load_code_schema(site: str = "IK") -> pd.DataFrame:
     """
     site = 'IK' -> codeSchema_IK.csv, site = 'OK' -> codeSchema_OK.csv
     기대 컬럼: part_type, attr_name, lookup_table (없으면 빈 문자열)
-    - Streamlit 캐시 적용: 동일 인자(site) 재호출시 디스크 재읽기 없이 메모리 반환
+    - 참조 저장소 공유 객체(파일이 바뀌면 자동 교체): 수정하지 말고 읽기만 할 것
     """
-    fname = "codeSchema_IK.csv" if site.upper()=="IK" else "codeSchema_OK.csv"
-    df = read_csv_safe(DATA_DIR / fname).fillna('')  # 안전 로더 사용(인코딩 이슈 방지)
-    return df
+    name = "codeSchema_IK" if site.upper()=="IK" else "codeSchema_OK"
+    return _reference_frame(name)  # 안전 로더로 파싱된 결과(fillna 완료)
 
-@st.cache_data
 def load_lookups() -> dict:
     """
-    7종 lookup csv를 읽어 테이블명 -> {spec, common, value_col} 사전으로 반환
+    7종 lookup csv를 읽어 테이블명 -> {spec, common, value_col, options} 사전으로 반환
     (테이블명 예: material_lookup, surface_lookup ...)
     - spec: {(part_type, code): label}  # 전용값
     - common: {code: label}             # 공통값
     - value_col: 라벨 컬럼명(동적으로 감지)
+    - options: {part_type: {code: label}}  # 정확 > IK 그룹 > 공통(*) 으로 미리 병합한 옵션표
+    빌드 로직은 utils.lookups 하나로 공유(app, parse_vcode 동일 규칙)
+    - 참조 저장소 공유 객체: 재실행마다 사본을 만들지 않음(읽기 전용으로 사용)
+      lookup CSV 하나가 바뀌면 그 테이블만 다시 읽어 교체
     """
-    files = [
-        "material_lookup.csv", "surface_lookup.csv", "grade_lookup.csv",
-        "seal_lookup.csv", "designation_lookup.csv",
-        "screw_tolerance_lookup.csv", "type_assembly_lookup.csv",
-    ]
-    result = {}
-    for f in files:
-        p = LOOKUP_DIR / f
-        if not p.exists():
-            continue                         # 파일이 없으면 건너뛰기(유연성)
-        df = pd.read_csv(p, dtype=str).fillna('')  # 문자열/결측치 정규화
-        # part_type/code를 제외한 나머지 1개 열을 라벨 컬럼으로 간주(첫 번째 것)
-        value_cols = [c for c in df.columns if c not in ("part_type","code")]
-        value_col  = value_cols[0] if value_cols else "value"
-        # 전용값/공통값 딕셔너리 구성
-        spec   = df[df.part_type != "*"].set_index(["part_type","code"])[value_col].to_dict()
-        common = df[df.part_type == "*"].set_index("code")[value_col].to_dict()
-        key = f.replace(".csv","")  # "material_lookup" 등 파일명 → 테이블명 키
-        result[key] = {"spec": spec, "common": common, "value_col": value_col}
-    return result
+    return reference_store().get("lookups")
 
 
 def lookup_options(lookups: dict, table: str, part_type: str) -> dict:
     """
     특정 lookup_table과 part_type에 맞는 {코드: 라벨} 반환
-    - 공백/대소문자/키 누락/중복에 안전
-    - common(공통) + spec(전용) 병합 (spec이 공통을 덮어씀)
+    - load_lookups()가 미리 병합해 둔 옵션표에서 꺼내기만 함(요청마다 spec 전체 스캔 없음)
+    - 우선순위: 정확(V111) > IK 그룹(V11) > 공통(*)
+    - 반환 dict는 캐시와 공유되므로 수정하지 말 것
     """
-    obj = lookups.get(table)
-    if not obj:
-        return {}
-
-    # 안전하게 가져오기(키 없으면 디폴트 {})
-    spec = obj.get("spec", {})      # {(pt, code): label}
-    common = obj.get("common", {})  # {code: label}
-
-    pt = str(part_type).strip()     # part_type 공백 정리
-
-    # 해당 part_type에 매칭되는 spec만 추출: (ppt, code)에서 ppt가 현재 pt인 것만
-    spec_map = {code: spec[(ppt, code)]
-                for (ppt, code) in spec.keys()
-                if str(ppt).strip() == pt}
-
-    # 공통 + 전용 합치되, 전용이 우선(덮어쓰기)
-    merged = {**common, **spec_map}
+    return resolve_options(lookups.get(table), part_type)
 
-    # 코드 키/라벨 공백 정리 + 빈 키 제거
-    cleaned = {str(k).strip(): str(v).strip() for k, v in merged.items() if str(k).strip()}
 
-    return cleaned
 
+def load_label_index() -> LabelIndex:
+    """lookup 7종 라벨 → 코드 역색인 (폼 검색/배치 변환 공용, 프로세스 단위 공유)
+    - search(query, table=None, part_type=None, limit=20): 완전 > 접두 > 부분일치 순 LabelHit 목록
+    - find_code(table, part_type, label): 라벨 완전일치 → 코드
+    """
+    return reference_store().get("label_index")
 
 
 def _detect_crossmap_cols(df: pd.DataFrame):
@@ -229,14 +323,18 @@ def _detect_crossmap_cols(df: pd.DataFrame):
     return ik_col, ok_col
 
 
-@st.cache_data
 def load_crossmap():
-    """Cross_Map.csv에서 IK↔OK 매핑 dict 2개 반환
+    """Cross_Map.csv에서 IK↔OK 매핑 dict 2개 반환 (참조 저장소 공유, 읽기 전용)
     - IK→OK (ik2ok): {ik_part_type: ok_part_type}
     - OK→IK (ok2ik): {ok_part_type: ik_part_type}
+    """
+    return reference_store().get("crossmap")
+
+def _crossmap_dicts(df: pd.DataFrame):
+    """Cross_Map DataFrame → (ik2ok, ok2ik)
     - 컬럼명이 다를 수 있으므로 자동 감지(_detect_crossmap_cols) 사용
     """
-    df = read_csv_safe(DATA_DIR / "Cross_Map.csv").fillna("")
+    df = df.fillna("")
     ik_col, ok_col = _detect_crossmap_cols(df)
     if not ik_col or not ok_col:
         # 필수 컬럼을 찾지 못하면 명확한 에러 메시지로 가이드
@@ -246,7 +344,103 @@ def load_crossmap():
     ok2ik = dict(df[[ok_col, ik_col]].dropna().values)
     return ik2ok, ok2ik
 
-@st.cache_data
 def load_matched_full():
-    """matched_parts.csv 전체를 안전 로더로 읽어 반환(캐시)"""
-    return read_csv_safe("matched_parts.csv")
+    """matched_parts.csv 전체를 안전 로더로 읽어 반환(참조 저장소 공유, 파일이 바뀌면 자동 교체)"""
+    df = reference_store().get("matched_parts")
+    if df is None:
+        raise FileNotFoundError(MATCHED_CSV)
+    return df
+
+def load_matched_index() -> MatchedIndex | None:
+    """matched_parts 정규화 코드 색인(IK/OK 코드 → 행). 파일이 없거나 비었으면 None
+    - matched_parts 버전마다 한 번만 빌드해 프로세스 공유 (조회마다 복사/정규화 없음)
+    """
+    return reference_store().get("matched_index")
+
+def load_catalog_index() -> CatalogIndex:
+    """빠른 검색 자동완성 색인 (part_type / Cross_Map 짝 / remark / category)
+    - part_master·Cross_Map 버전마다 한 번만 빌드해 프로세스 공유 (키 입력마다 조회만)
+    """
+    return reference_store().get("catalog_index")
+
+def load_fuzzy_index() -> FuzzyIndex:
+    """오타/띄어쓰기에 강한 유사 검색 색인 (part_master remark·category + lookup 라벨, 한글 자모 bigram)
+    - search(query, limit=10, site=None, category=None, kinds=None): 점수 높은 순 FuzzyHit 목록
+    - part_master·lookup 버전마다 한 번만 빌드해 프로세스 공유
+    """
+    return reference_store().get("fuzzy_index")
+
+def load_part_type_index() -> PartTypeIndex:
+    """part_master + Cross_Map + union_schema 의 part_type으로 최장 접두 인덱스를 만들어 반환
+    - 프로세스 단위 공유: 세션/재실행마다 다시 만들지 않음(원본이 바뀌면 자동 재빌드)
+    - 없는 파일은 건너뜀(있는 출처만으로 구성)
+    """
+    return reference_store().get("part_type_index")
+
+
+# In[4]: 참조 저장소 항목 등록 (이름 / 빌드 함수 / 원본 파일 / 의존 항목)
+def _try_get(store: RefStore, name: str):
+    try:
+        return store.get(name)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _register_reference_items(store: RefStore) -> None:
+    for name, p in REFERENCE_FILES.items():
+        parse = _read_union_schema if name == "union_schema" else read_csv_safe
+        store.register(name, lambda s, p=p, parse=parse: parse(p) if p.exists() else None, files=[p])
+
+    tables = []
+    for f in LOOKUP_FILES:
+        p, t = LOOKUP_DIR / f, f.replace(".csv", "")
+        tables.append(t)
+        store.register(f"lookup:{t}",
+                       lambda s, p=p: build_lookup_table(read_csv_safe(p).fillna(""), name=p.name) if p.exists() else None,
+                       files=[p])
+    store.register("lookups",
+                   lambda s: {t: v for t in tables if (v := s.get(f"lookup:{t}")) is not None},
+                   deps=[f"lookup:{t}" for t in tables])
+    store.register("label_index", lambda s: build_label_index(s.get("lookups")), deps=["lookups"])
+
+    def _crossmap(s):
+        df = s.get("Cross_Map")
+        if df is None:
+            raise FileNotFoundError(REFERENCE_FILES["Cross_Map"])
+        return _crossmap_dicts(df)
+    store.register("crossmap", _crossmap, deps=["Cross_Map"])
+
+    store.register("part_type_index", lambda s: build_part_type_index(
+        catalog=s.get("part_master"),
+        crossmap=_try_get(s, "crossmap"),
+        union_df=s.get("union_schema"),
+    ), deps=["part_master", "crossmap", "union_schema"])
+
+    store.register("catalog_index", lambda s: build_catalog_index(
+        s.get("part_master"), _try_get(s, "crossmap"),
+    ), deps=["part_master", "crossmap"])
+
+    store.register("fuzzy_index", lambda s: build_fuzzy_index(
+        s.get("part_master"), s.get("lookups"),
+    ), deps=["part_master", "lookups"])
+
+    store.register("pair_schemas", lambda s: (
+        None if (u := s.get("union_schema")) is None else compile_pair_schemas(u)
+    ), deps=["union_schema"])
+
+    store.register("matched_parts", lambda s: read_csv_safe(MATCHED_CSV) if MATCHED_CSV.exists() else None,
+                   files=[MATCHED_CSV])
+    store.register("matched_index", lambda s: build_matched_index(s.get("matched_parts")),
+                   deps=["matched_parts"])
+
+    # 참조 원본이 바뀌어 재빌드되면 스냅샷도 새 내용으로 다시 저장(다음 기동용)
+    snap_items = set(REFERENCE_FILES) | {f"lookup:{t}" for t in tables}
+
+    def _resave_snapshot(changed, affected):
+        if not (affected & snap_items):
+            return
+        payload = {name: store.get(name) for name in REFERENCE_FILES}
+        payload["lookups"] = store.get("lookups")
+        save_snapshot(SNAPSHOT_PATH, reference_sources(), payload, code=reference_code())
+    store.listeners.append(_resave_snapshot)
+
+_register_reference_items(REF)
@@ -0,0 +1,270 @@
+# utils/lookups.py
+# -*- coding: utf-8 -*-
+"""
+Lookup 7종 공통 저장소 (loaders / app / parse_vcode 공용, streamlit 비의존)
+
+테이블 1개 = {spec, common, value_col, options}
+- spec    : {(part_type, code): label}   # part_type 전용값
+- common  : {code: label}                # part_type == '*'
+- options : {part_type: {code: label}}   # 로드 시점에 미리 병합한 옵션표
+            우선순위 = 정확(V111) > IK 그룹(V11) > 공통(*), 순서도 같은 순
+            '*' 키에는 공통값만 담긴다
+
+LabelIndex: 라벨 → (table, part_type, code) 역색인 ("SUS304", "Zn plating" 으로 코드 찾기)
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, NamedTuple
+
+import pandas as pd
+
+from utils.prefix_index import ik_group_key
+
+LOOKUP_FILES = (
+    "material_lookup.csv", "surface_lookup.csv", "grade_lookup.csv",
+    "seal_lookup.csv", "designation_lookup.csv",
+    "screw_tolerance_lookup.csv", "type_assembly_lookup.csv",
+)
+
+
+def _pt_key(part_type) -> str:
+    return str(part_type or "").strip().upper()
+
+
+def build_lookup_table(df: pd.DataFrame, name: str = "") -> dict:
+    """
+    lookup CSV 1개(DataFrame) → {spec, common, value_col, options}
+    - part_type/code 를 제외한 첫 번째 컬럼을 라벨 컬럼으로 사용
+    - part_type은 대문자/공백 정리, code/라벨은 공백 정리, 빈 code 행은 제외
+    - 같은 (part_type, code) 중복 행은 마지막 행이 이김 (CSV 아래쪽에 덧붙인 정정이 반영되도록)
+    """
+    if "part_type" not in df.columns or "code" not in df.columns:
+        raise ValueError(f"{name or 'lookup'}에는 'part_type'와 'code' 컬럼이 필요합니다.")
+    value_cols = [c for c in df.columns if c not in ("part_type", "code")]
+    value_col = value_cols[0] if value_cols else "value"
+
+    pts = df["part_type"].fillna("").astype(str).str.strip().str.upper().tolist()
+    codes = df["code"].fillna("").astype(str).str.strip().tolist()
+    labels = (df[value_col].fillna("").astype(str).str.strip().tolist()
+              if value_col in df.columns else [""] * len(df))
+
+    spec: Dict[tuple, str] = {}
+    common: Dict[str, str] = {}
+    by_pt: Dict[str, Dict[str, str]] = {}
+    for pt, code, label in zip(pts, codes, labels):
+        if not code:
+            continue
+        if pt == "*":
+            common[code] = label
+        else:
+            spec[(pt, code)] = label
+            by_pt.setdefault(pt, {})[code] = label
+
+    # 정확 > 그룹 > 공통 병합본을 spec에 등장한 part_type(+그룹키)마다 미리 구성
+    options: Dict[str, Dict[str, str]] = {"*": dict(common)}
+    for pt in list(by_pt) + [ik_group_key(p) for p in by_pt]:
+        if pt in options:
+            continue
+        merged: Dict[str, str] = {}
+        g = ik_group_key(pt)
+        for key in ((pt,) if g == pt else (pt, g)):
+            for code, label in by_pt.get(key, {}).items():
+                merged.setdefault(code, label)
+        for code, label in common.items():
+            merged.setdefault(code, label)
+        options[pt] = merged
+
+    return {"spec": spec, "common": common, "value_col": value_col, "options": options}
+
+
+def resolve_options(table: dict | None, part_type: str) -> Dict[str, str]:
+    """
+    미리 병합된 옵션표에서 {code: label} 을 꺼낸다 (사전 조회 1~3회).
+    spec에 없는 part_type(V113 등)은 그룹키(V11) → 공통(*) 순으로 대체.
+    반환 dict는 공유 객체이므로 수정하지 말 것.
+    """
+    if not table:
+        return {}
+    options = table.get("options", {})
+    pt = _pt_key(part_type)
+    hit = options.get(pt)
+    if hit is None:
+        hit = options.get(ik_group_key(pt))
+    if hit is None:
+        hit = options.get("*", {})
+    return hit
+
+
+def match_code(options: Dict[str, str], code) -> str:
+    """
+    코드 → 옵션표에 있는 표기 (없으면 입력 그대로).
+    코덱은 lookup slot 폭에 맞춰 앞에 '0'을 붙이고 해석할 때 걷어내므로 ('07' ↔ '7'),
+    정확히 없으면 앞 '0'을 뺀 값이 같은 코드를 찾는다.
+    """
+    c = str(code).strip()
+    if c in options or not c:
+        return c
+    bare = c.lstrip("0") or "0"
+    return next((k for k in options if (k.lstrip("0") or "0") == bare), c)
+
+
+def lookup_label(table: dict | None, part_type: str, code: str) -> str | None:
+    """코드 1개의 라벨 (정확 > 그룹 > 공통), 없으면 None"""
+    return resolve_options(table, part_type).get(str(code).strip())
+
+
+def load_lookup_tables(lookup_dir: Path, read_csv=None) -> Dict[str, dict]:
+    """
+    lookup_dir 의 7종 CSV → {테이블명: build_lookup_table(...)}
+    - read_csv: 경로 → DataFrame 함수 (기본 pd.read_csv(dtype=str))
+    - 없는 파일은 건너뜀
+    """
+    read_csv = read_csv or (lambda p: pd.read_csv(p, dtype=str))
+    result = {}
+    for f in LOOKUP_FILES:
+        p = Path(lookup_dir) / f
+        if not p.exists():
+            continue
+        name = f.replace(".csv", "")
+        result[name] = build_lookup_table(read_csv(p).fillna(""), name=f)
+    return result
+
+
+# ---------------------------------------------------------------------
+# 라벨 → 코드 역색인 (재질/표면명 등으로 코드 찾기)
+# ---------------------------------------------------------------------
+_TOKEN_SPLIT = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def normalize_label(text) -> str:
+    """라벨 비교용 정규화: NFKC + 소문자 + 영숫자/한글 이외 제거 ('Zn-Plating ' → 'znplating')"""
+    s = unicodedata.normalize("NFKC", str(text or "")).lower()
+    return "".join(_TOKEN_SPLIT.split(s))
+
+
+def label_tokens(text) -> List[str]:
+    """'Zn plating (3um)' → ['zn', 'plating', '3um']"""
+    s = unicodedata.normalize("NFKC", str(text or "")).lower()
+    return [t for t in _TOKEN_SPLIT.split(s) if t]
+
+
+class LabelHit(NamedTuple):
+    table: str
+    part_type: str     # '*' = 공통
+    code: str
+    label: str
+    score: float       # 1.0 완전일치 > 0.8 전체 접두 > 0.6 토큰 접두 > 0.4 부분일치
+
+
+class LabelIndex:
+    """
+    lookup 라벨 역색인
+    - 정확: 정규화 라벨 → 항목 id
+    - 접두: (정규화 라벨/토큰) 정렬 목록 + bisect
+    - 부분: 정규화 라벨 3-gram → 항목 id 집합 (교집합 후 실제 포함 여부 확인)
+    """
+
+    def __init__(self, tables: Dict[str, dict]):
+        self.entries: List[tuple] = []          # (table, part_type, code, label, norm)
+        for table, obj in tables.items():
+            for (pt, code), label in obj.get("spec", {}).items():
+                self._add(table, pt, code, label)
+            for code, label in obj.get("common", {}).items():
+                self._add(table, "*", code, label)
+
+        self._exact: Dict[str, List[int]] = {}
+        keys: List[tuple] = []                  # (문자열, 항목 id, 전체라벨 여부)
+        self._grams: Dict[str, set] = {}
+        for i, (_, _, _, label, norm) in enumerate(self.entries):
+            if not norm:
+                continue
+            self._exact.setdefault(norm, []).append(i)
+            keys.append((norm, i, True))
+            for t in label_tokens(label):
+                if t != norm:
+                    keys.append((t, i, False))
+            for g in {norm[j:j + 3] for j in range(len(norm) - 2)}:
+                self._grams.setdefault(g, set()).add(i)
+        keys.sort()
+        self._keys = [k[0] for k in keys]
+        self._key_meta = [(k[1], k[2]) for k in keys]
+
+    def _add(self, table, pt, code, label):
+        self.entries.append((table, str(pt), str(code), str(label), normalize_label(label)))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _candidates(self, q: str) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        for i in self._exact.get(q, ()):
+            scores[i] = 1.0
+        lo = bisect.bisect_left(self._keys, q)
+        hi = bisect.bisect_left(self._keys, q + "\uffff")
+        for j in range(lo, hi):
+            i, whole = self._key_meta[j]
+            s = 0.8 if whole else 0.6
+            if scores.get(i, 0.0) < s:
+                scores[i] = s
+        if len(q) >= 3:
+            grams = [self._grams.get(q[j:j + 3], set()) for j in range(len(q) - 2)]
+            grams.sort(key=len)
+            cand = set(grams[0]).intersection(*grams[1:]) if grams else set()
+            for i in cand:
+                if i not in scores and q in self.entries[i][4]:
+                    scores[i] = 0.4
+        elif not scores:
+            # 1~2글자이고 접두 결과도 없을 때만 전체 선형 확인 (lookup 규모에선 충분히 빠름)
+            for i, e in enumerate(self.entries):
+                if q in e[4]:
+                    scores[i] = 0.4
+        return scores
+
+    def search(self, query: str, table: str | None = None, part_type: str | None = None,
+               limit: int = 20) -> List[LabelHit]:
+        """
+        라벨 검색 (완전 > 전체 접두 > 토큰 접두 > 부분일치 순, 동점은 짧은 라벨 우선)
+        - table: 특정 lookup 테이블로 제한 (예: 'material_lookup')
+        - part_type: 주면 그 part_type에서 실제로 쓸 수 있는 항목만(정확/IK 그룹/공통)
+        """
+        q = normalize_label(query)
+        if not q:
+            return []
+        allowed = None
+        if part_type is not None:
+            pt = _pt_key(part_type)
+            allowed = {pt, ik_group_key(pt), "*"}
+        hits = []
+        for i, sc in self._candidates(q).items():
+            tb, pt, code, label, norm = self.entries[i]
+            if table and tb != table:
+                continue
+            if allowed is not None and pt not in allowed:
+                continue
+            hits.append((-sc, len(norm), tb, pt, code, label, sc))
+        hits.sort()
+        return [LabelHit(tb, pt, code, label, sc) for _, _, tb, pt, code, label, sc in hits[:limit]]
+
+    def find_code(self, table: str, part_type: str, label: str) -> str | None:
+        """라벨 완전일치(정규화 기준) → 코드. 정확 > IK 그룹 > 공통 순으로 첫 항목"""
+        q = normalize_label(label)
+        pt = _pt_key(part_type)
+        rank = {pt: 0, ik_group_key(pt): 1, "*": 2}
+        best = None
+        for i in self._exact.get(q, ()):
+            tb, ept, code, _, _ = self.entries[i]
+            if tb != table or ept not in rank:
+                continue
+            if best is None or rank[ept] < best[0]:
+                best = (rank[ept], code)
+        return best[1] if best else None
+
+
+def build_label_index(tables: Dict[str, dict]) -> LabelIndex:
+    """load_lookups()/load_lookup_tables() 결과로 라벨 역색인 구성"""
+    return LabelIndex(tables)
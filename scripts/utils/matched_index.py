@@ -0,0 +1,131 @@
+# utils/matched_index.py
+# -*- coding: utf-8 -*-
+"""
+matched_parts 정규화 코드 해시 색인 ("조회" 버튼용)
+
+- IK/OK 코드 컬럼 판별은 색인을 만들 때 한 번만 (컬럼명 부분 문자열 규칙)
+- 정규화 코드(공백/하이픈 제거 + 대문자) → 행 번호 배열, IK/OK 각각
+- 조회는 dict 1회 + 해당 행 값만 읽음 → 매 클릭 DataFrame 복사/전체 정규화 없음
+- counterparts: 코드 배열을 한 번에 조회 (대량 변환용, 행별 파이썬 조회 없음)
+- matched_parts 버전(참조 저장소 세대)마다 한 번 빌드해 프로세스에서 공유
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+_NORM_RE = re.compile(r"[\s\-]+")
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+
+def normalize_code(s) -> str:
+    """코드 비교용 정규화: 공백/하이픈 제거 + 대문자화"""
+    return _NORM_RE.sub("", str(s or "")).upper()
+
+
+def normalize_codes(values) -> pd.Series:
+    """normalize_code의 열 단위 버전 (결측은 빈 문자열)"""
+    ser = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    return ser.fillna("").astype(str).str.replace(_NORM_RE, "", regex=True).str.upper()
+
+
+def detect_code_columns(columns: Iterable[str]) -> Tuple[str, str]:
+    """
+    matched_parts 컬럼 중 (IK 코드, OK 코드) 컬럼명
+    - IK: 'ik'와 'code'가 모두 들어간 첫 컬럼, 없으면 첫 컬럼
+    - OK: 'ok'와 'code'가 모두 들어가거나 'km'이 들어간 첫 컬럼, 없으면 두 번째(없으면 첫) 컬럼
+    """
+    cols = [str(c) for c in columns]
+    if not cols:
+        raise ValueError("matched_parts에 컬럼이 없습니다.")
+    ik_col = next((c for c in cols if "ik" in c.lower() and "code" in c.lower()), cols[0])
+    ok_col = next((c for c in cols if ("ok" in c.lower() and "code" in c.lower())
+                   or "km" in c.lower()),
+                  cols[1] if len(cols) > 1 else cols[0])
+    return ik_col, ok_col
+
+
+class _CodeGroups:
+    """정규화 코드 → 그룹 번호 dict + 그룹별로 정렬된 행 위치 배열 (CSR 형태)"""
+
+    def __init__(self, col: pd.Series):
+        norm = normalize_codes(col)
+        codes, uniques = pd.factorize(norm, sort=False)
+        self.order = np.argsort(codes, kind="stable")  # 같은 코드 안에서는 원본 행 순서 유지
+        self.bounds = np.searchsorted(codes[self.order], np.arange(len(uniques) + 1))
+        self.group: Dict[str, int] = dict(zip(uniques.tolist(), range(len(uniques))))
+        self.group.pop("", None)                       # 빈 코드는 색인하지 않음
+        self._keys: pd.Index | None = None             # 배치 조회용 (처음 쓸 때 만듦)
+
+    def get(self, norm: str) -> np.ndarray:
+        g = self.group.get(norm)
+        return _NO_ROWS if g is None else self.order[self.bounds[g]:self.bounds[g + 1]]
+
+    def first_rows(self, norm: pd.Series) -> np.ndarray:
+        """정규화 코드 배열 → 코드별 첫 행 위치 (없으면 -1)"""
+        if self._keys is None:
+            self._gids = np.fromiter(self.group.values(), dtype=np.intp, count=len(self.group))
+            self._keys = pd.Index(list(self.group))
+        pos = self._keys.get_indexer(norm)
+        hit = pos >= 0
+        out = np.full(len(pos), -1, dtype=np.intp)
+        out[hit] = self.order[self.bounds[self._gids[pos[hit]]]]
+        return out
+
+
+class MatchedIndex:
+    """matched_parts 1개 버전의 IK/OK 코드 색인 (원본 DataFrame은 참조만, 수정/복사하지 않음)"""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.ik_col, self.ok_col = detect_code_columns(frame.columns)
+        self._by_side = {
+            "IK": _CodeGroups(frame[self.ik_col]),
+            "OK": _CodeGroups(frame[self.ok_col]),
+        }
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def _col(self, side: str) -> str:
+        return self.ik_col if side.upper() == "IK" else self.ok_col
+
+    def rows(self, side: str, code) -> np.ndarray:
+        """해당 측 코드가 일치하는 행 위치(0-based, 원본 순서). 없으면 빈 배열"""
+        return self._by_side[side.upper()].get(normalize_code(code))
+
+    def counterpart(self, side: str, code) -> str | None:
+        """side 코드로 찾은 첫 행의 상대측 코드 (없으면 None)"""
+        rows = self.rows(side, code)
+        if not len(rows):
+            return None
+        other = "OK" if side.upper() == "IK" else "IK"
+        return self.frame[self._col(other)].iat[rows[0]]
+
+    def counterparts(self, side: str, codes, normalized: bool = False) -> np.ndarray:
+        """counterpart의 배치판: side 코드 배열 → 상대측 코드 배열 (object, 없으면 None)
+        - normalized=True면 이미 normalize_codes를 거친 코드로 보고 정규화 생략
+        """
+        first = self._by_side[side.upper()].first_rows(codes if normalized else normalize_codes(codes))
+        other = "OK" if side.upper() == "IK" else "IK"
+        out = np.full(len(first), None, dtype=object)
+        hit = first >= 0
+        if hit.any():
+            out[hit] = self.frame[self._col(other)].to_numpy(dtype=object)[first[hit]]
+        return out
+
+    def first(self, side: str, code) -> pd.Series | None:
+        """side 코드로 찾은 첫 행 전체 (없으면 None)"""
+        rows = self.rows(side, code)
+        return None if not len(rows) else self.frame.iloc[rows[0]]
+
+
+def build_matched_index(frame: pd.DataFrame | None) -> MatchedIndex | None:
+    """matched_parts DataFrame → MatchedIndex (없거나 컬럼이 없으면 None)"""
+    if frame is None or not len(frame.columns):
+        return None
+    return MatchedIndex(frame)
@@ -9,24 +9,30 @@ parse_vcode.py  (두 시스템 & part_type 전용 master 대응)
 
 출력:
     parsed_parts.csv  –  규칙 메타 + 스키마 있음/없음 플래그
+
+import 해서 쓰기:
+    from utils.parsers import parse_parts
+    out_df = parse_parts(part_master, {"IK": schema_ik, "OK": schema_ok}, lookups)
+
+직접 실행(scripts/ 에서):
+    python -m utils.parsers                                   # 기본 data/ 경로
+    python -m utils.parsers --data-dir D:/V_CODE/data --out parsed.csv
+    python -m utils.parsers split codes.csv --col code --out split.csv   # 11자리 코드 대량 분해
 """
 
-import pandas as pd
-from pathlib import Path
+from __future__ import annotations
+
+import argparse
 import os
-import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
 
-# IK: V + 두 자리(그룹) / V + 세 자리(정확)
-V3_RE = re.compile(r"^(V)(\d{2})(\d)$", re.IGNORECASE)  # V111, V802 ...
-V2_RE = re.compile(r"^(V)(\d{2})$",     re.IGNORECASE)  # V11, V80 ...
+import numpy as np
+import pandas as pd
 
-def ik_group_key(ptype: str) -> str:
-    """V111 -> V11 (이미 V11이면 그대로)"""
-    s = (ptype or "").strip().upper()
-    m3 = V3_RE.match(s)
-    if m3:
-        return f"{m3.group(1)}{m3.group(2)}"
-    return s
+from utils.lookups import load_lookup_tables, resolve_options, lookup_label
+from utils.prefix_index import PartTypeIndex, ik_group_key
 
 def candidate_keys(system: str, ptype_raw: str) -> list[str]:
     """
@@ -39,146 +45,315 @@ def candidate_keys(system: str, ptype_raw: str) -> list[str]:
         g = ik_group_key(s)
         return [s] if s == g else [s, g]
     return [s]
-    
+
 
 # ── 0. 경로 정의 ──────────────────────────────────────────────
-BASE_DIR = Path(r"C:\Users\Allen\Desktop\Project\TYM\V_CODE")  # 프로젝트 최상단 경로(윈도우 고정경로 예시)
-
-# 스키마 파일: 각 시스템(IK/OK)별 part_type의 속성/룩업 규칙 테이블
-SCHEMA_IK = BASE_DIR / "data" / "codeSchema_IK.csv"
-SCHEMA_OK = BASE_DIR / "data" / "codeSchema_OK.csv"
-
-# 룩업 파일들: 각 속성별 코드표(코드→라벨), part_type 전용(spec)과 전체 공통(common) 공존
-LOOKUP_FILES = {
-    'material_lookup':     BASE_DIR / "data" / "lookup" / "material_lookup.csv",
-    'surface_lookup':      BASE_DIR / "data" / "lookup" / "surface_lookup.csv",
-    'grade_lookup':        BASE_DIR / "data" / "lookup" / "grade_lookup.csv",
-    'seal_lookup':         BASE_DIR / "data" / "lookup" / "seal_lookup.csv",
-    'designation_lookup':  BASE_DIR / "data" / "lookup" / "designation_lookup.csv",
-    'screw_tolerance_lookup':     BASE_DIR / "data" / "lookup" / "screw_tolerance_lookup.csv",
-    'type_assembly_lookup':BASE_DIR / "data" / "lookup" / "type_assembly_lookup.csv",
-}
-
-# 마스터(입력) / 결과(출력) 경로
-PART_CSV  = BASE_DIR / "data" / "part_master.csv"     # site + part_type 목록(완성 11자리 코드 없음)
-OUT_CSV   = BASE_DIR / "data" / "parsed_parts.csv"    # 품명군 단위 "가능 코드 집합" 메타 결과
-
-# ── 1. 스키마 로드 (시스템별) ─────────────────────────────────
-schema_ik = pd.read_csv(SCHEMA_IK)  # 익산 시스템 스키마
-schema_ok = pd.read_csv(SCHEMA_OK)  # 옥천 시스템 스키마
-
-# ↓↓↓ 추가
-schema_ik['part_type'] = schema_ik['part_type'].astype(str).str.strip().str.upper()
-schema_ok['part_type'] = schema_ok['part_type'].astype(str).str.strip().str.upper()
-
-# ── 2. 룩업 dict 로드 공통 함수 ──────────────────────────────
-def build_lookup(csv: Path, value_col: str):
-    """
-    하나의 룩업 CSV를 읽어,
-    - spec: (part_type, code) → 라벨
-    - common: code → 라벨
-    두 딕셔너리로 분리해 반환
-    """
-    df = pd.read_csv(csv, dtype=str).fillna('')  # 문자열로 통일 + 결측치 공백 처리
-    # part_type가 '*'가 아니면 '특정 part_type 전용' 값
+BASE_DIR = Path(__file__).resolve().parents[1]    # scripts/ (utils/loaders.py 와 같은 기준)
+DATA_DIR = Path(os.environ.get("VCODE_DATA_DIR") or BASE_DIR / "data")
+
+def default_paths(data_dir: Path = DATA_DIR) -> Dict[str, Path]:
+    """data_dir 기준 입력/출력 경로 (룩업은 data/lookup/)"""
+    data_dir = Path(data_dir)
+    return {
+        "schema_ik":   data_dir / "codeSchema_IK.csv",   # 익산 시스템 스키마
+        "schema_ok":   data_dir / "codeSchema_OK.csv",   # 옥천 시스템 스키마
+        "lookup_dir":  data_dir / "lookup",              # 룩업 7종
+        "part_master": data_dir / "part_master.csv",     # site + part_type 목록(완성 11자리 코드 없음)
+        "out":         data_dir / "parsed_parts.csv",    # 품명군 단위 "가능 코드 집합" 메타 결과
+    }
 
-    if 'part_type' not in df.columns or 'code' not in df.columns:
-        raise ValueError(f"{csv.name}에는 'part_type'와 'code' 컬럼이 필요합니다.")
-    df['part_type'] = df['part_type'].astype(str).str.strip().str.upper()
 
-    spec = df[df.part_type != '*'].set_index(['part_type','code'])[value_col].to_dict()
-    # part_type가 '*'면 '전체 공통' 값
-    common = df[df.part_type == '*'].set_index('code')[value_col].to_dict()
-    return spec, common
+# ── 1. 스키마: part_type → [(attr_name, lookup_table), ...] 를 한 번만 구성 ─────
+def _schema_rules(schema: pd.DataFrame) -> Dict[str, List[Tuple[str, str]]]:
+    """스키마 행을 part_type(대문자/공백 정리)별 (속성, 룩업테이블) 목록으로 묶음 (파일 순서 유지)"""
+    if schema is None or schema.empty:
+        return {}
+    pts = schema["part_type"].astype(str).str.strip().str.upper()
+    attrs = schema["attr_name"]
+    tables = schema["lookup_table"] if "lookup_table" in schema.columns else pd.Series("", index=schema.index)
+    tables = tables.where(tables.notna(), "")
+    frame = pd.DataFrame({"pt": pts.to_numpy(), "attr": attrs.to_numpy(), "table": tables.to_numpy()})
+    return {pt: list(zip(g["attr"], g["table"])) for pt, g in frame.groupby("pt", sort=False)}
 
-LOOKUP_MAP = {}           # {'material_lookup': (spec_dict, common_dict), ...}
 
-# 각 룩업 파일을 읽어서 LOOKUP_MAP에 적재
-for name, path in LOOKUP_FILES.items():
-    # CSV의 컬럼 중 ('part_type','code')를 제외한 '라벨 컬럼'을 자동 탐지(첫 번째 것을 사용)
-    col = [c for c in pd.read_csv(path, nrows=1).columns if c not in ('part_type','code')][0]
-    LOOKUP_MAP[name] = build_lookup(path, col)
+# ── 2. 파싱 (part_type 수준 – 11자리 없음) ───────────────────
+def normalize_master(part_master: pd.DataFrame) -> pd.DataFrame:
+    """part_type 공백 제거 + system(IK/OK) 컬럼 부여한 사본"""
+    pm = part_master.copy()
+    # 데이터 불일치를 공백 제거와 모두 문자열로 변환
+    pm["part_type"] = pm["part_type"].fillna("").astype(str).str.strip()
+    # part_type이 'V'로 시작하면 IKSAN, 아니면 OKCHEON으로 시스템 분류
+    pm["system"] = np.where(pm["part_type"].str.startswith("V"), "IK", "OK")
+    return pm
 
-def lookup(table_name:str, ptype:str, token:str):
+
+def resolve_schema_combos(pm: pd.DataFrame, schemas: Dict[str, pd.DataFrame]):
     """
-    주어진 룩업 테이블에서 (part_type 전용 → 공통) 순으로 라벨을 찾고,
-    없으면 UNKNOWN(코드) 문자열 반환
+    normalize_master() 결과의 고유 (system, part_type) 조합별 스키마 규칙 해석
+    반환: (행별 조합 번호 ndarray, [(system, part_type, 후보키 목록, 규칙 목록 | None), ...])
+    - 조합 번호는 행 순서대로 처음 등장한 순
     """
-    """값 1개 조회: 정확(part_type) → (IK)그룹(Vxx) → 공통*"""
-    spec, common = LOOKUP_MAP[table_name]
-    for key in candidate_keys(system, ptype_raw):
-        v = spec.get((key, token))
-        if v is not None:
-            return v
-    return common.get(token) or f'UNKNOWN({token})'
-
-
-# ── 3. part_master 로드 ─────────────────────────────────────
-pm = pd.read_csv(PART_CSV, dtype=str)  # 마스터 읽기(모두 문자열)
-# part_type이 'V'로 시작하면 IKSAN, 아니면 OKCHEON으로 시스템 분류
-pm['system'] = pm['part_type'].str.startswith('V').map({True:'IK', False:'OK'})
-
-# 데이터 불일치를 공백 제거와 모두 문자열로 변
-pm['part_type'] = pm['part_type'].astype(str).str.strip()  # part_type 공백 제거/문자열화
-schema_ok['part_type'] = schema_ok['part_type'].astype(str).str.strip()  # OK 스키마도 동일 정리
-# (참고) schema_ik도 동일 정리가 필요할 수 있으나, 현 코드에선 OK만 처리
-
-# ── 4. 파싱 (part_type 수준 – 11자리 없음) ───────────────────
-rows = []  # 결과 행들을 담을 리스트(나중에 DataFrame으로 변환)
-for _, row in pm.iterrows():
-    ptype   = row.part_type          # 현재 행의 품명군(ex. V111)
-    system  = row.system             # IK/OK
-    # 시스템에 따라 해당 스키마에서, 현재 ptype에 해당하는 규칙들만 필터링
-    rules_src = schema_ik if system == 'IK' else schema_ok
-    
-    # 1) 스키마: 정확 → (IK)그룹 순으로 찾기
-    rules = pd.DataFrame()
-    for key in candidate_keys(system, ptype):
-        rules = rules_src[rules_src.part_type == key]
-        if not rules.empty:
-            break
-    
-    if rules.empty:
-        rows.append({**row.to_dict(), '_parse_error': f'NO_SCHEMA({"/".join(candidate_keys(system, ptype))})'})
-        continue
-    
-    # 2) 속성 메타 생성: (정확 + 그룹 + 공통)의 합집합을 옵션으로
-    parsed = row.to_dict()
-    for _, r in rules.iterrows():
-        table = r.lookup_table
-        if table in LOOKUP_MAP:
-            spec, common = LOOKUP_MAP[table]
-            cand = set(candidate_keys(system, ptype))
-            spec_codes = {code for (pt, code) in spec.keys() if pt in cand}
-            parsed[r.attr_name] = '|'.join(sorted(spec_codes | set(common.keys())))
-        else:
-            parsed[r.attr_name] = '(free)'
-    rows.append(parsed)
-
-
-# utils/parsers.py 내부 -----------------------
-def split_vcode(code: str) -> dict:
+    rules_by_site = {site: _schema_rules(schemas.get(site)) for site in ("IK", "OK")}
+    combo = pm["system"] + "\x1f" + pm["part_type"]
+    codes, uniques = pd.factorize(combo, sort=False)
+    combos = []
+    for u in uniques:
+        system, ptype = u.split("\x1f", 1)
+        keys = candidate_keys(system, ptype)
+        rules = next((rules_by_site[system][k] for k in keys if k in rules_by_site[system]), None)
+        combos.append((system, ptype, keys, rules))
+    return codes, combos
+
+
+def parsed_columns(combos) -> List[str]:
+    """파싱으로 새로 붙는 컬럼 순서 = 행 순서대로 처음 등장한 순 (행 dict 목록을 DataFrame으로 만들 때와 동일)"""
+    new_cols: Dict[str, None] = {}
+    for _, _, _, rules in combos:
+        for c in ([attr for attr, _ in rules] if rules is not None else ["_parse_error"]):
+            new_cols.setdefault(c, None)
+    return list(new_cols)
+
+
+def parse_parts(part_master: pd.DataFrame, schemas: Dict[str, pd.DataFrame],
+                lookups: Dict[str, dict]) -> pd.DataFrame:
     """
-    11자리 V-Code를 파싱해 dict로 반환
-    자리 구성: [0:4]=part_type(4), [4:6]=material(2), [6]=surface(1), [7]=grade(1), [8:11]=size(3)
+    part_master 각 행에 스키마 속성별 '가능 코드 집합'을 붙인 parsed_parts 프레임 반환
+    - schemas: {"IK": codeSchema_IK, "OK": codeSchema_OK}
+    - lookups: load_lookup_tables() 결과 {테이블명: {spec, common, value_col, options}}
+    - 스키마는 정확(V111) → (IK)그룹(V11) 순으로 찾고, 없으면 _parse_error = NO_SCHEMA(키들)
+    - 룩업 속성 값 = 정확 + 그룹 + 공통 코드의 정렬 합집합('|' 연결), 룩업 없는 속성은 '(free)'
+    행마다 스키마를 다시 거르지 않고, 고유 (system, part_type) 조합만 해석해 열 단위로 펼친다.
     """
-    ptype = code[:4]     # V111 (4자리)
-    material = code[4:6] # 재질 코드(2자리)
-    surface  = code[6]   # 표면 코드(1자리)
-    grade    = code[7]   # 호칭/등급(1자리)
-    size     = code[8:11]# 길이/사이즈(3자리)
+    pm = normalize_master(part_master)
+    codes, combos = resolve_schema_combos(pm, schemas)
+    joined: Dict[Tuple[str, str], str] = {}          # (테이블, part_type) → '코드|코드|...'
+
+    def _codes(table: str, ptype: str) -> str:
+        key = (table, ptype.upper())                 # (part_type, 테이블)별 코드 집합은 한 번만 정렬/연결
+        if key not in joined:
+            joined[key] = "|".join(sorted(resolve_options(lookups[table], ptype)))
+        return joined[key]
+
+    # 고유 (system, part_type) 조합 → 속성 dict (또는 파싱 오류)
+    resolved: List[Dict[str, str]] = []
+    for system, ptype, keys, rules in combos:
+        if rules is None:
+            resolved.append({"_parse_error": f'NO_SCHEMA({"/".join(keys)})'})
+            continue
+        parsed: Dict[str, str] = {}
+        for attr, table in rules:
+            # 자리 토큰이 없으므로 '가능 코드 집합'만 표시
+            parsed[attr] = _codes(table, ptype) if table in lookups else "(free)"
+        resolved.append(parsed)
+
+    out = pm.reset_index(drop=True)
+    extra = {}
+    for c in parsed_columns(combos):
+        per_combo = np.array([d.get(c, np.nan) for d in resolved], dtype=object)
+        extra[c] = per_combo[codes]
+    if extra:
+        out = pd.concat([out, pd.DataFrame(extra, index=out.index)], axis=1)
+    return out
+
+
+# ── 3. 입력 적재 / 저장 ──────────────────────────────────────
+def load_schemas(paths: Dict[str, Path]) -> Dict[str, pd.DataFrame]:
+    """{"IK": codeSchema_IK, "OK": codeSchema_OK} (문자열로 읽음)"""
     return {
-        "part_type": ptype,
-        "material_cd": material,
-        "surface_cd": surface,
-        "grade_cd": grade,
-        "size_cd": size
+        "IK": pd.read_csv(paths["schema_ik"], dtype=str),
+        "OK": pd.read_csv(paths["schema_ok"], dtype=str),
     }
-# --------------------------------------------
 
-# csv 저장
-out_df = pd.DataFrame(rows)  # rows를 DataFrame으로 변환
-out_df.to_csv(OUT_CSV, index=False, encoding='cp949')  # 최종 메타 결과를 CP949로 저장(윈도우/한글 환경)
-print(f"✅  part_type 수준 메타 출력 완료 → {OUT_CSV}")  # 완료 로그
+def load_inputs(paths: Dict[str, Path]) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame], Dict[str, dict]]:
+    """(part_master, schemas, lookups) 적재 — 모두 문자열로 읽음, 없는 룩업 파일은 건너뜀"""
+    pm = pd.read_csv(paths["part_master"], dtype=str)
+    return pm, load_schemas(paths), load_lookup_tables(paths["lookup_dir"])
+
+
+def lookup(lookups: Dict[str, dict], table_name: str, ptype: str, token: str) -> str:
+    """값 1개 조회: 정확(part_type) → (IK)그룹(Vxx) → 공통*, 없으면 UNKNOWN(코드)"""
+    v = lookup_label(lookups.get(table_name), ptype, token)
+    return v if v else f'UNKNOWN({token})'
+
+
+# ── 4. 11자리 코드 분해 (스키마 기반, 대량) ──────────────────
+def _pos(x) -> int | None:
+    """'5', '5.0' → 5 (비었거나 숫자가 아니면 None)"""
+    try:
+        return int(float(str(x).strip()))
+    except (TypeError, ValueError):
+        return None
+
+
+class CodeSplitter:
+    """
+    codeSchema_IK/OK 의 pos_from/pos_to 로 11자리 코드를 속성 토큰으로 분해 (읽기 전용, 재사용)
+    - part_type: 스키마에 있는 part_type 중 최장 접두(PartTypeIndex)로 결정 → 품명군마다 다른 자리 구성 반영
+    - 같은 part_type 코드끼리 묶어 자리별 문자열 슬라이스를 열 단위로 수행
+    - 룩업 속성은 <attr>_label 컬럼에 라벨(정확 > 그룹 > 공통), 없는 코드는 UNKNOWN(토큰)
+    - 출력 컬럼은 스키마 전체 속성 기준으로 고정 → 청크마다 같은 헤더(스트리밍 저장 가능)
+    """
+
+    def __init__(self, schemas: Dict[str, pd.DataFrame], lookups: Dict[str, dict]):
+        self.lookups = lookups
+        self.rules: Dict[Tuple[str, str], List[Tuple[str, int, int, str]]] = {}   # (site, pt) → [(attr, 시작, 끝, 테이블)]
+        self.index = PartTypeIndex()
+        attrs: Dict[str, None] = {}
+        labeled: Dict[str, None] = {}
+        for site in ("IK", "OK"):
+            schema = schemas.get(site)
+            if schema is None or schema.empty:
+                continue
+            tables = schema["lookup_table"] if "lookup_table" in schema.columns else pd.Series("", index=schema.index)
+            for pt, a, b, attr, table in zip(schema["part_type"], schema["pos_from"], schema["pos_to"],
+                                             schema["attr_name"], tables.where(tables.notna(), "")):
+                pt = str(pt).strip().upper()
+                a, b = _pos(a), _pos(b)
+                if not pt or a is None or b is None or b < a:
+                    continue
+                self.rules.setdefault((site, pt), []).append((str(attr), a - 1, b, str(table)))
+                self.index.add(pt, site)
+                attrs.setdefault(str(attr), None)
+                if table in lookups:
+                    labeled.setdefault(str(attr), None)
+        self.attrs = list(attrs)
+        self.columns = (["code", "site", "part_type"] + self.attrs
+                        + [f"{a}_label" for a in labeled] + ["_unknown", "_parse_error"])
+
+    def split(self, codes, side: str | None = None) -> pd.DataFrame:
+        """
+        코드 컬럼 → DataFrame[code, site, part_type, <attr>..., <attr>_label..., _unknown, _parse_error]
+        - side: 'IK'/'OK' 고정 (None이면 'V'로 시작하면 IK)
+        - _unknown: 룩업에 없는 토큰의 속성명('|' 연결), _parse_error: NO_SCHEMA / SHORT_CODE(n)
+        """
+        ser = codes if isinstance(codes, pd.Series) else pd.Series(list(codes))
+        ser = ser.reset_index(drop=True)
+        norm = ser.fillna("").astype(str).str.strip().str.upper()
+        n = len(norm)
+        codes_f, uniq = pd.factorize(norm, sort=False)
+        if len(uniq) * 2 < n:
+            # 반복 코드가 많은 추출본: 고유 코드만 분해하고 행 번호로 펼침
+            out = self.split(pd.Series(uniq, dtype=object), side=side)
+            return out.take(codes_f).reset_index(drop=True)
+        hits = self.index.resolve_many(norm, side=side)
+
+        cols: Dict[str, np.ndarray] = {c: np.full(n, None, dtype=object) for c in self.columns}
+        cols["code"] = norm.to_numpy(dtype=object)
+        cols["site"] = hits["site"].to_numpy(dtype=object, na_value=None)
+        cols["part_type"] = hits["part_type"].to_numpy(dtype=object, na_value=None)
+        unknown = np.full(n, "", dtype=object)
+        errors = cols["_parse_error"]
+        errors[hits["part_type"].isna().to_numpy()] = "NO_SCHEMA"
+
+        keys = hits["site"].fillna("") + "\x1f" + hits["part_type"].fillna("")
+        group_codes, uniques = pd.factorize(keys, sort=False)
+        lengths = norm.str.len().to_numpy()
+        for gi, key in enumerate(uniques):
+            site, pt = key.split("\x1f", 1)
+            rules = self.rules.get((site, pt))
+            if not rules:
+                continue
+            rows = np.flatnonzero(group_codes == gi)
+            sub = norm.iloc[rows]
+            need = max(b for _, _, b, _ in rules)
+            short = lengths[rows] < need
+            if short.any():
+                errors[rows[short]] = [f"SHORT_CODE({k})" for k in lengths[rows[short]]]
+            for attr, a, b, table in rules:
+                tok = sub.str.slice(a, b)
+                cols[attr][rows] = tok.to_numpy(dtype=object)
+                if table not in self.lookups:
+                    continue
+                labels = tok.map(resolve_options(self.lookups[table], pt))
+                miss = labels.isna().to_numpy() & (tok.str.len().to_numpy() > 0)
+                lab = labels.to_numpy(dtype=object)
+                if miss.any():
+                    lab[miss] = [f"UNKNOWN({t})" for t in tok.to_numpy()[miss]]
+                    unknown[rows[miss]] += attr + "|"
+                cols[f"{attr}_label"][rows] = lab
+
+        cols["_unknown"] = np.array([u[:-1] for u in unknown], dtype=object)
+        return pd.DataFrame(cols, columns=self.columns, dtype=object)
+
+    def split_one(self, code: str, side: str | None = None) -> dict:
+        """코드 1개 분해 결과 dict (None 값은 제외)"""
+        row = self.split([code], side=side).iloc[0]
+        return {k: v for k, v in row.items() if v is not None and v == v}
+
+    def split_csv(self, in_path, out_path, code_col: str = "code", side: str | None = None,
+                  chunksize: int = 200_000, encoding: str = "utf-8-sig", sep: str = ","):
+        """
+        대용량 CSV를 청크 단위로 읽어 분해 결과를 out_path에 이어 씀(메모리 일정).
+        진행 상황으로 (누적 행 수, UNKNOWN 포함 행 수, 오류 행 수)를 청크마다 yield
+        """
+        done = unknown = failed = 0
+        reader = pd.read_csv(in_path, dtype=str, sep=sep, encoding=encoding,
+                             usecols=[code_col], chunksize=chunksize)
+        for i, chunk in enumerate(reader):
+            out = self.split(chunk[code_col], side=side)
+            out.to_csv(out_path, index=False, mode="w" if i == 0 else "a", header=(i == 0),
+                       encoding=encoding if i == 0 else encoding.replace("-sig", ""))
+            done += len(out)
+            unknown += int((out["_unknown"] != "").sum())
+            failed += int(out["_parse_error"].notna().sum())
+            yield done, unknown, failed
+        if done == 0:
+            pd.DataFrame(columns=self.columns).to_csv(out_path, index=False, encoding=encoding)
+
+
+def split_vcode(code: str, splitter: CodeSplitter, side: str | None = None) -> dict:
+    """
+    11자리 코드를 파싱해 dict로 반환 (자리 구성은 해당 part_type의 codeSchema 규칙)
+    예: {'code': 'V111...', 'site': 'IK', 'part_type': 'V111', 'material_code': '3', 'material_code_label': 'S45C', ...}
+    """
+    return splitter.split_one(code, side=side)
+
+
+def split_main(argv=None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m utils.parsers split",
+                                 description="11자리 코드 CSV → 스키마 기반 속성/라벨 분해 (청크 스트리밍)")
+    ap.add_argument("input", help="코드 컬럼이 있는 CSV/TSV")
+    ap.add_argument("--col", default="code", help="코드 컬럼명 (기본 code)")
+    ap.add_argument("--out", required=True, help="출력 CSV 경로")
+    ap.add_argument("--side", choices=["IK", "OK"], help="사이트 고정 (기본: 'V'로 시작하면 IK)")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="스키마/룩업 폴더 (기본 scripts/data)")
+    ap.add_argument("--chunksize", type=int, default=200_000)
+    ap.add_argument("--encoding", default="utf-8-sig")
+    args = ap.parse_args(argv)
+
+    paths = default_paths(Path(args.data_dir))
+    splitter = CodeSplitter(load_schemas(paths), load_lookup_tables(paths["lookup_dir"]))
+    sep = "\t" if str(args.input).lower().endswith((".tsv", ".txt")) else ","
+    done = unknown = failed = 0
+    for done, unknown, failed in splitter.split_csv(args.input, args.out, code_col=args.col, side=args.side,
+                                                    chunksize=args.chunksize, encoding=args.encoding, sep=sep):
+        print(f"  … {done:,}행 (UNKNOWN {unknown:,} / 오류 {failed:,})", flush=True)
+    print(f"✅  코드 분해 완료 → {args.out}  ({done:,}행, UNKNOWN {unknown:,}, 오류 {failed:,})")
+
+
+def main(argv=None) -> pd.DataFrame | None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["split"]:
+        return split_main(argv[1:])
+    ap = argparse.ArgumentParser(description="part_master → parsed_parts.csv (part_type 수준 메타)")
+    ap.add_argument("--data-dir", default=str(DATA_DIR), help="입력 CSV 폴더 (기본 scripts/data)")
+    ap.add_argument("--part-master", help="part_master.csv 경로 (기본 <data-dir>/part_master.csv)")
+    ap.add_argument("--lookup-dir", help="룩업 폴더 (기본 <data-dir>/lookup)")
+    ap.add_argument("--out", help="출력 경로 (기본 <data-dir>/parsed_parts.csv)")
+    ap.add_argument("--encoding", default="cp949", help="출력 인코딩 (기본 cp949, 윈도우/한글 환경)")
+    args = ap.parse_args(argv)
+
+    paths = default_paths(Path(args.data_dir))
+    for k, v in (("part_master", args.part_master), ("lookup_dir", args.lookup_dir), ("out", args.out)):
+        if v:
+            paths[k] = Path(v)
+
+    pm, schemas, lookups = load_inputs(paths)
+    out_df = parse_parts(pm, schemas, lookups)
+    out_df.to_csv(paths["out"], index=False, encoding=args.encoding)
+    print(f"✅  part_type 수준 메타 출력 완료 → {paths['out']}  ({len(out_df)}행)")
+    return out_df
+
 
-#split_vcode("V11101234567")  # 예시 호출(주석 처리)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# utils/prefetch.py
+# -*- coding: utf-8 -*-
+"""
+이미지 탐색/디코드 병렬화 + 프리페치 (IK/OK 패널)
+
+- 공유 스레드 풀(VCODE_IMAGE_WORKERS, 기본 4)에서
+  · 사이트별 탐색(매니페스트 조회 — 첫 스캔은 볼륨 I/O)  → 작업 1개
+  · 이미지별 썸네일 디코드/생성(thumbnails.try_thumbnail) → 작업 1개씩
+  사이트 작업은 썸네일 작업을 '제출만' 하고 기다리지 않는다 (풀 안에서 서로 기다리는 교착 없음)
+- pair가 정해지자마자 prefetch_images()로 양쪽을 시작 → 사용자가 폼을 채우는 동안 진행,
+  패널을 그릴 때 collect_images()로 결과만 모은다
+- 같은 요청이 진행 중이면 그 Future를 공유 (재실행이 겹쳐도 중복 디코드 없음)
+- 손상/없는 파일은 결과에서 빠짐 (페이지 흐름은 그대로)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Tuple, Union
+
+from utils.images import find_images_with_prefix_fallback
+from utils.thumbnails import GRID_SIZE, thumbnail_store
+
+IMAGE_WORKERS = max(1, int(os.environ.get("VCODE_IMAGE_WORKERS", "4") or 4))
+
+_POOL = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="vcode-img")
+_INFLIGHT: Dict[tuple, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+class SiteImages(NamedTuple):
+    used_key: str | None          # 개별이면 part_code, 접두 공유면 그 접두, 없으면 None
+    sources: List[Path]           # 원본 경로 (확대 보기용)
+    thumbs: List[Future]          # 원본별 썸네일 Future → Path | None(손상)
+
+
+def _shared(key: tuple, fn: Callable, *args) -> Future:
+    """key가 진행 중이면 그 Future, 아니면 새로 제출 (끝나면 목록에서 제거)"""
+    with _INFLIGHT_LOCK:
+        fut = _INFLIGHT.get(key)
+        if fut is not None:
+            return fut
+        fut = _INFLIGHT[key] = _POOL.submit(fn, *args)
+
+    def _done(_f, key=key):
+        with _INFLIGHT_LOCK:
+            if _INFLIGHT.get(key) is _f:
+                del _INFLIGHT[key]
+    fut.add_done_callback(_done)
+    return fut
+
+
+def submit_thumbnail(src: Union[str, Path], size: int = GRID_SIZE,
+                     images_dir: Union[str, Path] = "images") -> Future:
+    """썸네일 생성을 풀에 제출 → Future[Path | None]"""
+    store = thumbnail_store(images_dir)
+    return _shared(("thumb", str(src), size, str(store.dir)), store.try_thumbnail, Path(src), size)
+
+
+def _discover(part_code: str, site: str, images_dir: str, max_n: int, min_prefix_len: int,
+              size: int, single_size: int) -> SiteImages:
+    imgs, used_key = find_images_with_prefix_fallback(
+        part_code=part_code, site=site, base_dir=images_dir, max_n=max_n, min_prefix_len=min_prefix_len,
+    )
+    sz = size if len(imgs) > 1 else single_size
+    return SiteImages(used_key, imgs, [submit_thumbnail(p, sz, images_dir) for p in imgs])
+
+
+def prefetch_images(part_code: str, site: str, images_dir: Union[str, Path] = "images",
+                    max_n: int = 5, min_prefix_len: int = 3,
+                    size: int = GRID_SIZE, single_size: int | None = None) -> Future:
+    """
+    part_code 이미지 탐색 + 썸네일 생성을 백그라운드로 시작 → Future[SiteImages]
+    - single_size: 이미지가 1장뿐일 때 쓸 썸네일 크기 (기본 size)
+    """
+    args = ((part_code or "").strip(), (site or "").strip(), os.path.abspath(images_dir),
+            max_n, min_prefix_len, size, single_size or size)
+    return _shared(("site",) + args, _discover, *args)
+
+
+def collect_images(fut: Future, timeout: float | None = None) -> Tuple[List[Tuple[Path, Path]], str | None]:
+    """
+    prefetch_images 결과 → ([(원본, 썸네일)], used_key)
+    - 손상 파일/실패한 썸네일은 제외
+    - timeout(초) 안에 탐색이 끝나지 않으면 빈 결과
+    """
+    try:
+        si: SiteImages = fut.result(timeout)
+    except Exception:
+        return [], None
+    pairs = []
+    for src, tf in zip(si.sources, si.thumbs):
+        try:
+            th = tf.result(timeout)
+        except Exception:
+            th = None
+        if th is not None:
+            pairs.append((src, th))
+    return pairs, si.used_key
@@ -0,0 +1,217 @@
+# utils/prefix_index.py
+# -*- coding: utf-8 -*-
+"""
+11자리 원시 코드 → part_type 최장 접두 매칭 인덱스
+
+- 출처: part_master(카탈로그), Cross_Map(ik2ok/ok2ik), union_schema 의 IK/OK part_type
+- IK는 V### 정확키 외에 V## 그룹키(V111 → V11)도 함께 등록 (group=True)
+- 단건: 문자 트라이를 따라 내려가며 마지막 종단 노드 채택 → O(코드 길이)
+- 대량: 접두 길이별 사전으로 코드 컬럼 전체를 한 번에 조회 (resolve_many)
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+V3_RE = re.compile(r"^(V)(\d{2})(\d)$", re.IGNORECASE)  # V111, V802 ...
+
+SITES = ("IK", "OK")
+
+
+class PartTypeHit(NamedTuple):
+    part_type: str
+    site: str          # "IK" / "OK"
+    group: bool        # True면 V## 그룹키로 매칭된 것
+
+
+def _norm_pt(x) -> str:
+    """' 2655.0 ' → '2655', 전각 공백 제거, 대문자화"""
+    if x is None:
+        return ""
+    try:
+        if pd.isna(x):
+            return ""
+    except (TypeError, ValueError):
+        pass
+    s = str(x).strip().replace("　", "").upper()
+    return s[:-2] if s.endswith(".0") else s
+
+
+def _norm_pt_many(ser: pd.Series) -> pd.Series:
+    """_norm_pt 의 열 단위 버전 (문자열 연산만 사용)"""
+    s = ser.astype(object).where(ser.notna(), "").astype(str)
+    s = s.str.strip().str.replace("　", "", regex=False).str.upper()
+    return s.where(~s.str.endswith(".0"), s.str[:-2])
+
+
+def site_of(pt: str) -> str:
+    """part_type/코드 → "IK"(V로 시작) / "OK" (카탈로그 색인·검색·서비스 공용 규칙)"""
+    return "IK" if pt.startswith("V") else "OK"
+
+
+def str_column(df: pd.DataFrame, name: str) -> List[str]:
+    """컬럼 → 공백 제거 문자열 리스트 (컬럼이 없거나 결측이면 "")"""
+    if name not in df.columns:
+        return [""] * len(df)
+    return df[name].fillna("").astype(str).str.strip().tolist()
+
+
+def _norm_side(side: str | None) -> str | None:
+    if side is None:
+        return None
+    s = str(side).strip().upper()
+    return {"IKSAN": "IK", "OKCHEON": "OK"}.get(s, s)
+
+
+class PartTypeIndex:
+    """part_type 접두 트라이 (불변으로 취급: 빌드 후 add 하지 않는 것을 전제로 캐시)"""
+
+    _END = "\0"   # 트라이 노드 내 종단 정보 키 → {site: PartTypeHit}
+
+    def __init__(self):
+        self._root: Dict[str, dict] = {}
+        self._by_len: Dict[str, Dict[int, Dict[str, PartTypeHit]]] = {s: {} for s in SITES}
+
+    def __len__(self) -> int:
+        return sum(len(d) for by in self._by_len.values() for d in by.values())
+
+    def add(self, part_type: str, site: str | None = None, group: bool = False) -> None:
+        pt = _norm_pt(part_type)
+        if not pt:
+            return
+        site = _norm_side(site) or site_of(pt)
+        node = self._root
+        for ch in pt:
+            node = node.setdefault(ch, {})
+        ends = node.setdefault(self._END, {})
+        prev = ends.get(site)
+        # 같은 키가 정확키/그룹키로 모두 들어오면 정확키 우선
+        if prev is None or (prev.group and not group):
+            hit = PartTypeHit(pt, site, group)
+            ends[site] = hit
+            self._by_len[site].setdefault(len(pt), {})[pt] = hit
+
+    def matches(self, code: str, side: str | None = None) -> List[PartTypeHit]:
+        """code 앞부분과 일치하는 모든 part_type (긴 것부터)"""
+        s = _norm_pt(code)
+        side = _norm_side(side)
+        out: List[PartTypeHit] = []
+        node = self._root
+        for ch in s:
+            node = node.get(ch)
+            if node is None:
+                break
+            ends = node.get(self._END)
+            if ends:
+                out.extend(h for site, h in ends.items() if side is None or site == side)
+        out.reverse()
+        return out
+
+    def resolve(self, code: str, side: str | None = None) -> PartTypeHit | None:
+        """최장 접두 part_type 1건 (없으면 None)"""
+        s = _norm_pt(code)
+        side = _norm_side(side)
+        best = None
+        node = self._root
+        for ch in s:
+            node = node.get(ch)
+            if node is None:
+                break
+            ends = node.get(self._END)
+            if ends:
+                hit = ends.get(side) if side else next(iter(ends.values()))
+                if hit is not None:
+                    best = hit
+        return best
+
+    def resolve_many(self, codes, side: str | None = None) -> pd.DataFrame:
+        """
+        코드 컬럼 전체를 최장 접두로 분류.
+        side=None 이면 'V'로 시작하는 코드는 IK, 나머지는 OK 로 본다.
+        반환: DataFrame[part_type, site, group] (index = codes index, 미매칭 행은 None)
+        """
+        ser = codes if isinstance(codes, pd.Series) else pd.Series(list(codes))
+        norm = _norm_pt_many(ser).to_numpy(dtype=object)
+        n = len(norm)
+        pts = np.full(n, None, dtype=object)
+        groups = np.full(n, None, dtype=object)
+        side = _norm_side(side)
+        if side is None:
+            is_ik = np.fromiter((c.startswith("V") for c in norm), dtype=bool, count=n)
+            sides = np.where(is_ik, "IK", "OK")
+        else:
+            sides = np.full(n, side, dtype=object)
+
+        arr = np.asarray(norm, dtype=str) if n else np.array([], dtype="<U1")
+        for site in SITES:
+            by_len = self._by_len.get(site, {})
+            todo = sides == site
+            for L in sorted(by_len, reverse=True):
+                rows = np.flatnonzero(todo & (pts == None))  # noqa: E711
+                if not len(rows):
+                    break
+                table = by_len[L]
+                keys = list(table)
+                pref = arr[rows].astype(f"<U{L}")   # 앞 L글자 (짧은 코드는 그대로 → 불일치)
+                pos = pd.Index(keys).get_indexer(pref)
+                ok = pos >= 0
+                hit_rows = rows[ok]
+                pts[hit_rows] = [keys[i] for i in pos[ok]]
+                groups[hit_rows] = [table[keys[i]].group for i in pos[ok]]
+
+        site_col = np.where(pts != None, sides, None)  # noqa: E711
+        return pd.DataFrame({"part_type": pts, "site": site_col, "group": groups}, index=ser.index)
+
+
+def ik_group_key(ptype: str) -> str:
+    """V111 -> V11 (이미 V11이면 그대로)"""
+    s = (ptype or "").strip().upper()
+    m3 = V3_RE.match(s)
+    return f"{m3.group(1)}{m3.group(2)}" if m3 else s
+
+
+def _iter_part_types(catalog: pd.DataFrame | None,
+                     crossmap: Tuple[dict, dict] | None,
+                     union_df: pd.DataFrame | None) -> Iterable[Tuple[str, str | None]]:
+    if catalog is not None and "part_type" in catalog.columns:
+        sites = catalog["site"] if "site" in catalog.columns else [None] * len(catalog)
+        for pt, site in zip(catalog["part_type"].tolist(), list(sites)):
+            # site 값이 IKSAN/OKCHEON 외의 표기면 part_type 모양으로 판별
+            s = _norm_side(site)
+            yield pt, (s if s in SITES else None)
+    if crossmap is not None:
+        ik2ok, ok2ik = crossmap
+        for ik, ok in list(ik2ok.items()) + [(v, k) for k, v in ok2ik.items()]:
+            yield ik, "IK"
+            yield ok, "OK"
+    if union_df is not None:
+        for c, site in (("ik_part_type", "IK"), ("ok_part_type", "OK")):
+            if c in union_df.columns:
+                for pt in union_df[c].unique().tolist():
+                    yield pt, site
+
+
+def build_part_type_index(catalog: pd.DataFrame | None = None,
+                          crossmap: Tuple[dict, dict] | None = None,
+                          union_df: pd.DataFrame | None = None) -> PartTypeIndex:
+    """
+    part_master / Cross_Map(ik2ok, ok2ik) / union_schema 에서 part_type을 모아 인덱스 구성
+    - IK part_type(V###)은 V## 그룹키도 group=True 로 함께 등록
+    """
+    idx = PartTypeIndex()
+    seen = set()
+    for pt, site in _iter_part_types(catalog, crossmap, union_df):
+        p = _norm_pt(pt)
+        if not p or (p, site) in seen:
+            continue
+        seen.add((p, site))
+        idx.add(p, site)
+        if (site or site_of(p)) == "IK":
+            g = ik_group_key(p)
+            if g != p:
+                idx.add(g, "IK", group=True)
+    return idx
@@ -0,0 +1,204 @@
+# utils/refstore.py
+# -*- coding: utf-8 -*-
+"""
+참조 데이터 저장소 + 파일 감시 기반 선택적 무효화 (streamlit 비의존)
+
+- 항목(item) = 이름 + 빌드 함수 + 의존(원본 파일 / 다른 항목)
+- 값은 "세대(generation)" 사전에 담기고, 조회는 현재 세대에서 꺼내기만 한다
+- 원본 파일이 바뀌면 그 파일에서 파생된 항목(+전이 의존 항목)만 백그라운드에서 새 세대로 다시 만들고,
+  다 만들어진 뒤 세대 참조를 한 번에 교체 → 진행 중인 세션은 교체 전까지 이전 세대 값을 그대로 사용
+- 감시: watchdog(inotify 등)이 설치돼 있으면 이벤트로 즉시 깨우고, 없으면 mtime 폴링만 사용
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class _Item:
+    __slots__ = ("name", "build", "files", "deps")
+
+    def __init__(self, name: str, build: Callable[["RefStore"], Any],
+                 files: Iterable[Path], deps: Iterable[str]):
+        self.name = name
+        self.build = build
+        self.files = tuple(Path(p) for p in files)
+        self.deps = tuple(deps)
+
+
+class _Generation:
+    __slots__ = ("version", "values")
+
+    def __init__(self, version: int, values: Dict[str, Any]):
+        self.version = version
+        self.values = values
+
+
+class RefStore:
+    """
+    사용 예:
+        store.register("Cross_Map", lambda s: read_csv_safe(p), files=[p])
+        store.register("crossmap", lambda s: to_dicts(s.get("Cross_Map")), deps=["Cross_Map"])
+        store.get("crossmap")
+    빌드 함수는 store를 인자로 받아 의존 항목을 store.get()으로 가져온다.
+    """
+
+    def __init__(self):
+        self._items: Dict[str, _Item] = {}
+        self._gen = _Generation(0, {})
+        self._build_lock = threading.RLock()    # 빌드/교체 직렬화 (조회는 잠금 없음)
+        self._local = threading.local()         # 재빌드 중인 스레드가 보는 새 세대
+        self._stats: Dict[str, Tuple[int, int] | None] = {}
+        self._watcher: threading.Thread | None = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.listeners: List[Callable[[Set[str], Set[str]], None]] = []   # (바뀐 파일, 재빌드 항목)
+
+    # ---------------- 등록/조회 ----------------
+    def register(self, name: str, build: Callable[["RefStore"], Any],
+                 files: Iterable[Path] = (), deps: Iterable[str] = ()) -> None:
+        self._items[name] = _Item(name, build, files, deps)
+        for p in self._items[name].files:
+            self._stats.setdefault(str(p), _stat(p))
+
+    @property
+    def version(self) -> int:
+        return self._gen.version
+
+    def seed(self, values: Dict[str, Any]) -> None:
+        """미리 만들어 둔 값(스냅샷 등)을 현재 세대에 주입"""
+        with self._build_lock:
+            self._gen.values.update({k: v for k, v in values.items() if k in self._items})
+
+    def get(self, name: str) -> Any:
+        gen = getattr(self._local, "gen", None) or self._gen
+        v = gen.values.get(name, _MISSING)
+        if v is not _MISSING:
+            return v
+        with self._build_lock:
+            gen = getattr(self._local, "gen", None) or self._gen
+            v = gen.values.get(name, _MISSING)
+            if v is _MISSING:
+                v = self._items[name].build(self)
+                gen.values[name] = v      # 새 키 추가만 하므로 읽는 쪽과 충돌 없음
+            return v
+
+    # ---------------- 무효화 ----------------
+    def _affected(self, changed: Set[str]) -> Set[str]:
+        hit = {n for n, it in self._items.items() if any(str(p) in changed for p in it.files)}
+        grew = True
+        while grew:
+            grew = False
+            for n, it in self._items.items():
+                if n not in hit and any(d in hit for d in it.deps):
+                    hit.add(n)
+                    grew = True
+        return hit
+
+    def refresh(self, changed_files: Iterable[Path | str]) -> Set[str]:
+        """
+        바뀐 파일에서 파생된 항목만 새 세대에서 다시 빌드한 뒤 세대를 교체.
+        (이전 세대에서 한 번도 쓰이지 않은 항목은 지연 빌드로 남겨 둠)
+        """
+        changed = {str(p) for p in changed_files}
+        affected = self._affected(changed)
+        if not affected:
+            return set()
+        with self._build_lock:
+            old = self._gen
+            new = _Generation(old.version + 1,
+                              {k: v for k, v in old.values.items() if k not in affected})
+            rebuild = [n for n in self._items if n in affected and n in old.values]
+            self._local.gen = new
+            try:
+                for n in rebuild:
+                    self.get(n)
+            except Exception:
+                # 빌드 실패(편집 도중의 깨진 CSV 등) → 이전 세대를 계속 사용, 다음 변경 때 재시도
+                log.exception("reference refresh failed; keeping version %s", old.version)
+                return set()
+            finally:
+                self._local.gen = None
+            self._gen = new                      # 원자적 교체
+        for fn in list(self.listeners):
+            try:
+                fn(changed, affected)
+            except Exception:
+                log.exception("reference refresh listener failed")
+        return affected
+
+    def check(self) -> Set[str]:
+        """등록된 파일의 (size, mtime)을 비교해 바뀐 것만 refresh"""
+        changed = set()
+        for p, old in list(self._stats.items()):
+            cur = _stat(p)
+            if cur != old:
+                self._stats[p] = cur
+                changed.add(p)
+        return self.refresh(changed) if changed else set()
+
+    # ---------------- 감시 스레드 ----------------
+    def start_watcher(self, interval: float = 2.0, dirs: Iterable[Path] = ()) -> None:
+        """백그라운드 감시 시작(중복 호출 무시). interval<=0 이면 감시하지 않음"""
+        if interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        self._observe(dirs)
+        self._watcher = threading.Thread(target=self._run, args=(interval,),
+                                         name="refstore-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _observe(self, dirs: Iterable[Path]) -> None:
+        """watchdog이 있으면 디렉토리 이벤트로 감시 스레드를 즉시 깨움 (없으면 폴링만)"""
+        dirs = [Path(d) for d in dirs if Path(d).is_dir()]
+        if not dirs:
+            return
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            return
+        wake = self._wake
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+
+        obs = Observer()
+        for d in dirs:
+            obs.schedule(_Handler(), str(d), recursive=False)
+        obs.daemon = True
+        try:
+            obs.start()
+        except OSError:
+            pass
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.is_set():
+            woke = self._wake.wait(interval)
+            if woke:
+                self._wake.clear()
+                self._stop.wait(0.5)          # 저장 중인 파일이 다 써질 때까지 잠깐 대기(디바운스)
+            try:
+                self.check()
+            except Exception:
+                log.exception("reference watcher check failed")
+
+
+def _stat(p) -> Tuple[int, int] | None:
+    try:
+        st = os.stat(p)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
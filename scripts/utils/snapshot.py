@@ -0,0 +1,170 @@
+# utils/snapshot.py
+# -*- coding: utf-8 -*-
+"""
+참조 데이터 스냅샷 (콜드 스타트 가속)
+
+part_master / Cross_Map / union_schema / codeSchema_IK·OK / lookup 7종을 한 번 파싱한 결과를
+하나의 pickle 파일로 저장해 두고, 다음 기동부터는 파싱 없이 한 번에 읽는다.
+
+파일 구성 (한 파일에 pickle 2개 연속):
+  1) header : {format, pandas, code, source_hash, stats}
+  2) payload: {이름: 파싱 결과}
+- code: 파싱/파생 구조를 만드는 모듈 소스의 해시 → 배포로 빌더 코드가 바뀌면 스냅샷을 버리고 재빌드
+- stats(경로별 size/mtime_ns)가 그대로면 해시 계산 없이 바로 사용
+- stats가 달라졌으면 원본 바이트의 sha256(source_hash)을 다시 계산해 비교 → 다를 때만 재빌드
+- 스냅샷 디렉토리에 쓸 수 없으면 메모리 결과만 반환
+
+직접 실행(빌드 단계):
+    python -m utils.snapshot            # scripts/ 에서, 기본 data/ 기준
+    python -m utils.snapshot --force    # 강제 재빌드
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Tuple
+
+import pandas as pd
+
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_NAME = "reference.pkl"
+
+
+def source_stats(paths: Iterable[Path]) -> Dict[str, Tuple[int, int] | None]:
+    """경로별 (size, mtime_ns), 없는 파일은 None"""
+    out = {}
+    for p in paths:
+        try:
+            st = os.stat(p)
+            out[str(p)] = (st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            out[str(p)] = None
+    return out
+
+
+def source_hash(paths: Iterable[Path]) -> str:
+    """원본 파일 내용 해시 (경로명 + 바이트, 없는 파일도 '없음'으로 반영)"""
+    h = hashlib.sha256()
+    for p in sorted(str(x) for x in paths):
+        h.update(Path(p).name.encode("utf-8") + b"\0")
+        try:
+            with open(p, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+        except FileNotFoundError:
+            h.update(b"<missing>")
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def code_fingerprint(files: Iterable[Path]) -> str:
+    """빌더 모듈 소스 해시 (스냅샷에 담긴 파생 구조의 '코드 버전')"""
+    h = hashlib.sha256()
+    for p in sorted(str(x) for x in files):
+        h.update(Path(p).name.encode("utf-8") + b"\0")
+        try:
+            h.update(Path(p).read_bytes())
+        except OSError:
+            h.update(b"<missing>")
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _read_header(path: Path, code: str = "") -> dict | None:
+    try:
+        with open(path, "rb") as f:
+            head = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(head, dict) or head.get("format") != SNAPSHOT_FORMAT \
+            or head.get("pandas") != pd.__version__ or head.get("code") != code:
+        return None
+    return head
+
+
+def _read_payload(path: Path) -> dict | None:
+    try:
+        with open(path, "rb") as f:
+            pickle.load(f)            # header 건너뛰기
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def _write(path: Path, header: dict, payload: dict) -> bool:
+    """임시 파일에 쓴 뒤 교체(동시에 읽는 워커가 깨진 파일을 보지 않도록)"""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return True
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def load_or_build(snapshot_path: Path, sources: Iterable[Path],
+                  build: Callable[[], dict], force: bool = False, code: str = "") -> Tuple[dict, str]:
+    """
+    스냅샷이 최신이면 읽고, 아니면 build()로 파싱해 저장 후 반환.
+    - code: code_fingerprint() 값. 저장된 스냅샷과 다르면(빌더 코드 변경) 재빌드
+    반환: (payload, 상태) — 상태는 "hit" / "hit(rehash)" / "built" / "built(memory)"
+    """
+    snapshot_path = Path(snapshot_path)
+    sources = [Path(p) for p in sources]
+    stats = source_stats(sources)
+
+    head = None if force else _read_header(snapshot_path, code)
+    digest = None
+    if head is not None:
+        if head.get("stats") == stats:
+            payload = _read_payload(snapshot_path)
+            if payload is not None:
+                return payload, "hit"
+        else:
+            digest = source_hash(sources)
+            if head.get("source_hash") == digest:
+                payload = _read_payload(snapshot_path)
+                if payload is not None:
+                    # 내용은 같고 mtime만 바뀜 → header의 stats만 갱신
+                    _write(snapshot_path, {**head, "stats": stats}, payload)
+                    return payload, "hit(rehash)"
+
+    # 해시/stats는 파싱 전에 잡아 둔다 → 파싱 중 원본이 바뀌면 다음 기동 때 다시 감지됨
+    if digest is None:
+        digest = source_hash(sources)
+    payload = build()
+    header = {"format": SNAPSHOT_FORMAT, "pandas": pd.__version__, "code": code,
+              "source_hash": digest, "stats": stats}
+    ok = _write(snapshot_path, header, payload)
+    return payload, ("built" if ok else "built(memory)")
+
+
+def save_snapshot(snapshot_path: Path, sources: Iterable[Path], payload: dict, code: str = "") -> bool:
+    """이미 파싱된 payload를 현재 원본 기준 header와 함께 저장 (파일 감시 재빌드 후 갱신용)"""
+    sources = [Path(p) for p in sources]
+    header = {"format": SNAPSHOT_FORMAT, "pandas": pd.__version__, "code": code,
+              "source_hash": source_hash(sources), "stats": source_stats(sources)}
+    return _write(Path(snapshot_path), header, payload)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from utils.loaders import DATA_DIR, reference_sources, build_reference, reference_code, SNAPSHOT_PATH
+
+    ap = argparse.ArgumentParser(description="참조 데이터 스냅샷 빌드")
+    ap.add_argument("--force", action="store_true", help="최신이어도 다시 빌드")
+    args = ap.parse_args()
+    _, state = load_or_build(SNAPSHOT_PATH, reference_sources(), build_reference, force=args.force,
+                             code=reference_code())
+    print(f"✅ snapshot {state}: {SNAPSHOT_PATH} (data={DATA_DIR})")
@@ -0,0 +1,263 @@
+# utils/thumbnails.py
+# -*- coding: utf-8 -*-
+"""
+카탈로그 이미지 썸네일 캐시 (디스크, WebP)
+
+- 키: 원본 바이트 해시(blake2b) + 고정 크기(THUMB_SIZES 중 하나) → <cache>/<hh>/<hash>_<size>.webp
+  · 같은 이미지를 여러 품번/경로가 공유해도 썸네일은 1개
+  · 원본 해시는 (경로, size, mtime_ns)별로 메모 → 원본을 다시 읽는 건 파일이 바뀌었을 때뿐
+- 생성: 처음 요청될 때(lazy) 또는 일괄 생성 명령
+- 용량 제한: 합계가 max_bytes를 넘으면 오래 안 쓴 것(mtime 기준 LRU)부터 삭제
+  · 캐시 적중 시 mtime을 갱신 (TOUCH_INTERVAL 초에 한 번만 — 공유 볼륨 쓰기 최소화)
+- JPEG은 draft()로 디코드 단계에서 축소 (원본 해상도 전체를 풀지 않음)
+- 원본을 못 열거나 캐시에 쓸 수 없으면 원본 경로를 그대로 반환 (UI 흐름 유지)
+  · try_thumbnail은 디코드 불가(손상) 원본이면 None → 호출측에서 건너뛰기
+
+설정(환경변수):
+    VCODE_THUMB_DIR      캐시 위치 (기본: images/.thumbs — 로컬 디스크로 두는 것을 권장)
+    VCODE_THUMB_MAX_MB   캐시 상한 MB (기본 512, 0이면 무제한)
+
+일괄 생성(scripts/ 에서):
+    python -m utils.thumbnails                      # images/IK, images/OK 전체, 기본 크기
+    python -m utils.thumbnails --sizes 320 --max-mb 256
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Tuple, Union
+
+from PIL import Image, ImageOps
+
+THUMB_SIZES = (160, 320, 640)        # 긴 변 기준 px
+GRID_SIZE = 320                      # 앱 그리드용
+WEBP_QUALITY = 80
+TOUCH_INTERVAL = 60.0                # 적중 시 mtime 갱신 최소 간격(초)
+MEMO_LIMIT = 20_000                  # 원본 해시/터치 메모 최대 항목 수 (장기 실행 프로세스 메모리 상한)
+
+THUMB_DIR = os.environ.get("VCODE_THUMB_DIR", "")
+MAX_MB = float(os.environ.get("VCODE_THUMB_MAX_MB", "512") or 0)
+
+
+def _fit_size(size: int) -> int:
+    """요청 크기 이상인 가장 작은 고정 크기 (없으면 최대)"""
+    return next((s for s in THUMB_SIZES if s >= size), THUMB_SIZES[-1])
+
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ThumbnailStore:
+    """원본 해시로 키를 잡는 WebP 썸네일 저장소 (프로세스 간 공유 가능: 파일 단위 원자적 교체)"""
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int = 0, quality: int = WEBP_QUALITY):
+        self.dir = Path(cache_dir)
+        self.max_bytes = int(max_bytes)
+        self.quality = quality
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}   # 원본 경로 → (size, mtime_ns, 해시)
+        self._touched: Dict[Path, float] = {}
+        self._total: int | None = None                       # 캐시 합계 바이트 (첫 정리 때 계산)
+        self._lock = threading.Lock()
+
+    # ---- 키/경로 ----
+    def source_hash(self, src: Path) -> str:
+        st = os.stat(src)
+        k = str(src)
+        hit = self._hashes.pop(k, None)
+        if hit is not None and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            self._hashes[k] = hit                            # 다시 넣어 최근 사용 순서 유지
+            return hit[2]
+        digest = _file_hash(src)
+        self._hashes[k] = (st.st_size, st.st_mtime_ns, digest)
+        while len(self._hashes) > MEMO_LIMIT:               # 오래 안 쓴 원본부터 버림 (다시 쓰면 해시만 재계산)
+            self._hashes.pop(next(iter(self._hashes)), None)
+        return digest
+
+    def path_for(self, digest: str, size: int) -> Path:
+        return self.dir / digest[:2] / f"{digest}_{size}.webp"
+
+    # ---- 조회/생성 ----
+    def thumbnail(self, src: Union[str, Path], size: int = GRID_SIZE) -> Path:
+        """src의 size 썸네일 경로 (없으면 만들어서). 실패하면 src 그대로"""
+        return self.try_thumbnail(src, size) or Path(src)
+
+    def try_thumbnail(self, src: Union[str, Path], size: int = GRID_SIZE) -> Path | None:
+        """thumbnail과 같되, 원본이 없거나 디코드할 수 없으면 None (캐시에 못 쓰면 src)"""
+        src = Path(src)
+        size = _fit_size(size)
+        try:
+            out = self.path_for(self.source_hash(src), size)
+        except OSError:
+            return None
+        if out.exists():
+            self._touch(out)
+            return out
+        return self._render(src, out, size)
+
+    def _render(self, src: Path, out: Path, size: int) -> Path | None:
+        """썸네일 생성 → out. 원본 디코드 실패면 None, 캐시에 쓰지 못하면 src"""
+        try:
+            with Image.open(src) as im:
+                im.draft("RGB", (size, size))      # JPEG: 1/2~1/8 축소 디코드 (다른 포맷은 무시됨)
+                im = ImageOps.exif_transpose(im)
+                im.thumbnail((size, size), Image.LANCZOS)
+                if im.mode not in ("RGB", "RGBA"):
+                    im = im.convert("RGBA" if "A" in im.getbands() or "transparency" in im.info else "RGB")
+        except Exception:
+            # 손상 이미지/권한 문제 등은 건너뜀 (UI 흐름 끊지 않기 위함)
+            return None
+        tmp = out.with_name(f"{out.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            out.parent.mkdir(parents=True, exist_ok=True)
+            im.save(tmp, "WEBP", quality=self.quality, method=4)
+            os.replace(tmp, out)
+        except Exception:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return src
+        self._added(out)
+        return out
+
+    def _touch(self, p: Path) -> None:
+        now = time.time()
+        if now - self._touched.get(p, 0.0) < TOUCH_INTERVAL:
+            return
+        self._touched[p] = now
+        if len(self._touched) > MEMO_LIMIT:
+            # TOUCH_INTERVAL이 지난 항목은 어차피 다음 적중 때 다시 갱신하므로 버려도 됨
+            self._touched = {q: t for q, t in self._touched.items() if now - t < TOUCH_INTERVAL}
+        try:
+            os.utime(p, (now, now))
+        except OSError:
+            pass
+
+    # ---- 용량 관리 (LRU) ----
+    def _entries(self):
+        """(mtime, 크기, 경로) 목록"""
+        out = []
+        try:
+            subs = [d for d in os.scandir(self.dir) if d.is_dir()]
+        except OSError:
+            return out
+        for d in subs:
+            try:
+                with os.scandir(d.path) as it:
+                    for e in it:
+                        if e.name.endswith(".webp"):
+                            st = e.stat()
+                            out.append((st.st_mtime, st.st_size, Path(e.path)))
+            except OSError:
+                continue
+        return out
+
+    def _added(self, out: Path) -> None:
+        if self.max_bytes <= 0:
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = sum(e[1] for e in self._entries())
+            else:
+                self._total += out.stat().st_size
+            if self._total > self.max_bytes:
+                # 여유를 두고(90%) 정리해 매 생성마다 디렉토리를 훑지 않도록
+                self._total = self.evict(int(self.max_bytes * 0.9), keep=out)
+
+    def evict(self, target_bytes: int | None = None, keep: Path | None = None) -> int:
+        """합계가 target_bytes(기본 max_bytes) 이하가 될 때까지 오래된 썸네일 삭제 → 남은 합계
+        - keep: 방금 만든 썸네일 등 지우지 않을 파일
+        - 터치 메모에서 지운 파일과 갱신 간격이 지난 항목도 정리
+        """
+        target = self.max_bytes if target_bytes is None else target_bytes
+        entries = sorted(self._entries())
+        total = sum(e[1] for e in entries)
+        for _, nbytes, p in entries:
+            if total <= target:
+                break
+            if p == keep:
+                continue
+            try:
+                p.unlink()
+                total -= nbytes
+                self._touched.pop(p, None)
+            except OSError:
+                pass
+        now = time.time()
+        self._touched = {q: t for q, t in self._touched.items() if now - t < TOUCH_INTERVAL}
+        return total
+
+    # ---- 일괄 생성 ----
+    def pregenerate(self, sources: Iterable[Union[str, Path]],
+                    sizes: Iterable[int] = THUMB_SIZES) -> Tuple[int, int]:
+        """sources 전체의 sizes 썸네일 생성 → (만든 개수, 실패 개수)"""
+        made = failed = 0
+        sizes = sorted({_fit_size(s) for s in sizes})
+        for src in sources:
+            src = Path(src)
+            try:
+                digest = self.source_hash(src)
+            except OSError:
+                failed += 1
+                continue
+            for size in sizes:
+                out = self.path_for(digest, size)
+                if out.exists():
+                    continue
+                if self._render(src, out, size) == out:
+                    made += 1
+                else:
+                    failed += 1
+        return made, failed
+
+
+_STORES: Dict[str, ThumbnailStore] = {}
+_STORE_LOCK = threading.Lock()
+
+
+def thumbnail_store(images_dir: Union[str, Path] = "images") -> ThumbnailStore:
+    """프로세스 공유 썸네일 저장소 (VCODE_THUMB_DIR 없으면 <images_dir>/.thumbs)"""
+    cache_dir = os.path.abspath(THUMB_DIR or Path(images_dir) / ".thumbs")
+    store = _STORES.get(cache_dir)
+    if store is None:
+        with _STORE_LOCK:
+            store = _STORES.setdefault(cache_dir, ThumbnailStore(cache_dir, int(MAX_MB * 1024 * 1024)))
+    return store
+
+
+def thumbnail_for(src: Union[str, Path], size: int = GRID_SIZE,
+                  images_dir: Union[str, Path] = "images") -> Path:
+    """src의 썸네일 경로 (실패 시 원본 경로)"""
+    return thumbnail_store(images_dir).thumbnail(src, size)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from utils.images import image_manifest
+
+    ap = argparse.ArgumentParser(description="카탈로그 이미지 썸네일 일괄 생성")
+    ap.add_argument("--images", default="images", help="이미지 루트 (IK/OK 하위 폴더)")
+    ap.add_argument("--sites", nargs="+", default=["IK", "OK"])
+    ap.add_argument("--sizes", nargs="+", type=int, default=list(THUMB_SIZES))
+    ap.add_argument("--max-mb", type=float, default=None, help="캐시 상한 MB (기본: VCODE_THUMB_MAX_MB)")
+    args = ap.parse_args()
+
+    store = thumbnail_store(args.images)
+    if args.max_mb is not None:
+        store.max_bytes = int(args.max_mb * 1024 * 1024)
+    manifest = image_manifest(args.images)
+    sources = sorted({p for site in args.sites for imgs in manifest.site(site).images.values() for p in imgs})
+    t0 = time.perf_counter()
+    made, failed = store.pregenerate(sources, args.sizes)
+    print(f"✅ thumbnails: 원본 {len(sources)}장, 생성 {made}, 실패 {failed} "
+          f"({time.perf_counter() - t0:.1f}s) → {store.dir}")
@@ -0,0 +1,387 @@
+# utils/translate.py
+# -*- coding: utf-8 -*-
+"""
+IK ↔ OK 대량 변환 (CSV/TSV → 상대측 코드 + 해석 속성)
+
+입력 모드 (헤더로 자동 판별):
+  · 코드 모드 : 코드 컬럼(--col, 기본 code) → decode_many로 속성 해석 → 상대측 코드
+                1) matched_parts에 실제 대응 행이 있으면 그 코드 (source=matched)
+                2) 없으면 해석한 속성으로 encode_many 조립 (source=codec, 모르는 칸은 fill_char)
+                part_type은 코덱 pair → 없으면 part_type 최장 접두 색인, 상대측 part_type은 Cross_Map
+  · 속성 모드 : pair_id + 속성 컬럼(union_schema key) → encode_many로 ik_code / ok_code
+결과는 입력 컬럼 뒤에 붙이고, 오류 행은 error 컬럼 + 별도 오류 CSV(행 번호 포함)로 보고
+
+대용량: 부모는 청크를 읽어 넘기고 순서대로 이어 쓰기만 한다.
+해석/조립/CSV 직렬화는 프로세스 풀에서 (워커마다 참조 데이터 1회 적재, 실행 중에는 고정)
+→ 출력은 입력 순서 그대로, 처리량은 워커 수에 비례
+
+직접 실행(scripts/ 에서):
+    python -m utils.translate codes.csv --out translated.csv                  # code 컬럼, IK/OK 자동 판별
+    python -m utils.translate codes.tsv --col ik_code --side IK --workers 8
+    python -m utils.translate attrs.csv --out codes.csv                       # pair_id + 속성 컬럼
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import multiprocessing as mp
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import utils.loaders as loaders
+from utils.encoding import FALLBACK_ENCODINGS, sniff_bytes, sniff_encoding
+from utils.loaders import (
+    load_union_schema,
+    load_pair_schemas,
+    load_crossmap,
+    load_matched_index,
+    load_part_type_index,
+)
+from utils.matched_index import normalize_codes
+from notebooks.vcode_codec import decode_many, encode_many
+
+CHUNKSIZE = 100_000
+
+# 코드 모드 결과 컬럼 (뒤에 속성 key 컬럼이 union_schema 순으로 붙음)
+CODE_COLUMNS = ["code_norm", "side", "pair_id", "part_type", "target_side", "target_part_type",
+                "target_code", "source", "complete", "error"]
+# 속성 모드 결과 컬럼
+ATTR_COLUMNS = ["ik_part_type", "ok_part_type", "ik_code", "ok_code", "complete", "error"]
+
+_DECODE_META = ["code", "side", "pair_id", "part_type"]
+
+
+# ---------------------------------------------------------------------
+# 1) 프레임 단위 변환 (프로세스 안에서 호출, 참조 데이터는 loaders 공유본)
+# ---------------------------------------------------------------------
+def _crossmap_dicts():
+    try:
+        return load_crossmap()
+    except (FileNotFoundError, ValueError):
+        return {}, {}
+
+def attr_keys() -> List[str]:
+    """모든 pair의 속성 key (union_schema 첫 등장 순) — 청크가 달라도 같은 출력 컬럼"""
+    return list(dict.fromkeys(k for ps in load_pair_schemas().values() for k in ps.keys))
+
+def _complete(codes: np.ndarray, fill_char: str) -> np.ndarray:
+    s = pd.Series(codes, dtype=object).fillna("")
+    return (s.ne("") & ~s.str.contains(fill_char, regex=False)).to_numpy()
+
+def translate_codes(codes, side: str | None = None, fill_char: str = "?") -> pd.DataFrame:
+    """
+    코드 배열 → 상대측 코드 + 해석 속성 DataFrame[CODE_COLUMNS + attr keys] (index = codes index)
+    - 코드는 공백/하이픈 제거 + 대문자로 정규화 (code_norm)
+    - error: "" | EMPTY_CODE | UNKNOWN_CODE(part_type 불명) | NO_PAIR(part_type은 알지만 코덱 pair 없음)
+    """
+    ser = codes if isinstance(codes, pd.Series) else pd.Series(list(codes), dtype=object)
+    norm = normalize_codes(ser)
+    union = load_union_schema()
+    dec = decode_many(union, norm, side=side, fill_char=fill_char)
+    n = len(dec)
+
+    pair_ids = dec["pair_id"].to_numpy(dtype=object, na_value=None)
+    sides = dec["side"].to_numpy(dtype=object)
+    norm_arr = dec["code"].to_numpy(dtype=object)
+    known = pair_ids != None  # noqa: E711
+    is_ik = sides == "IK"
+
+    # 1) 코덱 조립 (pair를 아는 행)
+    enc = encode_many(union, pair_ids, dec.drop(columns=_DECODE_META), fill_char=fill_char, errors="coerce")
+    target = np.where(is_ik, enc["ok_code"].to_numpy(dtype=object), enc["ik_code"].to_numpy(dtype=object))
+    target[~known] = None
+    source = np.where(known, "codec", None).astype(object)
+
+    # 2) matched_parts 실제 대응 행 우선
+    mi = load_matched_index()
+    if mi is not None:
+        for sd in ("IK", "OK"):
+            rows = np.flatnonzero((sides == sd) & (norm_arr != ""))
+            if not len(rows):
+                continue
+            hit = mi.counterparts(sd, norm_arr[rows], normalized=True)
+            m = hit != None  # noqa: E711
+            target[rows[m]] = [str(h) for h in hit[m]]
+            source[rows[m]] = "matched"
+
+    # 3) part_type: 코덱 pair → 없으면 최장 접두 색인 / 상대측은 Cross_Map → 없으면 pair 스키마
+    part_types = dec["part_type"].to_numpy(dtype=object, na_value=None)
+    unknown_pt = np.flatnonzero((part_types == None) & (norm_arr != ""))  # noqa: E711
+    if len(unknown_pt):
+        idx = load_part_type_index()
+        for sd in ("IK", "OK"):
+            rows = unknown_pt[sides[unknown_pt] == sd]
+            if len(rows):
+                part_types[rows] = idx.resolve_many(norm_arr[rows], side=sd)["part_type"] \
+                    .to_numpy(dtype=object, na_value=None)
+
+    ik2ok, ok2ik = _crossmap_dicts()
+    schemas = load_pair_schemas()
+    pts, pids = pd.Series(part_types, dtype=object), pd.Series(pair_ids, dtype=object)
+    by_xmap = pts.map(ik2ok).where(is_ik, pts.map(ok2ik))
+    by_pair = pids.map({p: ps.ok_part_type for p, ps in schemas.items()}) \
+        .where(is_ik, pids.map({p: ps.ik_part_type for p, ps in schemas.items()}))
+    target_pt = by_xmap.replace("", None).fillna(by_pair).replace("", None) \
+        .to_numpy(dtype=object, na_value=None)
+
+    error = np.full(n, "", dtype=object)
+    miss = source == None  # noqa: E711
+    error[miss & (part_types != None)] = "NO_PAIR"  # noqa: E711
+    error[miss & (part_types == None)] = "UNKNOWN_CODE"  # noqa: E711
+    error[norm_arr == ""] = "EMPTY_CODE"
+
+    out = pd.DataFrame({
+        "code_norm": norm_arr, "side": sides, "pair_id": pair_ids, "part_type": part_types,
+        "target_side": np.where(is_ik, "OK", "IK"), "target_part_type": target_pt,
+        "target_code": target, "source": source, "complete": _complete(target, fill_char),
+        "error": error,
+    }, index=ser.index)
+    keys = attr_keys()
+    attrs = dec.reindex(columns=keys)
+    return pd.concat([out, attrs], axis=1)
+
+def attach_result(frame: pd.DataFrame, res: pd.DataFrame) -> pd.DataFrame:
+    """입력 컬럼 + 결과 컬럼 (이름이 겹치는 결과 컬럼은 '<이름>_out')"""
+    res = res.rename(columns={c: f"{c}_out" for c in res.columns if c in frame.columns})
+    return pd.concat([frame, res], axis=1)
+
+def match_status(res: pd.DataFrame) -> np.ndarray:
+    """
+    translate_codes 결과 → 행별 상태
+    - MATCHED  : matched_parts 대응 행
+    - ASSEMBLED: 코덱으로 11자리 전부 조립
+    - UNKNOWN  : 조립했지만 해석 못 한 자리(fill_char)가 남음
+    - NO_MATCH : 상대측 코드 없음 (error 컬럼에 사유)
+    """
+    source = res["source"].to_numpy(dtype=object, na_value=None)
+    complete = res["complete"].to_numpy(dtype=bool)
+    return np.select(
+        [source == "matched", (source == "codec") & complete, source == "codec"],
+        ["MATCHED", "ASSEMBLED", "UNKNOWN"], default="NO_MATCH",
+    ).astype(object)
+
+def read_table_bytes(data: bytes, name: str = "", encoding: str | None = None) -> pd.DataFrame:
+    """
+    업로드된 CSV/TSV 바이트 → 문자열 DataFrame (.tsv/.txt는 탭)
+    - 인코딩: 앞부분 바이트로 판별 → 뒤쪽에서 깨지면 read_csv_safe와 같은 순서로 재시도
+    """
+    enc = encoding or sniff_bytes(data)
+    sep = _sep_for(Path(name or "upload.csv"))
+    for cand in (enc,) + tuple(e for e in FALLBACK_ENCODINGS if e != enc):
+        try:
+            return pd.read_csv(io.BytesIO(data), dtype=str, sep=sep, encoding=cand, keep_default_na=False)
+        except UnicodeDecodeError:
+            continue
+    return pd.read_csv(io.BytesIO(data), dtype=str, sep=sep, encoding="utf-8", encoding_errors="ignore",
+                       keep_default_na=False)
+
+def encode_rows(frame: pd.DataFrame, fill_char: str = "?") -> pd.DataFrame:
+    """
+    pair_id + 속성 컬럼 프레임 → DataFrame[ATTR_COLUMNS] (index = frame index)
+    - error: "" | EMPTY_PAIR | UNKNOWN_PAIR
+    """
+    pair_ids = frame["pair_id"].fillna("").astype(str).str.strip().to_numpy(dtype=object)
+    enc = encode_many(load_union_schema(), pair_ids, frame, fill_char=fill_char, errors="coerce")
+    schemas = load_pair_schemas()
+    pss = [schemas.get(p) for p in pair_ids]
+    found = np.array([ps is not None for ps in pss], dtype=bool)
+    ik = enc["ik_code"].to_numpy(dtype=object)
+    ok = enc["ok_code"].to_numpy(dtype=object)
+    ik[~found] = None
+    ok[~found] = None
+    error = np.where(found, "", "UNKNOWN_PAIR").astype(object)
+    error[pair_ids == ""] = "EMPTY_PAIR"
+    return pd.DataFrame({
+        "ik_part_type": [ps.ik_part_type if ps else None for ps in pss],
+        "ok_part_type": [ps.ok_part_type if ps else None for ps in pss],
+        "ik_code": ik, "ok_code": ok,
+        "complete": _complete(ik, fill_char) & _complete(ok, fill_char),
+        "error": error,
+    }, index=frame.index)
+
+
+# ---------------------------------------------------------------------
+# 2) 청크 작업 (워커 프로세스) — 결과를 CSV 텍스트로 직렬화해 돌려줌
+# ---------------------------------------------------------------------
+def _init_worker() -> None:
+    """워커마다 참조 데이터/색인을 한 번 적재 (파일 감시 없음 → 실행 중 참조 데이터 고정)"""
+    loaders.WATCH_INTERVAL = 0
+    load_pair_schemas()
+    load_matched_index()
+    load_part_type_index()
+    _crossmap_dicts()
+
+def _work(chunk: pd.DataFrame, mode: str, col: str | None, side: str | None,
+          fill_char: str, sep: str, header: bool) -> Tuple[str, str, int, Dict[str, int]]:
+    """청크 1개 → (출력 CSV 텍스트, 오류 행 CSV 텍스트, 행 수, 오류 종류별 개수)"""
+    res = translate_codes(chunk[col], side, fill_char) if mode == "code" else encode_rows(chunk, fill_char)
+    out = attach_result(chunk, res)
+    bad = res["error"].to_numpy() != ""
+    errs = out[bad].copy()
+    errs.insert(0, "row", errs.index + 1)           # 입력 데이터 행 번호 (헤더 제외, 1부터)
+    return (out.to_csv(None, index=False, header=header, sep=sep),
+            errs.to_csv(None, index=False, header=header, sep=sep),
+            len(out), dict(Counter(res["error"].to_numpy()[bad].tolist())))
+
+
+# ---------------------------------------------------------------------
+# 3) 파일 변환 (읽기 → 풀 → 순서대로 이어 쓰기)
+# ---------------------------------------------------------------------
+class TranslateProgress:
+    """청크 변환 진행/처리량 카운터 (청크마다 갱신되어 on_progress로 전달)"""
+
+    def __init__(self):
+        self.chunks = 0
+        self.rows = 0
+        self.errors: Counter = Counter()
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def failed(self) -> int:
+        return sum(self.errors.values())
+
+    def __repr__(self) -> str:
+        return (f"TranslateProgress(chunks={self.chunks}, rows={self.rows}, failed={self.failed}, "
+                f"{self.rows_per_sec:,.0f} rows/s)")
+
+
+def _errors_path(out_path: Path) -> Path:
+    return out_path.with_name(f"{out_path.stem}.errors{out_path.suffix or '.csv'}")
+
+def _sep_for(path: Path) -> str:
+    return "\t" if path.suffix.lower() in (".tsv", ".txt") else ","
+
+def _detect_mode(columns, col: str | None) -> Tuple[str, str | None]:
+    cols = list(columns)
+    if col:
+        if col not in cols:
+            raise ValueError(f"입력에 코드 컬럼 '{col}' 이 없습니다. (컬럼: {cols})")
+        return "code", col
+    if "code" in cols:
+        return "code", "code"
+    if "pair_id" in cols:
+        return "attrs", None
+    raise ValueError("입력에 'code' 컬럼(또는 --col) 또는 'pair_id' + 속성 컬럼이 필요합니다.")
+
+def translate_file(in_path, out_path, col: str | None = None, side: str | None = None,
+                   errors_path=None, workers: int | None = None, chunksize: int = CHUNKSIZE,
+                   fill_char: str = "?", encoding: str | None = None, out_encoding: str = "utf-8-sig",
+                   sep: str | None = None, on_progress=None) -> TranslateProgress:
+    """
+    in_path(CSV/TSV)를 청크로 읽어 변환 → out_path (입력 순서 유지, 다 쓴 뒤 원자적 교체)
+    - workers: 프로세스 수 (기본 CPU 수, 1이면 풀 없이 현재 프로세스에서)
+    - errors_path: 오류 행 CSV (기본 <out>.errors.<확장자>, 출력과 같은 구분자, 오류가 없으면 만들지 않음)
+    - encoding: 입력 인코딩 (기본 앞부분 바이트로 판별)
+    - sep: 입력 구분자 (기본 .tsv/.txt면 탭). 출력 구분자는 out_path 확장자로 같은 규칙
+    - on_progress(TranslateProgress): 청크를 쓸 때마다 호출
+    """
+    if len(fill_char) != 1:
+        raise ValueError("fill_char는 1글자여야 합니다.")
+    in_path, out_path = Path(in_path), Path(out_path)
+    errors_path = Path(errors_path) if errors_path else _errors_path(out_path)
+    sep = sep or _sep_for(in_path)
+    encoding = encoding or sniff_encoding(in_path)
+    workers = max(1, workers or os.cpu_count() or 1)
+
+    reader = pd.read_csv(in_path, dtype=str, sep=sep, encoding=encoding, keep_default_na=False,
+                         chunksize=chunksize)
+    prog = TranslateProgress()
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    etmp = errors_path.with_name(errors_path.name + ".tmp")
+    pool = None
+    try:
+        with open(tmp, "w", encoding=out_encoding, newline="") as out, \
+             open(etmp, "w", encoding=out_encoding, newline="") as err:
+            # 첫 청크는 모드 판별 + 헤더 (BOM은 open이 한 번만 씀)
+            first = next(reader, None)
+            if first is None:
+                first = pd.read_csv(in_path, dtype=str, sep=sep, encoding=encoding, nrows=0)
+            mode, col = _detect_mode(first.columns, col)
+            args = (mode, col, side, fill_char, _sep_for(out_path))
+
+            def _write(result):
+                text, etext, rows, errs = result
+                out.write(text)
+                err.write(etext)
+                prog.chunks += 1
+                prog.rows += rows
+                prog.errors.update(errs)
+                if on_progress:
+                    on_progress(prog)
+
+            if workers == 1:
+                _write(_work(first, *args, True))
+                for chunk in reader:
+                    _write(_work(chunk, *args, False))
+            else:
+                # spawn: 워커가 참조 데이터를 스스로 한 번 적재 (윈도우와 같은 동작, 부모 스레드 상태 비상속)
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"),
+                                           initializer=_init_worker)
+                pending = deque([pool.submit(_work, first, *args, True)])
+                for chunk in reader:
+                    pending.append(pool.submit(_work, chunk, *args, False))
+                    while len(pending) >= workers * 2:       # 앞선 청크부터 기다려 쓰기 → 순서 유지, 메모리 상한
+                        _write(pending.popleft().result())
+                while pending:
+                    _write(pending.popleft().result())
+        os.replace(tmp, out_path)
+        if prog.failed:
+            os.replace(etmp, errors_path)
+        elif errors_path.exists():
+            errors_path.unlink()                             # 이전 실행의 오류 파일이 남지 않도록
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        for p in (tmp, etmp):
+            if p.exists():
+                p.unlink()
+    return prog
+
+
+def main(argv=None) -> TranslateProgress:
+    ap = argparse.ArgumentParser(prog="python -m utils.translate",
+                                 description="IK ↔ OK 대량 변환 (코드 또는 pair_id+속성 CSV/TSV, 멀티프로세스)")
+    ap.add_argument("input", help="입력 CSV/TSV")
+    ap.add_argument("--out", required=True, help="출력 CSV 경로")
+    ap.add_argument("--col", help="코드 컬럼명 (기본: code, 없으면 pair_id + 속성 모드)")
+    ap.add_argument("--side", choices=["IK", "OK"], help="입력 코드 측 고정 (기본: 'V'로 시작하면 IK)")
+    ap.add_argument("--errors", help="오류 행 CSV 경로 (기본 <out>.errors.<확장자>)")
+    ap.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본 CPU 수)")
+    ap.add_argument("--chunksize", type=int, default=CHUNKSIZE, help="청크 행 수")
+    ap.add_argument("--fill-char", default="?", help="모르는 자리 대체 문자 (기본 ?)")
+    ap.add_argument("--encoding", help="입력 인코딩 (기본 자동 판별)")
+    ap.add_argument("--out-encoding", default="utf-8-sig")
+    args = ap.parse_args(argv)
+
+    def _report(p: TranslateProgress):
+        kinds = ", ".join(f"{k} {v:,}" for k, v in p.errors.most_common())
+        print(f"  … 청크 {p.chunks}: {p.rows:,}행 (오류 {p.failed:,}{' — ' + kinds if kinds else ''}) "
+              f"{p.rows_per_sec:,.0f} rows/s", flush=True)
+
+    prog = translate_file(args.input, args.out, col=args.col, side=args.side, errors_path=args.errors,
+                          workers=args.workers, chunksize=args.chunksize, fill_char=args.fill_char,
+                          encoding=args.encoding, out_encoding=args.out_encoding, on_progress=_report)
+    print(f"✅ 변환 완료 → {args.out}  ({prog.rows:,}행, 오류 {prog.failed:,}, {prog.elapsed:.1f}s)")
+    if prog.failed:
+        print(f"   오류 행 → {args.errors or _errors_path(Path(args.out))}")
+    return prog
+
+
+if __name__ == "__main__":
+    main()